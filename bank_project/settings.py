@@ -49,7 +49,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ConcurrencyLimitMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,6 +89,49 @@ DATABASES = {
     'default': env.db()
 }
 
+# Read replicas, as a comma-separated list of database URLs. Safe reads are
+# spread over them; see core/db_router.py for when reads stay on the primary.
+# Locally, pointing a replica at the same SQLite file or Postgres database as
+# DATABASE_URL exercises the routing without real replication.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list('REPLICA_DATABASE_URLS', default=[]), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = env.db_url_config(url)
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Seconds a user keeps reading from the primary after a successful write.
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    # Authenticated tokens, kept per process for a short time. Set
+    # TOKEN_AUTH_CACHE_ALIAS=default with a shared CACHE_URL (e.g. redis://)
+    # to share entries and invalidations between workers.
+    'token_auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'token-auth',
+        'TIMEOUT': env.int('TOKEN_AUTH_CACHE_TTL', default=60),
+        'OPTIONS': {'MAX_ENTRIES': env.int('TOKEN_AUTH_CACHE_SIZE', default=10000)},
+    },
+}
+
+TOKEN_AUTH_CACHE_ALIAS = env.str('TOKEN_AUTH_CACHE_ALIAS', default='token_auth')
+
+# Rate limit buckets (see core/throttling.py). Per process by default; set
+# THROTTLE_CACHE_ALIAS=default with a shared CACHE_URL to limit across workers.
+CACHES['throttle'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'throttle',
+    'OPTIONS': {'MAX_ENTRIES': env.int('THROTTLE_CACHE_SIZE', default=100000)},
+}
+THROTTLE_CACHE_ALIAS = env.str('THROTTLE_CACHE_ALIAS', default='throttle')
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -129,11 +175,57 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Token buckets per user: reads are GET/HEAD/OPTIONS, postings the rest.
+    # A rate of '120/min' allows bursts of 120 and 2 per second sustained;
+    # an empty rate turns the limit off.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'reads': env.str('THROTTLE_READ_RATE', default='600/min') or None,
+        'postings': env.str('THROTTLE_POSTING_RATE', default='120/min') or None,
+    },
 }
 
 ALLOWED_HOSTS = ['*']
+
+# Deadlocks and serialization failures on money-moving postings are retried
+# with capped exponential backoff (delays in seconds).
+POSTING_RETRY_ATTEMPTS = env.int('POSTING_RETRY_ATTEMPTS', default=5)
+POSTING_RETRY_BASE_DELAY = env.float('POSTING_RETRY_BASE_DELAY', default=0.01)
+POSTING_RETRY_MAX_DELAY = env.float('POSTING_RETRY_MAX_DELAY', default=0.5)
+
+# Requests (and, of those, postings) a process works on at once; more are
+# answered 429 with Retry-After before touching the database. 0 is no cap.
+MAX_CONCURRENT_REQUESTS = env.int('MAX_CONCURRENT_REQUESTS', default=200)
+MAX_CONCURRENT_POSTINGS = env.int('MAX_CONCURRENT_POSTINGS', default=20)
+CONCURRENCY_RETRY_AFTER = env.int('CONCURRENCY_RETRY_AFTER', default=1)
+
+# Upper bound on the number of postings accepted by one batch transfer.
+BATCH_TRANSFER_MAX_ITEMS = env.int('BATCH_TRANSFER_MAX_ITEMS', default=10000)
+
+# Seconds a customer's serialized account list may stay in the default cache.
+# Entries are validated against the accounts' updated_at on every read and
+# dropped whenever a posting touches one of the customer's accounts.
+ACCOUNT_LIST_CACHE_TTL = env.int('ACCOUNT_LIST_CACHE_TTL', default=300)
+
+# Seconds a stored Idempotency-Key response can be replayed.
+IDEMPOTENCY_KEY_TTL = env.int('IDEMPOTENCY_KEY_TTL', default=24 * 60 * 60)
+
+# Where cold transaction partitions are archived to by
+# `manage.py transaction_partitions --archive` (PostgreSQL only).
+TRANSACTION_ARCHIVE_DIR = env.str('TRANSACTION_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+
+# Request metrics, served in the Prometheus text format at /metrics. When
+# METRICS_TOKEN is set, scrapers must send it as "Authorization: Bearer <token>".
+METRICS_TOKEN = env.str('METRICS_TOKEN', default='')
+
+# Fraction of requests (0 to 1) whose SQL statements are kept; those slower
+# than METRICS_SLOW_REQUEST_SECONDS are logged with their statements.
+METRICS_QUERY_SAMPLE_RATE = env.float('METRICS_QUERY_SAMPLE_RATE', default=0.01)
+METRICS_SLOW_REQUEST_SECONDS = env.float('METRICS_SLOW_REQUEST_SECONDS', default=0.5)
@@ -17,7 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.authtoken import views
-from core.views import RegistrationView
+from core.views import RegistrationView, prometheus_metrics
 
 
 urlpatterns = [
@@ -26,4 +26,5 @@ urlpatterns = [
     path('api/get-token/', views.obtain_auth_token),
     path('api/register/', RegistrationView.as_view()),
     path('api-auth/', include('rest_framework.urls')),
+    path('metrics', prometheus_metrics, name='metrics'),
 ]
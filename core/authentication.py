@@ -0,0 +1,113 @@
+# core/authentication.py
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from . import db_router
+from .models import Customer
+
+
+def _cache():
+    return caches[settings.TOKEN_AUTH_CACHE_ALIAS]
+
+
+def _cache_key(key):
+    # Never put raw tokens into a (possibly shared) cache.
+    return 'token-auth:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    """
+    Drop a token from the authentication cache.
+    """
+    _cache().delete(_cache_key(key))
+
+
+def get_customer_id(user):
+    """
+    Return the primary key of the user's Customer profile, or None.
+
+    CachedTokenAuthentication fills this in from its cache. For any other
+    authentication method it costs one query, after which it is remembered
+    on the user object for the rest of the request.
+    """
+    if not user.is_authenticated:
+        return None
+    if not hasattr(user, '_customer_id'):
+        user._customer_id = Customer.objects.filter(user_id=user.pk).values_list('pk', flat=True).first()
+    return user._customer_id
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that caches the token's user
+    and customer id, so authenticated requests skip the Token/User join.
+
+    Entries live in the TOKEN_AUTH_CACHE_ALIAS cache. The default is a per-process
+    LocMemCache with a short TTL and LRU-style culling; point the alias at a
+    shared backend (Redis, Memcached) so that invalidation reaches every worker.
+    Deleting a token, saving or deleting its user, and creating or deleting the
+    user's customer profile invalidate the entry (see core.signals).
+
+    This is also where the user becomes known, so it applies the read-replica
+    pin for users who wrote recently (see core.db_router). Cache misses read
+    from the primary so that a token issued a moment ago is always found.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = _cache()
+        cache_key = _cache_key(key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            with db_router.use_primary():
+                user, token = super().authenticate_credentials(key)
+                entry = (user, token, get_customer_id(user))
+            cache.set(cache_key, entry)
+
+        user, token, customer_id = entry
+        user._customer_id = customer_id
+        db_router.pin_if_recent_write(user.pk)
+        return (user, token)
+
+
+async def aauthenticate(request):
+    """
+    Async counterpart of CachedTokenAuthentication for async views.
+
+    Reads the same ``Authorization: Token <key>`` header and the same cache,
+    and returns the authenticated user, or None if the credentials are
+    missing or invalid.
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) != 2 or header[0].lower() != 'token':
+        return None
+
+    cache = _cache()
+    cache_key = _cache_key(header[1])
+    # The in-process cache never blocks, so skip the thread hop of aget().
+    local = isinstance(cache, LocMemCache)
+    entry = cache.get(cache_key) if local else await cache.aget(cache_key)
+    if entry is None:
+        try:
+            token = await Token.objects.using(DEFAULT_DB_ALIAS).select_related('user').aget(key=header[1])
+        except Token.DoesNotExist:
+            return None
+        if not token.user.is_active:
+            return None
+        customers = Customer.objects.using(DEFAULT_DB_ALIAS).filter(user_id=token.user_id)
+        customer_id = await customers.values_list('pk', flat=True).afirst()
+        entry = (token.user, token, customer_id)
+        if local:
+            cache.set(cache_key, entry)
+        else:
+            await cache.aset(cache_key, entry)
+
+    user, token, customer_id = entry
+    user._customer_id = customer_id
+    db_router.pin_if_recent_write(user.pk)
+    return user
@@ -0,0 +1,87 @@
+# core/db_router.py
+"""
+Primary/replica database routing with read-your-writes consistency.
+
+Writes always go to ``default``. Reads go to one of the DATABASE_REPLICAS
+aliases, except when the current request must see the primary:
+
+* requests with an unsafe HTTP method (all postings read from the primary),
+* requests by a user who wrote something in the last REPLICA_PIN_SECONDS,
+* anything inside a transaction on the primary,
+* code wrapped in ``use_primary()``.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_primary = ContextVar('use_primary', default=False)
+
+
+def route_to_primary(value=True):
+    """
+    Set whether reads in the current context go to the primary. Returns a
+    token for ``reset_routing()``.
+    """
+    return _use_primary.set(value)
+
+
+def reset_routing(token):
+    _use_primary.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    Send every read inside the block to the primary.
+    """
+    token = route_to_primary()
+    try:
+        yield
+    finally:
+        reset_routing(token)
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def record_write(user_id):
+    """
+    Pin ``user_id`` to the primary for the next REPLICA_PIN_SECONDS. The pin
+    lives in the default cache, which must be shared between workers for the
+    pin to follow the user across them.
+    """
+    if settings.DATABASE_REPLICAS:
+        cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def pin_if_recent_write(user_id):
+    """
+    Route the rest of the current request to the primary if ``user_id``
+    wrote something recently.
+    """
+    if settings.DATABASE_REPLICAS and cache.get(_pin_key(user_id)):
+        route_to_primary()
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,90 @@
+# core/idempotency.py
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+from .services.retry import run_with_retry
+
+HEADER = 'Idempotency-Key'
+
+
+def _request_hash(request):
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.path.encode(), request.body):
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return Response(
+            {'error': f'{HEADER} was already used for a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(
+        stored.response_body,
+        status=stored.response_status,
+        headers={'Idempotent-Replayed': 'true'}
+    )
+
+
+def idempotent(view_method):
+    """
+    Make a money-moving viewset action safe to retry.
+
+    When the request carries an Idempotency-Key header, the first response for
+    that (user, key) is stored in the same transaction as the posting, and any
+    later request with the same key gets the stored response back without the
+    action running again, validation included. Server errors are not stored,
+    so they can be retried. Keys expire after IDEMPOTENCY_KEY_TTL seconds and
+    are swept by the purge_idempotency_keys command.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response({'error': f'{HEADER} is too long.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = _request_hash(request)
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if stored is not None:
+            if stored.expires_at > timezone.now():
+                return _replay(stored, request_hash)
+            stored.delete()
+
+        def attempt():
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < 500:
+                    IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        request_hash=request_hash,
+                        response_status=response.status_code,
+                        response_body=json.loads(JSONRenderer().render(response.data)),
+                        expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+                    )
+                return response
+
+        try:
+            return run_with_retry(attempt, view_method.__name__)
+        except IntegrityError:
+            # A concurrent request with the same key won; our posting was rolled back.
+            stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+            if stored is None:
+                raise
+            return _replay(stored, request_hash)
+
+    return wrapper
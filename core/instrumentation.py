@@ -0,0 +1,73 @@
+# core/instrumentation.py
+"""
+Per-request SQL accounting.
+
+Every database connection gets an execute wrapper when it is opened (see
+install_query_recorder). The wrapper adds each query's count, duration and
+row count to the statistics of the request currently being handled, found
+through a context variable, so it also sees queries that the async ORM runs
+in worker threads. Outside a request it does nothing but one lookup.
+"""
+import time
+from contextvars import ContextVar
+
+# Statements kept per sampled request; later ones are only counted.
+MAX_SAMPLED_QUERIES = 100
+
+_current = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """
+    Query totals for one request. ``statements`` is a list of (sql, seconds)
+    when the request was picked for sampling, otherwise None.
+    """
+    __slots__ = ('queries', 'seconds', 'rows', 'statements')
+
+    def __init__(self, sample=False):
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.statements = [] if sample else None
+
+
+def start_request(sample=False):
+    """
+    Begin collecting statistics for the current request. Returns the stats
+    object and a token for finish_request().
+    """
+    stats = RequestStats(sample)
+    return stats, _current.set(stats)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.seconds += elapsed
+        # Drivers report -1 when they do not know, e.g. SQLite for SELECTs.
+        rowcount = getattr(context['cursor'], 'rowcount', -1)
+        if rowcount > 0:
+            stats.rows += rowcount
+        if stats.statements is not None and len(stats.statements) < MAX_SAMPLED_QUERIES:
+            stats.statements.append((sql, elapsed))
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created receiver adding record_query() to a new connection.
+    It goes first in the list, as connection.execute_wrapper() blocks pop
+    the last wrapper when they exit.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
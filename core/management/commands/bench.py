@@ -0,0 +1,403 @@
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Q
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.models import Account, Customer, Transaction, Transfer
+from core.renderers import FastJSONRenderer
+from core.serializers import TransactionSerializer
+from core.serializers.fast import ValuesSerializer
+from core.services.account_numbers import allocate_account_numbers
+from core.services.balances import set_balance_slots
+
+OPERATIONS = ('deposit', 'withdraw', 'transfer', 'list', 'history')
+
+DEFAULT_MIX = 'deposit=30,withdraw=20,transfer=20,list=15,history=15'
+
+BATCH_SIZE = 1000
+
+# Statuses of requests refused before doing their work: rate limits and
+# concurrency caps (429) and an unavailable database (503). Counted on their
+# own, they would make latencies and throughput look better than they are.
+REFUSED_STATUSES = (429, 503)
+
+
+def parse_mix(value):
+    """
+    Parse ``name=weight,...`` into a dict of operation weights.
+    """
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS or not weight.strip().isdigit():
+            raise CommandError(f'Invalid --mix entry {part!r}; expected one of {", ".join(OPERATIONS)} as name=weight.')
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise CommandError('--mix needs at least one operation with a positive weight.')
+    return mix
+
+
+def percentile(ordered, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+    Reduce (latency, queries, status) samples to the reported statistics.
+    Latencies are reported in milliseconds. Refused requests (429 and 503)
+    are counted separately and left out of throughput and latencies.
+    """
+    statuses = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample[2])] += 1
+    served = [sample for sample in samples if sample[2] not in REFUSED_STATUSES]
+    latencies = sorted(sample[0] * 1000 for sample in served)
+    return {
+        'requests': len(samples),
+        'throttled': statuses.get('429', 0),
+        'unavailable': statuses.get('503', 0),
+        'throughput_rps': round(len(served) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50), 2) if served else None,
+        'p95_ms': round(percentile(latencies, 0.95), 2) if served else None,
+        'p99_ms': round(percentile(latencies, 0.99), 2) if served else None,
+        'max_ms': round(latencies[-1], 2) if served else None,
+        'queries_per_request': round(sum(sample[1] for sample in served) / len(served), 2) if served else None,
+        'statuses': dict(statuses),
+    }
+
+
+def counter_total(snapshot, name):
+    return sum(value for (key, _), value in snapshot['counters'].items() if key == name)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed customers and accounts, drive concurrent API traffic against the '
+        'in-process app and report throughput, latency percentiles, queries per '
+        'request and lock conflicts. Works offline on SQLite or PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=100, help='Customers to seed (default: 100).')
+        parser.add_argument(
+            '--accounts-per-customer', type=int, default=2, help='Accounts seeded per customer (default: 2).'
+        )
+        parser.add_argument(
+            '--opening-balance', default='1000.00', help='Balance of every seeded account (default: 1000.00).'
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Total requests to send (default: 2000).')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent worker threads (default: 8).')
+        parser.add_argument(
+            '--mix', default=DEFAULT_MIX, help=f'Operation weights as name=weight pairs (default: {DEFAULT_MIX}).'
+        )
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for repeatable runs.')
+        parser.add_argument(
+            '--scenario', choices=['traffic', 'serialization', 'hot-deposit'], default='traffic',
+            help='traffic: concurrent API requests (default). serialization: CPU time of '
+                 'rendering a --rows transaction list with TransactionSerializer and with the '
+                 'values() fast path. hot-deposit: concurrent deposits to a single account '
+                 'using --slots balance slots.'
+        )
+        parser.add_argument(
+            '--slots', type=int, default=0, help='Balance slots of the hot-deposit account (default: 0).'
+        )
+        parser.add_argument(
+            '--rows', type=int, default=10000, help='Transactions rendered by the serialization scenario (default: 10000).'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5, help='Timed repetitions of the serialization scenario (default: 5).'
+        )
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded data instead of deleting it.')
+
+    def handle(self, *args, **options):
+        if options['customers'] < 1 or options['accounts_per_customer'] < 1:
+            raise CommandError('--customers and --accounts-per-customer must be at least 1.')
+        if options['workers'] < 1 or options['requests'] < 1:
+            raise CommandError('--workers and --requests must be at least 1.')
+        mix = parse_mix(options['mix'])
+        rng = random.Random(options['seed'])
+        run_id = uuid.uuid4().hex[:8]
+
+        if options['scenario'] == 'serialization':
+            if options['rows'] < 1 or options['repeat'] < 1:
+                raise CommandError('--rows and --repeat must be at least 1.')
+            try:
+                report = self.serialization(run_id, options['rows'], options['repeat'])
+            finally:
+                if not options['keep']:
+                    self.cleanup(run_id)
+            self.stdout.write(json.dumps(report, indent=2) if options['json'] else (
+                f"{report['rows']} rows: TransactionSerializer {report['drf_cpu_ms']} ms, "
+                f"fast path {report['fast_cpu_ms']} ms CPU per response "
+                f"({report['speedup']}x, identical output: {report['identical']})"
+            ))
+            return
+
+        hot = options['scenario'] == 'hot-deposit'
+        if hot:
+            # Every request is a deposit to the one seeded account.
+            mix = {'deposit': 1}
+            options.update(customers=1, accounts_per_customer=1)
+            if options['slots'] < 0:
+                raise CommandError('--slots must be at least 0.')
+        started = time.perf_counter()
+        users = self.seed(run_id, options['customers'], options['accounts_per_customer'], Decimal(options['opening_balance']))
+        seed_seconds = time.perf_counter() - started
+
+        try:
+            if hot:
+                [(_, [(account_id, _)])] = users
+                set_balance_slots(account_id, options['slots'])
+            plan = self.plan(users, mix, options['requests'], rng)
+            report = self.run(plan, options['workers'])
+        finally:
+            if not options['keep']:
+                self.cleanup(run_id)
+
+        report['seed_seconds'] = round(seed_seconds, 3)
+        report['config'] = {
+            'vendor': connection.vendor,
+            'scenario': options['scenario'],
+            'slots': options['slots'] if hot else None,
+            'customers': options['customers'],
+            'accounts_per_customer': options['accounts_per_customer'],
+            'requests': options['requests'],
+            'workers': options['workers'],
+            'mix': mix,
+            'seed': options['seed'],
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+
+    def seed(self, run_id, customers, accounts_per_customer, opening_balance):
+        """
+        Create the customers, accounts and tokens with bulk inserts. Returns
+        a list of (token key, [(account id, account number), ...]).
+        """
+        password = make_password(None)
+        usernames = [f'bench-{run_id}-{index}' for index in range(customers)]
+        User.objects.bulk_create(
+            [User(username=username, password=password) for username in usernames], batch_size=BATCH_SIZE
+        )
+        user_ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+        Customer.objects.bulk_create([
+            Customer(
+                user_id=user_ids[username], full_name=username, email=f'{username}@bench.invalid',
+                phone_number='0000000000', date_of_birth=date(1990, 1, 1)
+            )
+            for username in usernames
+        ], batch_size=BATCH_SIZE)
+        customer_ids = dict(
+            Customer.objects.filter(user_id__in=user_ids.values()).values_list('user_id', 'pk')
+        )
+
+        numbers = iter(allocate_account_numbers(customers * accounts_per_customer))
+        Account.objects.bulk_create([
+            Account(
+                owner_id=customer_ids[user_ids[username]], account_number=next(numbers),
+                account_type='CHECKING', balance=opening_balance
+            )
+            for username in usernames
+            for _ in range(accounts_per_customer)
+        ], batch_size=BATCH_SIZE)
+        tokens = [Token(key=Token.generate_key(), user_id=user_ids[username]) for username in usernames]
+        Token.objects.bulk_create(tokens, batch_size=BATCH_SIZE)
+
+        accounts = defaultdict(list)
+        for owner_id, pk, number in Account.objects.filter(
+            owner_id__in=customer_ids.values()
+        ).values_list('owner__user_id', 'pk', 'account_number'):
+            accounts[owner_id].append((pk, number))
+        return [(token.key, accounts[token.user_id]) for token in tokens]
+
+    def serialization(self, run_id, rows, repeat):
+        """
+        Compare the CPU time of building one ``rows``-long transaction list
+        response, query included, through TransactionSerializer and through
+        ValuesSerializer with FastJSONRenderer. Reports the best of ``repeat``.
+        """
+        [(_, [(account_id, _)])] = self.seed(run_id, 1, 1, Decimal('0.00'))
+        entries = []
+        for index in range(rows):
+            amount = Decimal(index % 5000 + 1) / 100
+            entries.append(Transaction(
+                account_id=account_id, amount=amount, signed_amount=amount, balance_after=amount * 2,
+                transaction_type='DEPOSIT', direction='CREDIT', description=f'Bench deposit {index}'
+            ))
+        Transaction.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+
+        queryset = Transaction.objects.filter(account_id=account_id).order_by('-timestamp', '-id')
+        values_serializer = ValuesSerializer(TransactionSerializer)
+
+        def drf():
+            return JSONRenderer().render(TransactionSerializer(queryset.all(), many=True).data)
+
+        def fast():
+            rows = queryset.values(*values_serializer.columns)
+            return FastJSONRenderer().render(values_serializer.to_representation(rows))
+
+        def best(render):
+            timings = []
+            for _ in range(repeat):
+                started = time.process_time()
+                render()
+                timings.append(time.process_time() - started)
+            return min(timings)
+
+        drf_seconds, fast_seconds = best(drf), best(fast)
+        return {
+            'rows': rows,
+            'drf_cpu_ms': round(drf_seconds * 1000, 1),
+            'fast_cpu_ms': round(fast_seconds * 1000, 1),
+            'speedup': round(drf_seconds / fast_seconds, 1) if fast_seconds else None,
+            'identical': drf() == fast(),
+            'vendor': connection.vendor,
+        }
+
+    def plan(self, users, mix, count, rng):
+        """
+        Build the list of requests to send: (operation, token, method, path, body).
+        """
+        every_account = [account for _, accounts in users for account in accounts]
+        names, weights = zip(*mix.items())
+        requests = []
+        for operation in rng.choices(names, weights, k=count):
+            token, accounts = rng.choice(users)
+            pk, number = rng.choice(accounts)
+            amount = f'{rng.randint(1, 2000) / 100:.2f}'
+            if operation == 'deposit':
+                request = ('post', f'/api/accounts/{pk}/deposit/', {'amount': amount})
+            elif operation == 'withdraw':
+                request = ('post', f'/api/accounts/{pk}/withdraw/', {'amount': amount})
+            elif operation == 'transfer':
+                to_number = number
+                while to_number == number and len(every_account) > 1:
+                    to_number = rng.choice(every_account)[1]
+                request = ('post', f'/api/accounts/{pk}/transfer/', {'to_account_number': to_number, 'amount': amount})
+            elif operation == 'list':
+                request = ('get', '/api/accounts/', None)
+            else:
+                request = ('get', '/api/transactions/', {'account': pk})
+            requests.append((operation, token) + request)
+        return requests
+
+    def run(self, plan, workers):
+        """
+        Send the planned requests from a pool of threads, each with its own
+        client and database connection, and collect per-request samples.
+        Rate limits and concurrency caps are lifted for the run: they would
+        measure the limits, not the posting paths.
+        """
+        unlimited = override_settings(
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}},
+            MAX_CONCURRENT_REQUESTS=0, MAX_CONCURRENT_POSTINGS=0,
+        )
+        with unlimited:
+            return self.send_plan(plan, workers)
+
+    def send_plan(self, plan, workers):
+        metrics.reset()
+        samples = defaultdict(list)
+
+        def send(item):
+            operation, token, method, path, body = item
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+            queries = [0]
+
+            def count(execute, sql, params, many, context):
+                queries[0] += 1
+                return execute(sql, params, many, context)
+
+            begin = time.perf_counter()
+            with connection.execute_wrapper(count):
+                if method == 'post':
+                    response = client.post(path, body, format='json')
+                else:
+                    response = client.get(path, body)
+            return operation, (time.perf_counter() - begin, queries[0], response.status_code)
+
+        def worker(items):
+            try:
+                return [send(item) for item in items]
+            finally:
+                connections.close_all()
+
+        chunks = [plan[index::workers] for index in range(workers)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(worker, chunks):
+                for operation, sample in results:
+                    samples[operation].append(sample)
+        elapsed = time.perf_counter() - started
+
+        counters = metrics.snapshot()
+        everything = [sample for operation_samples in samples.values() for sample in operation_samples]
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'total': summarize(everything, elapsed),
+            'operations': {operation: summarize(samples[operation], elapsed) for operation in sorted(samples)},
+            'lock_conflicts': int(counter_total(counters, 'posting_conflicts_total')),
+            'lock_retries': int(counter_total(counters, 'posting_retries_total')),
+        }
+
+    def cleanup(self, run_id):
+        """
+        Delete everything seeded for this run, including the ledger rows and
+        transfers the traffic created.
+        """
+        users = User.objects.filter(username__startswith=f'bench-{run_id}-')
+        accounts = Account.objects.filter(owner__user__in=users)
+        Transaction.objects.filter(account__in=accounts).delete()
+        Transfer.objects.filter(Q(from_account__in=accounts) | Q(to_account__in=accounts)).delete()
+        accounts.delete()
+        users.delete()
+
+    def print_report(self, report):
+        header = (
+            f"{'operation':<10} {'requests':>8} {'429':>5} {'503':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>8}  statuses"
+        )
+        self.stdout.write(header)
+        rows = list(report['operations'].items()) + [('total', report['total'])]
+        for name, stats in rows:
+            statuses = ' '.join(f'{code}:{count}' for code, count in sorted(stats['statuses'].items()))
+            # None when every request of the operation was refused.
+            rps, p50, p95, p99, queries = (
+                '-' if stats[key] is None else stats[key]
+                for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+            )
+            self.stdout.write(
+                f"{name:<10} {stats['requests']:>8} {stats['throttled']:>5} {stats['unavailable']:>5} "
+                f"{rps:>8} {p50:>8} {p95:>8} {p99:>8} {queries:>8}  {statuses}"
+            )
+        self.stdout.write(
+            f"Lock conflicts: {report['lock_conflicts']}, retries: {report['lock_retries']}, "
+            f"elapsed: {report['elapsed_seconds']}s, seeding: {report['seed_seconds']}s"
+        )
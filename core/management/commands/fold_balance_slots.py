@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Account
+from core.services.balances import fold_slots
+
+
+class Command(BaseCommand):
+    help = (
+        'Move the balance slots of accounts that use them back into the account '
+        'balance. Meant to run periodically, e.g. every minute from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--account', type=int, action='append', dest='accounts',
+            help='Only fold this account id (may be repeated; default: every account with slots).'
+        )
+
+    def handle(self, *args, **options):
+        account_ids = Account.objects.filter(balance_slots__gt=0).order_by('pk').values_list('pk', flat=True)
+        if options['accounts']:
+            account_ids = account_ids.filter(pk__in=options['accounts'])
+
+        folded = total = 0
+        for account_id in account_ids:
+            amount = fold_slots(account_id)
+            if amount:
+                folded += 1
+                total += amount
+        self.stdout.write(self.style.SUCCESS(f'Folded {total} from the slots of {folded} accounts.'))
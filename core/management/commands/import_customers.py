@@ -0,0 +1,158 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.checkpoints import read_checkpoint, save_checkpoint
+from core.services.onboarding import create_customers, validate_registrations
+
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def read_records(path, file_format):
+    """
+    Yield (number, record) for every registration in the file: the record
+    number for CSV (the header not counted), the line number for NDJSON.
+    Lines that are not valid JSON come back as a ValueError.
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if file_format == 'csv':
+            yield from enumerate(csv.DictReader(source), 1)
+            return
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as exc:
+                yield number, exc
+
+
+def load_checkpoint(path, source):
+    state = {'source': source, 'rows': 0, 'imported': 0, 'rejected': 0, 'rejects_offset': 0}
+    saved = read_checkpoint(path)
+    if saved is None:
+        return state
+    if saved.get('source') != source:
+        raise CommandError(
+            f'{path} is the checkpoint of {saved.get("source")}, not {source}; '
+            f'pass --restart to start over or --checkpoint to use another file.'
+        )
+    state.update(saved)
+    return state
+
+
+class Command(BaseCommand):
+    help = (
+        'Onboard customers in bulk from a CSV or NDJSON file with the registration '
+        'fields. Rows are validated and inserted a chunk at a time, passwords are '
+        'hashed across a process pool, invalid rows go to a rejects file, and an '
+        'interrupted import resumes from its checkpoint.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with a header row) or NDJSON file of registrations.')
+        parser.add_argument(
+            '--format', choices=['csv', 'ndjson'],
+            help='File format (default: from the extension, .csv or .ndjson/.jsonl).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Rows validated and committed together (default: 1000).'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Password hashing processes; 0 hashes in this process (default: one per CPU).'
+        )
+        parser.add_argument(
+            '--rejects', help='Where rejected rows are written as NDJSON (default: PATH.rejects.ndjson).'
+        )
+        parser.add_argument(
+            '--checkpoint', help='Progress file used to resume an interrupted import (default: PATH.checkpoint).'
+        )
+        parser.add_argument(
+            '--restart', action='store_true', help='Ignore an existing checkpoint and start from the first row.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'{path} does not exist.')
+        file_format = options['format'] or FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError(f'Cannot tell the format of {path}; pass --format.')
+        if options['chunk_size'] < 1 or options['workers'] < 0:
+            raise CommandError('--chunk-size must be at least 1 and --workers at least 0.')
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+        rejects_path = options['rejects'] or f'{path}.rejects.ndjson'
+
+        source = os.path.abspath(path)
+        state = load_checkpoint(None if options['restart'] else checkpoint_path, source)
+        if state['rows']:
+            self.stdout.write(f'Resuming after row {state["rows"]}.')
+
+        workers = options['workers']
+        # Workers only hash; django.setup() makes that work where they are spawned, not forked.
+        pool = ProcessPoolExecutor(workers, initializer=django.setup) if workers else nullcontext()
+        started = time.perf_counter()
+        imported = rejected = 0
+        with pool, open(rejects_path, 'a', encoding='utf-8') as rejects:
+            # Drop rejects written after the checkpoint; their rows are read again.
+            rejects.truncate(state['rejects_offset'])
+            records = (item for item in read_records(path, file_format) if item[0] > state['rows'])
+            while chunk := list(islice(records, options['chunk_size'])):
+                originals = dict(chunk)
+                errors = {
+                    number: {'non_field_errors': [f'Invalid JSON: {record}']}
+                    for number, record in chunk if isinstance(record, ValueError)
+                }
+                valid, invalid = validate_registrations(
+                    (number, record) for number, record in chunk if number not in errors
+                )
+                errors.update(invalid)
+
+                passwords = [data['password'] for _, data in valid]
+                if workers:
+                    hashed = pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4)))
+                else:
+                    hashed = map(make_password, passwords)
+                for (_, data), password in zip(valid, hashed):
+                    data['password'] = password
+                conflicts = create_customers(valid)
+                errors.update(conflicts)
+
+                for number in sorted(errors):
+                    record = originals[number]
+                    if isinstance(record, dict):
+                        record = {key: value for key, value in record.items() if key != 'password'}
+                    else:
+                        record = None
+                    rejects.write(json.dumps({'row': number, 'errors': errors[number], 'record': record}) + '\n')
+                rejects.flush()
+                os.fsync(rejects.fileno())
+
+                imported += len(valid) - len(conflicts)
+                rejected += len(errors)
+                state.update(
+                    rows=chunk[-1][0], imported=state['imported'] + len(valid) - len(conflicts),
+                    rejected=state['rejected'] + len(errors), rejects_offset=rejects.tell(),
+                )
+                save_checkpoint(checkpoint_path, state)
+                if options['verbosity'] >= 2:
+                    self.stdout.write(f'Row {state["rows"]}: {state["imported"]} imported, {state["rejected"]} rejected.')
+
+        elapsed = time.perf_counter() - started
+        rate = f' ({imported / elapsed:.0f}/s)' if elapsed and imported else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} customers and rejected {rejected} rows in {elapsed:.1f}s{rate}; '
+            f'{state["imported"]} imported and {state["rejected"]} rejected in total.'
+        ))
+        if state['rejected']:
+            self.stdout.write(f'Rejected rows are listed in {rejects_path}.')
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.posting_queue import DEFAULT_BATCH_SIZE, process_postings
+
+
+class Command(BaseCommand):
+    help = (
+        'Apply postings queued with "Prefer: respond-async", a batch per database '
+        'transaction. Runs until stopped unless --once is given. Run one worker per '
+        'partition to keep each account\'s postings in order.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f'Postings applied per transaction (default: {DEFAULT_BATCH_SIZE}).'
+        )
+        parser.add_argument(
+            '--partitions', type=int, default=1,
+            help='Number of workers the queue is split between, by account id (default: 1).'
+        )
+        parser.add_argument(
+            '--partition', type=int, default=0,
+            help='Which of the --partitions this worker processes, from 0 (default: 0).'
+        )
+        parser.add_argument(
+            '--idle-sleep', type=float, default=0.2,
+            help='Seconds to wait before polling again when the queue is empty (default: 0.2).'
+        )
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        if not 0 <= options['partition'] < options['partitions']:
+            raise CommandError('--partition must be between 0 and --partitions - 1.')
+
+        total = 0
+        try:
+            while True:
+                processed = process_postings(options['batch_size'], options['partition'], options['partitions'])
+                total += processed
+                if processed and options['verbosity'] >= 2:
+                    self.stdout.write(f'Processed {processed} postings.')
+                if not processed:
+                    if options['once']:
+                        break
+                    time.sleep(options['idle_sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Processed {total} queued postings.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Account
+from core.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the monthly account rollups from the transaction ledger.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--account', type=int, action='append', dest='accounts',
+            help='Only rebuild this account id (may be repeated; default: all accounts).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Accounts rebuilt per database transaction, to keep locks short (default: 500).'
+        )
+
+    def handle(self, *args, **options):
+        account_ids = Account.objects.order_by('pk').values_list('pk', flat=True)
+        if options['accounts']:
+            account_ids = account_ids.filter(pk__in=options['accounts'])
+        account_ids = list(account_ids)
+
+        total = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(account_ids), batch_size):
+            total += rebuild_rollups(account_ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {total} rollups for {len(account_ids)} accounts.'
+        ))
@@ -0,0 +1,126 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min
+
+from core.models import Account
+from core.services.checkpoints import read_checkpoint, save_checkpoint
+from core.services.reconciliation import reconcile_range
+
+
+def start_worker():
+    django.setup()
+    # Never share a connection opened before the fork with the parent.
+    connections.close_all()
+
+
+def load_checkpoint(path, range_size):
+    state = {'range_size': range_size, 'done': [], 'accounts': 0, 'rows': 0, 'discrepancies': 0, 'report_offset': 0}
+    saved = read_checkpoint(path)
+    if saved is None:
+        return state
+    if saved.get('range_size') != range_size:
+        raise CommandError(
+            f'{path} was written with --range-size {saved.get("range_size")}; '
+            f'pass the same size, or --restart to start over.'
+        )
+    state.update(saved)
+    return state
+
+
+class Command(BaseCommand):
+    help = (
+        'Check every account balance against its transaction ledger. The account '
+        'ids are split into ranges checked across a process pool without locking '
+        'anything, discrepancies are written to an NDJSON report, and an '
+        'interrupted run resumes from its checkpoint. Exits with an error if any '
+        'discrepancy was found.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('report', help='NDJSON file the discrepancies are written to.')
+        parser.add_argument(
+            '--range-size', type=int, default=10000,
+            help='Account ids checked together by one worker (default: 10000).'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Worker processes; 0 checks in this process (default: one per CPU).'
+        )
+        parser.add_argument(
+            '--checkpoint', help='Progress file used to resume an interrupted run (default: REPORT.checkpoint).'
+        )
+        parser.add_argument(
+            '--restart', action='store_true', help='Ignore an existing checkpoint and check every range again.'
+        )
+
+    def handle(self, *args, **options):
+        range_size, workers = options['range_size'], options['workers']
+        if range_size < 1 or workers < 0:
+            raise CommandError('--range-size must be at least 1 and --workers at least 0.')
+        report_path = options['report']
+        checkpoint_path = options['checkpoint'] or f'{report_path}.checkpoint'
+
+        state = load_checkpoint(None if options['restart'] else checkpoint_path, range_size)
+        bounds = Account.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        done = set(state['done'])
+        ranges = [
+            (start, start + range_size)
+            for start in range(bounds['low'] or 0, (bounds['high'] or -1) + 1, range_size)
+            if start not in done
+        ]
+        if done:
+            self.stdout.write(f'Resuming with {len(ranges)} ranges left.')
+
+        started = time.perf_counter()
+        accounts = 0
+        with open(report_path, 'a', encoding='utf-8') as report:
+            # Drop lines written after the checkpoint; their ranges are checked again.
+            report.truncate(state['report_offset'])
+            if workers:
+                # Children must open their own connections, not inherit ours.
+                connections.close_all()
+                with ProcessPoolExecutor(workers, initializer=start_worker) as pool:
+                    futures = {pool.submit(reconcile_range, *span): span for span in ranges}
+                    results = ((futures[future], future.result()) for future in as_completed(futures))
+                    accounts = self.record(results, report, state, checkpoint_path, options['verbosity'])
+            else:
+                results = ((span, reconcile_range(*span)) for span in ranges)
+                accounts = self.record(results, report, state, checkpoint_path, options['verbosity'])
+
+        elapsed = time.perf_counter() - started
+        rate = f' ({accounts / elapsed:.0f}/s)' if elapsed and accounts else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {accounts} accounts in {elapsed:.1f}s{rate}; {state["accounts"]} accounts and '
+            f'{state["rows"]} ledger rows checked in total.'
+        ))
+        if state['discrepancies']:
+            raise CommandError(f'Found {state["discrepancies"]} discrepancies; they are listed in {report_path}.')
+
+    def record(self, results, report, state, checkpoint_path, verbosity):
+        """
+        Append each finished range's discrepancies to the report and mark the
+        range done in the checkpoint. Returns the number of accounts checked.
+        """
+        checked = 0
+        for (start, end), (accounts, rows, discrepancies) in results:
+            for discrepancy in discrepancies:
+                report.write(json.dumps(discrepancy) + '\n')
+            report.flush()
+            os.fsync(report.fileno())
+
+            checked += accounts
+            state['done'].append(start)
+            state.update(
+                accounts=state['accounts'] + accounts, rows=state['rows'] + rows,
+                discrepancies=state['discrepancies'] + len(discrepancies), report_offset=report.tell(),
+            )
+            save_checkpoint(checkpoint_path, state)
+            if verbosity >= 2:
+                self.stdout.write(f'Accounts {start}-{end - 1}: {accounts} checked, {len(discrepancies)} discrepancies.')
+        return checked
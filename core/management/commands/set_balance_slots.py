@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Account
+from core.services.balances import set_balance_slots
+
+# Beyond the number of concurrent writers, more slots only add rows to sum.
+MAX_SLOTS = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Spread deposits to a hot account over N balance slots, so concurrent '
+        'deposits stop waiting on one row lock. 0 turns slots off again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('account_number', help='Number of the account, e.g. ACC-000000000000001.')
+        parser.add_argument('slots', type=int, help=f'Number of slots, 0 to {MAX_SLOTS}.')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['slots'] <= MAX_SLOTS:
+            raise CommandError(f'slots must be between 0 and {MAX_SLOTS}.')
+        try:
+            account = Account.objects.get(account_number=options['account_number'])
+        except Account.DoesNotExist:
+            raise CommandError(f'Account {options["account_number"]} does not exist.')
+
+        set_balance_slots(account.pk, options['slots'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Account {account.account_number} now uses {options["slots"]} balance slots.'
+        ))
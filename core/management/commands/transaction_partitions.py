@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Create upcoming monthly transaction partitions and, with --archive, '
+        'move months older than --retain-months to compressed read-only files. '
+        'Requires PostgreSQL; meant to run daily from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead', type=int, default=3,
+            help='Months past the current one that must have a partition (default: 3).'
+        )
+        parser.add_argument(
+            '--archive', action='store_true',
+            help='Archive and drop partitions older than --retain-months.'
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=12,
+            help='Months, including the current one, kept in the database (default: 12).'
+        )
+        parser.add_argument(
+            '--archive-dir', default=settings.TRANSACTION_ARCHIVE_DIR,
+            help='Directory archive files are written to (default: TRANSACTION_ARCHIVE_DIR).'
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            raise CommandError('The transaction table is not partitioned; this requires PostgreSQL.')
+        if options['retain_months'] < 1:
+            raise CommandError('--retain-months must be at least 1.')
+
+        current = partitions.month_start(timezone.now())
+        for offset in range(options['ahead'] + 1):
+            month = partitions.add_months(current, offset)
+            if partitions.create_partition(month):
+                self.stdout.write(f'Created partition {partitions.partition_name(month)}.')
+
+        if options['archive']:
+            cutoff = partitions.add_months(current, 1 - options['retain_months'])
+            for month in partitions.partition_months():
+                if month >= cutoff:
+                    break
+                archive = partitions.archive_partition(month, options['archive_dir'])
+                self.stdout.write(f'Archived {archive.row_count} rows of {month:%Y-%m} to {archive.path}.')
+
+        self.stdout.write(self.style.SUCCESS('Transaction partitions are up to date.'))
@@ -0,0 +1,131 @@
+# core/metrics.py
+"""
+A small in-process metrics registry.
+
+Counters only ever go up; summaries keep a count and a running sum so that
+averages and rates can be derived; histograms also count observations per
+bucket so that percentiles can be estimated. Metric values are keyed by name
+plus a sorted tuple of label pairs, and can be exported in the Prometheus
+text format with render_prometheus().
+"""
+import bisect
+import threading
+from collections import defaultdict
+
+# Upper bounds of the default histogram buckets, suited to request latencies in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_summaries = defaultdict(lambda: [0, 0.0])
+# Key -> [bucket bounds, per-bucket counts (last one is +Inf), count, sum].
+_histograms = {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def increment(name, value=1, **labels):
+    """
+    Add ``value`` to the counter ``name``.
+    """
+    with _lock:
+        _counters[_key(name, labels)] += value
+
+
+def observe(name, value, **labels):
+    """
+    Record one observation (e.g. a duration in seconds) for ``name``.
+    """
+    with _lock:
+        summary = _summaries[_key(name, labels)]
+        summary[0] += 1
+        summary[1] += value
+
+
+def histogram(name, value, buckets=DEFAULT_BUCKETS, **labels):
+    """
+    Record one observation for the histogram ``name``. The buckets of a
+    series are fixed by its first observation.
+    """
+    key = _key(name, labels)
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = [tuple(buckets), [0] * (len(buckets) + 1), 0, 0.0]
+        series[1][bisect.bisect_left(series[0], value)] += 1
+        series[2] += 1
+        series[3] += value
+
+
+def snapshot():
+    """
+    Return a copy of all metric values as plain dicts.
+    """
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'summaries': {key: tuple(value) for key, value in _summaries.items()},
+            'histograms': {
+                key: (bounds, tuple(counts), count, total)
+                for key, (bounds, counts, count, total) in _histograms.items()
+            },
+        }
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus():
+    """
+    Render all metrics in the Prometheus text exposition format (0.0.4).
+    """
+    values = snapshot()
+    families = defaultdict(list)
+    for (name, labels), value in values['counters'].items():
+        families[(name, 'counter')].append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    for (name, labels), (count, total) in values['summaries'].items():
+        families[(name, 'summary')].extend([
+            f'{name}_count{_format_labels(labels)} {count}',
+            f'{name}_sum{_format_labels(labels)} {_format_value(total)}',
+        ])
+    for (name, labels), (bounds, counts, count, total) in values['histograms'].items():
+        lines = families[(name, 'histogram')]
+        cumulative = 0
+        for bound, bucket in zip(bounds + ('+Inf',), counts):
+            cumulative += bucket
+            le = bound if bound == '+Inf' else _format_value(bound)
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", le)])} {cumulative}')
+        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+
+    output = []
+    for (name, kind), lines in sorted(families.items()):
+        output.append(f'# TYPE {name} {kind}')
+        output.extend(sorted(lines) if kind != 'histogram' else lines)
+    return '\n'.join(output) + '\n'
+
+
+def reset():
+    """
+    Clear all recorded values. Intended for tests and benchmarks.
+    """
+    with _lock:
+        _counters.clear()
+        _summaries.clear()
+        _histograms.clear()
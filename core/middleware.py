@@ -0,0 +1,191 @@
+# core/middleware.py
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+from . import db_router, instrumentation, metrics
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Bucket bounds for the number of SQL statements per request.
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Send all reads of unsafe requests (postings) to the primary, and pin a
+    user to the primary for a short while after a successful write so they
+    never read a stale balance from a lagging replica. Users are matched to
+    their pin during authentication, see CachedTokenAuthentication.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = db_router.route_to_primary(request.method not in SAFE_METHODS)
+        try:
+            response = self.get_response(request)
+        finally:
+            db_router.reset_routing(token)
+        self.record_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = db_router.route_to_primary(request.method not in SAFE_METHODS)
+        try:
+            response = await self.get_response(request)
+        finally:
+            db_router.reset_routing(token)
+        self.record_write(request, response)
+        return response
+
+    def record_write(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        # DRF copies the authenticated user onto the underlying request; only
+        # look at it if it was resolved, to avoid a session lookup here.
+        user = request.__dict__.get('user')
+        if user is not None and getattr(user, 'is_authenticated', False):
+            db_router.record_write(user.pk)
+
+
+class MetricsMiddleware:
+    """
+    Record, per route (the URL name, e.g. ``account-deposit``), request
+    latency and status, and the number, total duration and rows of the SQL
+    statements the request ran. Exposed by the ``/metrics`` view.
+
+    A fraction METRICS_QUERY_SAMPLE_RATE of requests also keeps its
+    statements; sampled requests slower than METRICS_SLOW_REQUEST_SECONDS
+    are logged with them as a warning.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = self.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.finish_request(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats, token = self.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.finish_request(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def start(self):
+        rate = settings.METRICS_QUERY_SAMPLE_RATE
+        return instrumentation.start_request(sample=rate > 0 and random.random() < rate)
+
+    def record(self, request, response, stats, elapsed):
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unmatched'
+        method = request.method
+
+        metrics.increment('http_requests_total', route=route, method=method, status=response.status_code)
+        metrics.histogram('http_request_duration_seconds', elapsed, route=route, method=method)
+        metrics.histogram('db_queries_per_request', stats.queries, buckets=QUERY_COUNT_BUCKETS, route=route)
+        metrics.increment('db_queries_total', stats.queries, route=route)
+        metrics.increment('db_query_seconds_total', stats.seconds, route=route)
+        metrics.increment('db_rows_total', stats.rows, route=route)
+
+        if stats.statements is not None and elapsed >= settings.METRICS_SLOW_REQUEST_SECONDS:
+            logger.warning(
+                'Slow request %s %s (%s) took %.3fs with %d queries in %.3fs:\n%s',
+                method, request.path, route, elapsed, stats.queries, stats.seconds,
+                '\n'.join(f'  {seconds * 1000:.1f}ms {sql}' for sql, seconds in stats.statements)
+            )
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Shed load before it reaches the database: when MAX_CONCURRENT_REQUESTS
+    requests, or MAX_CONCURRENT_POSTINGS unsafe ones, are already in progress
+    in this process, answer 429 with a Retry-After of
+    CONCURRENCY_RETRY_AFTER seconds straight away. A cap of 0 is no cap.
+
+    The caps are per process, so the database sees at most the number of
+    worker processes times the cap. Rate limits per user are applied later,
+    by core.throttling.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.requests = self.postings = 0
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        posting = request.method not in SAFE_METHODS
+        if not self.admit(posting):
+            return self.shed(posting)
+        try:
+            return self.get_response(request)
+        finally:
+            self.release(posting)
+
+    async def __acall__(self, request):
+        posting = request.method not in SAFE_METHODS
+        if not self.admit(posting):
+            return self.shed(posting)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.release(posting)
+
+    def admit(self, posting):
+        max_requests, max_postings = settings.MAX_CONCURRENT_REQUESTS, settings.MAX_CONCURRENT_POSTINGS
+        with self.lock:
+            if max_requests and self.requests >= max_requests:
+                return False
+            if posting and max_postings and self.postings >= max_postings:
+                return False
+            self.requests += 1
+            self.postings += posting
+        return True
+
+    def release(self, posting):
+        with self.lock:
+            self.requests -= 1
+            self.postings -= posting
+
+    def shed(self, posting):
+        metrics.increment('shed_requests_total', kind='postings' if posting else 'reads')
+        response = JsonResponse({'detail': 'Too many requests in progress; retry shortly.'}, status=429)
+        response['Retry-After'] = str(settings.CONCURRENCY_RETRY_AFTER)
+        return response
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_running_balances(apps, schema_editor):
+    """
+    Fill signed_amount and balance_after for existing ledger rows.
+
+    Withdrawals and outgoing transfers were stored as positive amounts, so the
+    direction of a transfer leg is recovered from its description. Running
+    balances are computed backwards from each account's current balance, which
+    also works for accounts that were opened with a non-zero balance.
+    """
+    Account = apps.get_model('core', 'Account')
+    Transaction = apps.get_model('core', 'Transaction')
+
+    for account_id, balance in Account.objects.values_list('id', 'balance').iterator():
+        rows = Transaction.objects.filter(account_id=account_id).order_by('-timestamp', '-id')
+        pending = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            if row.transaction_type == 'DEPOSIT':
+                signed = row.amount
+            elif row.transaction_type == 'WITHDRAWAL':
+                signed = -row.amount
+            elif (row.description or '').startswith('Transfer to'):
+                signed = -row.amount
+            else:
+                signed = row.amount
+            row.signed_amount = signed
+            row.balance_after = balance
+            balance -= signed
+            pending.append(row)
+            if len(pending) >= BATCH_SIZE:
+                Transaction.objects.bulk_update(pending, ['signed_amount', 'balance_after'])
+                pending = []
+        if pending:
+            Transaction.objects.bulk_update(pending, ['signed_amount', 'balance_after'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_transaction_account_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='signed_amount',
+            field=models.DecimalField(decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='balance_after',
+            field=models.DecimalField(decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.RunPython(backfill_running_balances, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='transaction',
+            name='signed_amount',
+            field=models.DecimalField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='balance_after',
+            field=models.DecimalField(decimal_places=2, max_digits=12),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:15
+
+from django.db import migrations, models
+
+SEQUENCE_NAME = 'core_account_number_seq'
+
+# Must match core.services.account_numbers.BLOCK_SIZE.
+BLOCK_SIZE = 1000
+
+
+def create_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE_NAME} START WITH 1 INCREMENT BY {BLOCK_SIZE}'
+        )
+    NumberSequence = apps.get_model('core', 'NumberSequence')
+    NumberSequence.objects.get_or_create(name=SEQUENCE_NAME)
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP SEQUENCE IF EXISTS {SEQUENCE_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberSequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:23
+
+from datetime import date
+
+from django.db import migrations, models
+from django.utils import timezone
+
+TABLE = 'core_transaction'
+UNPARTITIONED = 'core_transaction_unpartitioned'
+
+# Months created past the current one; `manage.py transaction_partitions`
+# keeps this window rolling forward.
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rebuild_table(schema_editor, partitioned):
+    """
+    Recreate the transaction table, partitioned by month on ``timestamp`` or
+    as a plain table, keeping its rows, ids, indexes and foreign keys.
+
+    A partitioned table's primary key has to include the partition key, so
+    it becomes (id, timestamp); ids still come from a single sequence and
+    stay unique.
+    """
+    execute = schema_editor.execute
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s',
+            [TABLE, f'{TABLE}_pkey']
+        )
+        indexes = [row[0].replace(' ON ONLY ', ' ON ') for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('c', 'f')",
+            [TABLE]
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(f'SELECT MIN("timestamp") FROM {TABLE}')
+        oldest = cursor.fetchone()[0] or timezone.now()
+
+    execute(f'ALTER TABLE {TABLE} RENAME TO {UNPARTITIONED}')
+    if partitioned:
+        execute(f'CREATE TABLE {TABLE} (LIKE {UNPARTITIONED} INCLUDING DEFAULTS) PARTITION BY RANGE ("timestamp")')
+        month = date(oldest.year, oldest.month, 1)
+        today = timezone.now()
+        last = add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00+00')"
+            )
+            month = add_months(month, 1)
+        primary_key = '(id, "timestamp")'
+    else:
+        execute(f'CREATE TABLE {TABLE} (LIKE {UNPARTITIONED} INCLUDING DEFAULTS)')
+        primary_key = '(id)'
+
+    execute(f'INSERT INTO {TABLE} SELECT * FROM {UNPARTITIONED}')
+    # Dropping the old table also drops its id sequence, so a new one is
+    # created and moved past the highest id.
+    execute(f'DROP TABLE {UNPARTITIONED}')
+    execute(f'CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+    execute(f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)")
+    execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+    execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY {primary_key}')
+    for definition in indexes:
+        execute(definition)
+    for name, definition in constraints:
+        execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+
+
+def partition_transactions(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        rebuild_table(schema_editor, partitioned=True)
+
+
+def unpartition_transactions(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        rebuild_table(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_account_number_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+                ('path', models.CharField(max_length=500)),
+                ('row_count', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['month'],
+            },
+        ),
+        migrations.RunPython(partition_transactions, unpartition_transactions),
+    ]
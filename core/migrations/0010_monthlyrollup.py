@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:26
+
+from datetime import timezone as dt_timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+BATCH_SIZE = 1000
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Build the rollups of the existing ledger with one aggregate query.
+    """
+    Transaction = apps.get_model('core', 'Transaction')
+    MonthlyRollup = apps.get_model('core', 'MonthlyRollup')
+
+    credit, debit = Q(signed_amount__gt=0), Q(signed_amount__lte=0)
+    rows = (
+        Transaction.objects
+        .annotate(month=TruncMonth('timestamp', output_field=models.DateField(), tzinfo=dt_timezone.utc))
+        .values('account_id', 'month', 'transaction_type')
+        .annotate(
+            credit_count=Count('id', filter=credit), credit_total=Sum('signed_amount', filter=credit),
+            debit_count=Count('id', filter=debit), debit_total=Sum('signed_amount', filter=debit),
+        )
+        .order_by()
+    )
+    MonthlyRollup.objects.bulk_create([
+        MonthlyRollup(
+            account_id=row['account_id'], month=row['month'], transaction_type=row['transaction_type'],
+            credit_count=row['credit_count'], credit_total=row['credit_total'] or 0,
+            debit_count=row['debit_count'], debit_total=-(row['debit_total'] or 0),
+        )
+        for row in rows
+    ], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_transaction_partitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('transaction_type', models.CharField(max_length=10)),
+                ('credit_count', models.PositiveIntegerField(default=0)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('debit_count', models.PositiveIntegerField(default=0)),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='core.account')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('account', 'month', 'transaction_type'), name='core_rollup_account_month_type_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
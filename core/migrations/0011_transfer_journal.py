@@ -0,0 +1,134 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:43
+
+import re
+from collections import defaultdict, deque
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+LEG_DESCRIPTION = re.compile(r'^Transfer (to|from) (\S+)$')
+
+
+def backfill_directions(apps, schema_editor):
+    Transaction = apps.get_model('core', 'Transaction')
+    Transaction.objects.update(direction=models.Case(
+        models.When(signed_amount__gt=0, then=models.Value('CREDIT')),
+        default=models.Value('DEBIT'),
+    ))
+
+
+def backfill_transfers(apps, schema_editor):
+    """
+    Pair up existing transfer legs and create their journal entries.
+
+    Until now the legs were only tied together by their descriptions,
+    "Transfer to <number>" on the debit and "Transfer from <number>" on the
+    credit, and the debit was always written just before its credit. So
+    walking the legs in id order, each credit belongs to the oldest debit
+    still unmatched with the same accounts and amount. Legs whose
+    description names no existing account are left unlinked.
+    """
+    Account = apps.get_model('core', 'Account')
+    Transaction = apps.get_model('core', 'Transaction')
+    Transfer = apps.get_model('core', 'Transfer')
+
+    # (from account, to account, amount) -> debit legs waiting for their credit.
+    pending = defaultdict(deque)
+    legs = (
+        Transaction.objects.filter(transaction_type='TRANSFER').order_by('id')
+        .values_list('id', 'account_id', 'amount', 'signed_amount', 'timestamp', 'description')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    while True:
+        chunk = [leg for _, leg in zip(range(BATCH_SIZE), legs)]
+        if not chunk:
+            break
+        parsed = {
+            leg[0]: match.groups() for leg in chunk
+            if (match := LEG_DESCRIPTION.match(leg[5] or ''))
+        }
+        accounts = dict(
+            Account.objects.filter(account_number__in={number for _, number in parsed.values()})
+            .values_list('account_number', 'pk')
+        )
+
+        updates, pairs = {}, []
+        for pk, account, amount, signed, timestamp, _ in chunk:
+            word, number = parsed.get(pk, (None, None))
+            counterparty = accounts.get(number)
+            if counterparty is None or (word == 'to') != (signed < 0):
+                continue
+            updates[pk] = Transaction(pk=pk, counterparty_id=counterparty)
+            if signed < 0:
+                pending[(account, counterparty, amount)].append((pk, timestamp))
+            elif waiting := pending.get((counterparty, account, amount)):
+                debit, created_at = waiting.popleft()
+                pairs.append((
+                    Transfer(from_account_id=counterparty, to_account_id=account, amount=amount, created_at=created_at),
+                    debit, pk,
+                ))
+
+        Transfer.objects.bulk_create([transfer for transfer, _, _ in pairs])
+        for transfer, debit, credit in pairs:
+            updates.setdefault(debit, Transaction(pk=debit, counterparty_id=transfer.to_account_id))
+            updates[debit].transfer_id = updates[credit].transfer_id = transfer.pk
+        Transaction.objects.bulk_update(updates.values(), ['counterparty', 'transfer'], batch_size=BATCH_SIZE)
+
+    # The foreign keys are checked at commit by deferred triggers, and
+    # PostgreSQL refuses the ALTER TABLE and CREATE INDEX below while those
+    # are pending; check them now instead.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_monthlyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Transfer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('from_account', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='outgoing_transfers', to='core.account')),
+                ('to_account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='incoming_transfers', to='core.account')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['from_account', 'to_account', 'created_at'], name='core_transfer_pair_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='direction',
+            field=models.CharField(choices=[('CREDIT', 'Credit'), ('DEBIT', 'Debit')], max_length=6, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='counterparty',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.account'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='transfer',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='legs', to='core.transfer'),
+        ),
+        migrations.RunPython(backfill_directions, migrations.RunPython.noop),
+        migrations.RunPython(backfill_transfers, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='transaction',
+            name='direction',
+            field=models.CharField(choices=[('CREDIT', 'Credit'), ('DEBIT', 'Debit')], max_length=6),
+        ),
+        # Built after the backfill rather than maintained through it.
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'counterparty', 'timestamp', 'id'], name='core_txn_counterparty_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_transfer_journal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveSmallIntegerField()),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveConstraint(
+            model_name='monthlyrollup',
+            name='core_rollup_account_month_type_uniq',
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='balance_slots',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='monthlyrollup',
+            name='slot',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(fields=('account', 'month', 'transaction_type', 'slot'), name='core_rollup_account_month_type_uniq'),
+        ),
+        migrations.AddField(
+            model_name='balanceslot',
+            name='account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='core.account'),
+        ),
+        migrations.AddConstraint(
+            model_name='balanceslot',
+            constraint=models.UniqueConstraint(fields=('account', 'slot'), name='core_balanceslot_account_slot_uniq'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_queuedposting'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['timestamp', 'id'], name='core_txn_timestamp_idx'),
+        ),
+    ]
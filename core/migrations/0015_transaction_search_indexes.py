@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:09
+
+from django.db import migrations, models
+
+TRIGRAM_INDEX = 'core_txn_description_trgm_idx'
+
+
+def create_trigram_index(apps, schema_editor):
+    # Serves ?search= (description__icontains, which compares UPPER(description))
+    # on PostgreSQL; other databases scan the account's rows instead.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON core_transaction '
+            f'USING gin (UPPER(description) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_transaction_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'transaction_type', 'timestamp', 'id'], name='core_txn_account_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'amount'], name='core_txn_account_amount_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
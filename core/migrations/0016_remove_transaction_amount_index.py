@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_transaction_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='core_txn_account_amount_idx',
+        ),
+    ]
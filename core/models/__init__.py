@@ -1,3 +1,10 @@
 from .customer import Customer
 from .account import Account
-from .transaction import Transaction
\ No newline at end of file
+from .transaction import Transaction
+from .idempotency import IdempotencyKey
+from .sequence import NumberSequence
+from .archive import TransactionArchive
+from .rollup import MonthlyRollup
+from .transfer import Transfer
+from .balance_slot import BalanceSlot
+from .queued_posting import QueuedPosting
@@ -1,7 +1,23 @@
 from django.db import models
+from django.db.models import Max, OuterRef, Subquery, Sum
 from .customer import Customer 
-import random
-import time
+
+
+class AccountQuerySet(models.QuerySet):
+    def with_slot_totals(self):
+        """
+        Annotate each account with the sum and latest update of its balance
+        slots (None when it has none), used by ``total_balance`` and
+        ``last_modified`` without a query per account.
+        """
+        # Imported here because balance_slot imports this module.
+        from .balance_slot import BalanceSlot
+        slots = BalanceSlot.objects.filter(account=OuterRef('pk')).order_by().values('account')
+        return self.annotate(
+            slot_balance=Subquery(slots.annotate(total=Sum('balance')).values('total')),
+            slot_updated_at=Subquery(slots.annotate(latest=Max('updated_at')).values('latest')),
+        )
+
 
 class Account(models.Model):
     ACCOUNT_TYPES = (
@@ -15,10 +31,45 @@ class Account(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Number of BalanceSlot rows deposits are spread over; 0 keeps the whole
+    # balance in ``balance``. Opt-in for hot accounts receiving many
+    # concurrent deposits, such as merchant collection accounts. With slots,
+    # ``balance`` holds only the folded part and may even be negative.
+    balance_slots = models.PositiveSmallIntegerField(default=0)
+
+    objects = AccountQuerySet.as_manager()
+
+    @property
+    def total_balance(self):
+        """
+        The account's balance including its slots. Uses the ``slot_balance``
+        annotation of ``with_slot_totals()`` when present.
+        """
+        if not self.balance_slots:
+            return self.balance
+        if not hasattr(self, 'slot_balance'):
+            self.slot_balance = self.slots.aggregate(total=Sum('balance'))['total']
+        return self.balance + (self.slot_balance or 0)
+
+    @property
+    def last_modified(self):
+        """
+        When the balance last changed, as deposits into slots leave
+        ``updated_at`` alone.
+        """
+        if not self.balance_slots:
+            return self.updated_at
+        if not hasattr(self, 'slot_updated_at'):
+            self.slot_updated_at = self.slots.aggregate(latest=Max('updated_at'))['latest']
+        return max(self.updated_at, self.slot_updated_at or self.updated_at)
+
     def __str__(self):
         return f"{self.owner.full_name} - {self.account_type} ({self.account_number})"
     
     def save(self, *args, **kwargs):
-        if not self.pk:
-            self.account_number = f"ACC-{int(time.time())}{random.randint(100, 999)}"
+        # Bulk paths may assign numbers up front with allocate_account_numbers().
+        if not self.pk and not self.account_number:
+            # Imported here because the services package depends on the models.
+            from ..services.account_numbers import allocate_account_numbers
+            self.account_number = allocate_account_numbers()[0]
         super().save(*args, **kwargs)
\ No newline at end of file
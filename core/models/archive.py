@@ -0,0 +1,26 @@
+# core/models/archive.py
+from django.db import models
+
+class TransactionArchive(models.Model):
+    """
+    A month of ledger rows that has been copied out of its PostgreSQL
+    partition into a read-only, gzip-compressed CSV file, after which the
+    partition was dropped. The statement export and as-of balance lookups
+    read these files for months that are no longer in the database.
+    """
+    # First day of the archived month (UTC).
+    month = models.DateField(unique=True)
+
+    path = models.CharField(max_length=500)
+    row_count = models.PositiveIntegerField()
+
+    # SHA-256 of the compressed file, to detect a damaged or altered archive.
+    sha256 = models.CharField(max_length=64)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['month']
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} ({self.row_count} rows)"
@@ -0,0 +1,24 @@
+# core/models/balance_slot.py
+from django.db import models
+from .account import Account
+
+class BalanceSlot(models.Model):
+    """
+    One of the sub-balances of an account with ``balance_slots`` set. Each
+    deposit to such an account is added to a random slot instead of the
+    account row, so concurrent deposits wait on different row locks. The
+    account's balance is ``Account.balance`` plus all of its slots, until
+    fold_balance_slots moves the slots back into ``Account.balance``.
+    """
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='slots')
+    slot = models.PositiveSmallIntegerField()
+    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'slot'], name='core_balanceslot_account_slot_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Slot {self.slot} of account {self.account_id}: {self.balance}"
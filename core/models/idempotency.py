@@ -0,0 +1,29 @@
+# core/models/idempotency.py
+from django.contrib.auth.models import User
+from django.db import models
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of a money-moving request made with an Idempotency-Key
+    header. It is written in the same database transaction as the posting, so
+    a key exists if and only if its posting was committed.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+
+    # SHA-256 of the method, path and body, to detect a key reused for a different request.
+    request_hash = models.CharField(max_length=64)
+
+    response_status = models.PositiveSmallIntegerField()
+    response_body = models.JSONField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='core_idempotency_user_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.response_status})"
@@ -0,0 +1,44 @@
+# core/models/queued_posting.py
+from django.db import models
+from .account import Account
+from .transaction import Transaction
+
+class QueuedPosting(models.Model):
+    """
+    A deposit, withdrawal or transfer accepted with ``Prefer: respond-async``
+    and waiting in this outbox table for the process_postings worker, which
+    applies postings in batches with one commit per batch. Rows stay after
+    being processed so the client can read the outcome.
+    """
+    PENDING = 'PENDING'
+    APPLIED = 'APPLIED'
+    REJECTED = 'REJECTED'
+    STATUSES = (
+        (PENDING, 'Pending'),
+        (APPLIED, 'Applied'),
+        (REJECTED, 'Rejected'),
+    )
+
+    # The account the posting was made on: credited by a deposit, debited otherwise.
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name='queued_postings')
+    to_account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name='+', null=True, blank=True)
+    operation = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+
+    status = models.CharField(max_length=8, choices=STATUSES, default=PENDING)
+    error = models.CharField(max_length=100, blank=True)
+
+    # Balance of ``account`` once the posting was applied.
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's queue: only pending rows, in arrival order.
+            models.Index(fields=['id'], condition=models.Q(status='PENDING'), name='core_posting_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.operation} of {self.amount} on account {self.account_id} ({self.status})"
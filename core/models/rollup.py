@@ -0,0 +1,37 @@
+# core/models/rollup.py
+from django.db import models
+from .account import Account
+
+class MonthlyRollup(models.Model):
+    """
+    Running totals of an account's ledger for one month and transaction type.
+    Updated in the same database transaction as every posting, so summaries
+    read one row per month and type instead of every transaction.
+    """
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='rollups')
+
+    # First day of the month (UTC).
+    month = models.DateField()
+
+    transaction_type = models.CharField(max_length=10)
+
+    # Deposits into a balance slot update that slot's rollup, so deposits
+    # to a hot account do not all wait on one row; everything else uses
+    # slot 0. Totals for a month and type are the sum over its slots.
+    slot = models.PositiveSmallIntegerField(default=0)
+
+    # Money coming in (positive signed_amount) and going out, as magnitudes.
+    credit_count = models.PositiveIntegerField(default=0)
+    credit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    debit_count = models.PositiveIntegerField(default=0)
+    debit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['account', 'month', 'transaction_type', 'slot'], name='core_rollup_account_month_type_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.transaction_type} for account {self.account_id} in {self.month:%Y-%m}"
@@ -0,0 +1,14 @@
+# core/models/sequence.py
+from django.db import models
+
+class NumberSequence(models.Model):
+    """
+    A named counter used in place of a database sequence on backends that do
+    not have them (SQLite in development and tests). On PostgreSQL the real
+    sequences created by the migrations are used instead.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
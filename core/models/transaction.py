@@ -1,6 +1,7 @@
 # core/models/transaction.py
 from django.db import models
 from .account import Account
+from .transfer import Transfer
 
 class Transaction(models.Model):
     TRANSACTION_TYPES = (
@@ -9,6 +10,11 @@ class Transaction(models.Model):
         ('TRANSFER', 'Transfer'),
     )
 
+    DIRECTIONS = (
+        ('CREDIT', 'Credit'),
+        ('DEBIT', 'Debit'),
+    )
+
     # The account this transaction belongs to.
     # on_delete=models.PROTECT prevents an account from being deleted if it has transactions,
     # which is crucial for maintaining a complete and accurate audit trail.
@@ -26,5 +32,42 @@ class Transaction(models.Model):
     # An optional note or description for the transaction.
     description = models.TextField(blank=True, null=True)
 
+    # The amount as it affected this account: positive for money coming in,
+    # negative for money going out. `amount` above is always the magnitude.
+    signed_amount = models.DecimalField(max_digits=12, decimal_places=2)
+
+    # The account's balance right after this transaction was posted. Written in
+    # the same database transaction as the balance update, so the latest row at
+    # or before a point in time gives the balance at that time.
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2)
+
+    # Whether money came into (CREDIT) or left (DEBIT) the account; the sign of signed_amount.
+    direction = models.CharField(max_length=6, choices=DIRECTIONS)
+
+    # For transfer legs: the journal entry shared by both legs, and the
+    # account on the other side. Both are null for deposits and withdrawals.
+    transfer = models.ForeignKey(
+        Transfer, on_delete=models.PROTECT, related_name='legs', null=True, blank=True
+    )
+    counterparty = models.ForeignKey(
+        Account, on_delete=models.PROTECT, related_name='+', null=True, blank=True, db_index=False
+    )
+
+    class Meta:
+        indexes = [
+            # Serves per-account history pages ordered by (timestamp, id).
+            models.Index(fields=['account', 'timestamp', 'id'], name='core_txn_account_ts_idx'),
+            # Serves the history between an account and one counterparty.
+            models.Index(fields=['account', 'counterparty', 'timestamp', 'id'], name='core_txn_counterparty_idx'),
+            # Serves history searches by type. Amount ranges walk
+            # core_txn_account_ts_idx instead, so pages stay in keyset order.
+            models.Index(fields=['account', 'transaction_type', 'timestamp', 'id'], name='core_txn_account_type_idx'),
+            # Description searches use core_txn_description_trgm_idx, a
+            # PostgreSQL-only trigram index created in migration 0015.
+            # Serves the admin changelist across all accounts, newest first,
+            # and its date hierarchy.
+            models.Index(fields=['timestamp', 'id'], name='core_txn_timestamp_idx'),
+        ]
+
     def __str__(self):
         return f"{self.transaction_type} of {self.amount} for account {self.account.account_number}"
\ No newline at end of file
@@ -0,0 +1,29 @@
+# core/models/transfer.py
+from django.db import models
+from django.utils import timezone
+from .account import Account
+
+class Transfer(models.Model):
+    """
+    Journal entry of one transfer between two accounts. Its two ledger rows,
+    the debit on ``from_account`` and the credit on ``to_account``, point
+    back to it through ``Transaction.transfer``.
+    """
+    # Covered by the (from_account, to_account, created_at) index below.
+    from_account = models.ForeignKey(
+        Account, on_delete=models.PROTECT, related_name='outgoing_transfers', db_index=False
+    )
+    to_account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name='incoming_transfers')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    # A default rather than auto_now_add, so backfilled entries keep the time of their legs.
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Serves "transfers from A to B", newest first; query both
+            # directions for all transfers between two accounts.
+            models.Index(fields=['from_account', 'to_account', 'created_at'], name='core_transfer_pair_idx'),
+        ]
+
+    def __str__(self):
+        return f"Transfer of {self.amount} from account {self.from_account_id} to {self.to_account_id}"
@@ -0,0 +1,55 @@
+# core/pagination.py
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+class TransactionCursorPagination(CursorPagination):
+    """
+    Keyset pagination over transaction history, newest first.
+
+    Pages are located by seeking on the (account, timestamp, id) index rather
+    than with OFFSET, so page 1000 costs the same as page 1.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-timestamp', '-id')
+
+
+def estimate_count(queryset):
+    """
+    The number of rows the PostgreSQL planner expects the queryset to return,
+    from EXPLAIN without running it. None on other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']['Plan Rows']
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django paginator for admin changelists of large tables. When the planner
+    expects more than ``exact_count_limit`` rows, the page count is based on
+    its estimate instead of an exact COUNT(*), which would read every row.
+    Smaller results, and every result on databases other than PostgreSQL,
+    are counted exactly.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate > self.exact_count_limit:
+            return estimate
+        return super().count
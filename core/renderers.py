@@ -0,0 +1,75 @@
+# core/renderers.py
+import csv
+import json
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer producing the same bytes for compact output, with one
+    encoder built up front instead of a new one per response.
+    """
+    _encoder = encoders.JSONEncoder(
+        ensure_ascii=renderers.JSONRenderer.ensure_ascii,
+        allow_nan=not renderers.JSONRenderer.strict,
+        separators=renderers.SHORT_SEPARATORS if renderers.JSONRenderer.compact else renderers.LONG_SEPARATORS,
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = self._encoder.encode(data)
+        # Same JavaScript-safe escaping as JSONRenderer.
+        return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class _Echo:
+    """
+    A file-like object that hands back whatever is written to it, so that
+    csv.writer can produce one line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """
+    Renders rows as CSV. Large results are streamed with stream(); render()
+    only handles small payloads such as error messages.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def stream(self, columns, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        columns = list(rows[0]) if rows else []
+        lines = self.stream(columns, ([row.get(column) for column in columns] for row in rows))
+        return ''.join(lines).encode(self.charset)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Renders rows as newline-delimited JSON objects. Large results are streamed
+    with stream(); render() only handles small payloads such as error messages.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def stream(self, columns, rows):
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), cls=encoders.JSONEncoder) + '\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(row, cls=encoders.JSONEncoder) + '\n' for row in rows).encode(self.charset)
@@ -4,4 +4,7 @@ from .transaction import TransactionSerializer
 from .deposit import DepositSerializer
 from .withdrawal import WithdrawalSerializer
 from .transfer import TransferSerializer
-from .registration import RegistrationSerializer
\ No newline at end of file
+from .registration import ImportRegistrationSerializer, RegistrationSerializer
+from .batch_transfer import BatchTransferSerializer
+from .rollup import MonthlyRollupSerializer
+from .queued_posting import QueuedPostingSerializer
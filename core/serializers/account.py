@@ -12,3 +12,12 @@ class AccountSerializer(serializers.ModelSerializer):
         # Make owner and account_number read-only. They will be shown in responses,
         # but cannot be set or changed by the user in a request.
         read_only_fields = ['owner', 'account_number']
+
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.balance_slots:
+            # Report the whole balance, slots included, and when it last changed.
+            data['balance'] = self.fields['balance'].to_representation(instance.total_balance)
+            data['updated_at'] = self.fields['updated_at'].to_representation(instance.last_modified)
+        return data
@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework import serializers
+from decimal import Decimal
+
+from ..services.batch import ALL_OR_NOTHING, BEST_EFFORT
+from .transfer import validate_account_number
+
+class BatchTransferItemSerializer(serializers.Serializer):
+    """
+    A single posting inside a batch transfer.
+    """
+    to_account_number = serializers.CharField(max_length=20, validators=[validate_account_number])
+    amount = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        min_value=Decimal('0.01')
+    )
+
+class BatchTransferSerializer(serializers.Serializer):
+    """
+    Serializer for the batch transfer action.
+    """
+    MODES = (
+        (ALL_OR_NOTHING, 'All or nothing'),
+        (BEST_EFFORT, 'Best effort'),
+    )
+    mode = serializers.ChoiceField(choices=MODES, default=ALL_OR_NOTHING)
+    transfers = BatchTransferItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.BATCH_TRANSFER_MAX_ITEMS
+    )
@@ -0,0 +1,145 @@
+import decimal
+from datetime import timezone as dt_timezone
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+from rest_framework import fields, relations
+from rest_framework.settings import api_settings
+
+
+def _decimal_converter(field, model_field):
+    if (
+        not getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        or field.localize or field.normalize_output or field.decimal_places is None
+    ):
+        return field.to_representation
+    if (
+        isinstance(model_field, models.DecimalField)
+        and model_field.decimal_places == field.decimal_places
+        and (field.max_digits is None or model_field.max_digits <= field.max_digits)
+    ):
+        # The database backend already returns these quantized to the
+        # column's scale, so DRF's quantize() would not change them, and
+        # str() of such a Decimal never uses exponent notation.
+        return str
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+    return convert
+
+
+def _is_iso_8601(output_format):
+    return isinstance(output_format, str) and output_format.lower() == fields.ISO_8601
+
+
+def _datetime_converter(field):
+    if not _is_iso_8601(getattr(field, 'format', api_settings.DATETIME_FORMAT)) or hasattr(field, 'timezone'):
+        return field.to_representation
+    utc = dt_timezone.utc
+    slow = field.to_representation
+
+    def convert(value):
+        # Rows come back from the database in UTC; anything else takes DRF's path.
+        if value.tzinfo is not utc:
+            return slow(value)
+        text = value.isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+def _date_converter(field):
+    if not _is_iso_8601(getattr(field, 'format', api_settings.DATE_FORMAT)):
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _converter(field, model_field):
+    """
+    Return a function turning a raw column value into exactly what
+    ``field.to_representation`` would return for it, or None when the
+    value can be used as it is.
+    """
+    text_column = isinstance(model_field, (models.CharField, models.TextField))
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, fields.ChoiceField):
+        # Choices keyed by strings map every stored string to itself.
+        if text_column and all(isinstance(key, str) for key in field.choices):
+            return None
+        return field.to_representation
+    if isinstance(field, fields.CharField):
+        return None if text_column else str
+    if isinstance(field, fields.IntegerField):
+        return None if isinstance(model_field, (models.IntegerField, models.AutoField)) else int
+    if isinstance(field, fields.DecimalField):
+        return _decimal_converter(field, model_field)
+    if isinstance(field, fields.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, fields.DateField):
+        return _date_converter(field)
+    if isinstance(field, fields.BooleanField):
+        return None if isinstance(model_field, models.BooleanField) else bool
+    raise ImproperlyConfigured(
+        f'No fast representation for {type(field).__name__} {field.field_name!r}.'
+    )
+
+
+def _row_formatter(plan):
+    """
+    Build a function turning one values() row into the serializer's dict,
+    from the (name, source, converter) of each field. Columns without a
+    converter, and NULLs, are copied as they are.
+    """
+    plan = tuple(plan)
+
+    def format_row(row):
+        return {
+            name: row[source] if convert is None or row[source] is None else convert(row[source])
+            for name, source, convert in plan
+        }
+    return format_row
+
+
+class ValuesSerializer:
+    """
+    Read-only stand-in for a ModelSerializer on list endpoints.
+
+    Built once from the serializer class, it knows which columns to fetch
+    with ``queryset.values(*serializer.columns)`` and turns those rows into
+    the same dicts the ModelSerializer would produce for the instances,
+    without building model instances or walking DRF's per-field machinery.
+    Only plain model fields and primary-key relations are supported; adding
+    anything else to the serializer fails loudly at import time.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        model = serializer_class.Meta.model
+        plan = []
+        # DRF renders datetimes in the active timezone; the fast converters
+        # assume UTC, so requests in another timezone use this plan instead.
+        zoned_plan = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(f'No fast representation for source {field.source!r} of {name!r}.')
+            convert = _converter(field, model_field)
+            plan.append((name, field.source, convert))
+            zoned = field.to_representation if isinstance(field, fields.DateTimeField) else convert
+            zoned_plan.append((name, field.source, zoned))
+        self.columns = [source for _, source, _ in plan]
+        self.format_row = _row_formatter(plan)
+        self.format_zoned_row = _row_formatter(zoned_plan)
+
+    def to_representation(self, rows):
+        format_row = self.format_row if timezone.get_current_timezone_name() == 'UTC' else self.format_zoned_row
+        return [format_row(row) for row in rows]
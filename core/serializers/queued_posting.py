@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from ..models import QueuedPosting
+
+class QueuedPostingSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the status of a posting queued with ``Prefer: respond-async``.
+    """
+    to_account_number = serializers.CharField(source='to_account.account_number', allow_null=True, read_only=True)
+
+    class Meta:
+        model = QueuedPosting
+        fields = [
+            'id', 'account', 'operation', 'amount', 'to_account_number', 'status',
+            'error', 'balance_after', 'created_at', 'processed_at'
+        ]
+        read_only_fields = fields
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import transaction
 from rest_framework import serializers
 from ..models import Customer
@@ -37,4 +38,26 @@ class RegistrationSerializer(serializers.ModelSerializer):
             gender=gender
         )
         
-        return user
\ No newline at end of file
+        return user
+
+class ImportRegistrationSerializer(RegistrationSerializer):
+    """
+    Field rules of RegistrationSerializer for the bulk import, which checks
+    username and email uniqueness once per chunk instead of once per row.
+    Email is required and lengths follow the Customer columns, since a bad
+    row must be rejected here rather than fail a whole bulk insert.
+    """
+    full_name = serializers.CharField(
+        write_only=True, max_length=Customer._meta.get_field('full_name').max_length
+    )
+    phone_number = serializers.CharField(
+        write_only=True, max_length=Customer._meta.get_field('phone_number').max_length
+    )
+    gender = serializers.ChoiceField(write_only=True, choices=Customer.GENDER_CHOICES)
+
+    class Meta(RegistrationSerializer.Meta):
+        extra_kwargs = {
+            'password': {'write_only': True},
+            'username': {'validators': [UnicodeUsernameValidator()]},
+            'email': {'required': True, 'allow_blank': False},
+        }
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+from ..models import MonthlyRollup
+
+class MonthlyRollupSerializer(serializers.ModelSerializer):
+    """
+    Serializer for one month and transaction type of an account summary.
+    """
+    month = serializers.DateField(format='%Y-%m')
+
+    class Meta:
+        model = MonthlyRollup
+        fields = [
+            'month', 'transaction_type', 'credit_count', 'credit_total',
+            'debit_count', 'debit_total'
+        ]
@@ -1,13 +1,25 @@
 from rest_framework import serializers
 from decimal import Decimal
 
+from ..services.account_numbers import is_valid_account_number
+
+
+def validate_account_number(value):
+    """
+    Reject account numbers that cannot exist, such as one with a mistyped
+    check digit, before looking them up.
+    """
+    if not is_valid_account_number(value):
+        raise serializers.ValidationError('Not a valid account number; check it for typos.')
+
+
 class TransferSerializer(serializers.Serializer):
     """
     Serializer for the transfer action.
     """
-    to_account_number = serializers.CharField(max_length=20)
+    to_account_number = serializers.CharField(max_length=20, validators=[validate_account_number])
     amount = serializers.DecimalField(
         max_digits=12, 
         decimal_places=2, 
         min_value=Decimal('0.01')
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,4 @@
+from .exceptions import InsufficientFunds
+from .postings import deposit, withdraw
+from .transfer import transfer
+from .batch import ALL_OR_NOTHING, BEST_EFFORT, BatchRejected, batch_transfer
@@ -0,0 +1,109 @@
+# core/services/batch.py
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Account, Transfer
+from .cache import invalidate_account_lists
+from .ledger import WRITE_BATCH_SIZE, write_entries
+from .retry import run_with_retry
+from .transfer import lock_accounts, transfer_legs
+
+ALL_OR_NOTHING = 'all_or_nothing'
+BEST_EFFORT = 'best_effort'
+
+
+class BatchRejected(Exception):
+    """
+    Raised when an all-or-nothing batch has at least one failing item.
+    Nothing from the batch has been written; ``results`` explains why.
+    """
+
+    def __init__(self, results):
+        super().__init__('Batch rejected.')
+        self.results = results
+
+
+def save_balances(accounts, now):
+    """
+    Write the in-memory balances of locked ``accounts`` back in bulk.
+    """
+    for account in accounts:
+        account.updated_at = now
+    Account.objects.bulk_update(accounts, ['balance', 'updated_at'], batch_size=WRITE_BATCH_SIZE)
+
+
+def _batch_transfer_once(from_account, items, destinations, mode):
+    with transaction.atomic():
+        locked = lock_accounts([from_account.pk, *destinations.values()])
+        source = locked[from_account.pk]
+
+        results, journals, ledger, touched = [], [], [], {source.pk: source}
+        failed = False
+        for index, item in enumerate(items):
+            amount = item['amount']
+            destination = locked.get(destinations.get(item['to_account_number']))
+            if destination is None:
+                error = 'Destination account not found.'
+            elif destination.pk == source.pk:
+                error = 'Cannot transfer to the same account.'
+            elif source.total_balance < amount:
+                error = 'Insufficient funds.'
+            else:
+                error = None
+
+            if error:
+                failed = True
+                results.append({'index': index, 'status': 'failed', 'error': error})
+                continue
+
+            source.balance -= amount
+            destination.balance += amount
+            touched[destination.pk] = destination
+            # Saved below, before the legs that refer to it.
+            journal = Transfer(from_account=source, to_account=destination, amount=amount)
+            journals.append(journal)
+            ledger.extend(transfer_legs(journal, source, destination))
+            results.append({'index': index, 'status': 'ok'})
+
+        if failed and mode == ALL_OR_NOTHING:
+            for result in results:
+                if result['status'] == 'ok':
+                    result['status'] = 'not_applied'
+            # Leaving the atomic block with an exception discards the batch.
+            raise BatchRejected(results)
+
+        if ledger:
+            now = timezone.now()
+            save_balances(list(touched.values()), now)
+            for journal in journals:
+                journal.created_at = now
+            Transfer.objects.bulk_create(journals, batch_size=WRITE_BATCH_SIZE)
+            write_entries(ledger)
+            invalidate_account_lists(account.owner_id for account in touched.values())
+
+    return source.total_balance, results
+
+
+def batch_transfer(from_account, items, mode=ALL_OR_NOTHING):
+    """
+    Transfer from ``from_account`` to many destination accounts at once.
+
+    ``items`` is a list of dicts with ``to_account_number`` and ``amount``,
+    applied in order. Destination numbers are resolved in one query, every
+    involved account is locked once, balances are written with one bulk
+    update, and the transfer journal and ledger with ``bulk_create``.
+
+    In ALL_OR_NOTHING mode any failing item raises BatchRejected and nothing
+    is written. In BEST_EFFORT mode failing items are skipped and reported.
+    Returns ``(source_balance, results)`` with one result per item.
+    """
+    numbers = {item['to_account_number'] for item in items}
+    destinations = dict(
+        Account.objects.filter(account_number__in=numbers).values_list('account_number', 'pk')
+    )
+    balance, results = run_with_retry(
+        lambda: _batch_transfer_once(from_account, items, destinations, mode), 'batch_transfer'
+    )
+    if not from_account.balance_slots:
+        from_account.balance = balance
+    return balance, results
@@ -0,0 +1,16 @@
+# core/services/cache.py
+from django.core.cache import cache
+from django.db import transaction
+
+
+def account_list_key(customer_id):
+    return f'account-list:{customer_id}'
+
+
+def invalidate_account_lists(owner_ids):
+    """
+    Drop the cached account lists of the given customers once the current
+    transaction commits (immediately when not in a transaction).
+    """
+    keys = [account_list_key(owner_id) for owner_id in set(owner_ids)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
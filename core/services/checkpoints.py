@@ -0,0 +1,28 @@
+# core/services/checkpoints.py
+"""
+Progress files of resumable management commands, such as import_customers
+and reconcile: a JSON object saved after each unit of work, so that an
+interrupted run can carry on from the last one.
+"""
+import json
+import os
+
+
+def read_checkpoint(path):
+    """
+    Return the state saved at ``path``, or None if there is none.
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as checkpoint:
+        return json.load(checkpoint)
+
+
+def save_checkpoint(path, state):
+    # Written aside and renamed, so a crash leaves the old or the new checkpoint.
+    partial = f'{path}.partial'
+    with open(partial, 'w', encoding='utf-8') as checkpoint:
+        json.dump(state, checkpoint)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+    os.replace(partial, path)
@@ -0,0 +1,4 @@
+class InsufficientFunds(Exception):
+    """
+    Raised when a debit would take an account's balance below zero.
+    """
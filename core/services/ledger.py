@@ -0,0 +1,40 @@
+# core/services/ledger.py
+from ..models import Transaction
+from .rollups import apply_rollups
+
+# Rows per INSERT/UPDATE statement when writing in bulk.
+WRITE_BATCH_SIZE = 1000
+
+
+def ledger_entry(account, signed_amount, balance_after, transaction_type, description,
+                 counterparty=None, transfer=None):
+    """
+    Build (but do not save) a ledger row for ``account``.
+
+    ``signed_amount`` is positive for credits and negative for debits;
+    ``balance_after`` is the account balance once this entry is applied.
+    Transfer legs also get the account on the other side and their saved
+    Transfer journal entry.
+    """
+    return Transaction(
+        account=account,
+        amount=abs(signed_amount),
+        signed_amount=signed_amount,
+        balance_after=balance_after,
+        transaction_type=transaction_type,
+        description=description,
+        direction='CREDIT' if signed_amount > 0 else 'DEBIT',
+        counterparty=counterparty,
+        transfer=transfer
+    )
+
+
+def write_entries(entries, slot=0):
+    """
+    Persist ledger rows built with ledger_entry() and add them to the monthly
+    rollups, under ``slot`` for a deposit into a balance slot. Must run in
+    the same database transaction as the balance updates they describe.
+    """
+    entries = Transaction.objects.bulk_create(entries, batch_size=WRITE_BATCH_SIZE)
+    apply_rollups(entries, slot)
+    return entries
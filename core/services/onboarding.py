@@ -0,0 +1,113 @@
+# core/services/onboarding.py
+"""
+Bulk customer onboarding, used by the import_customers command.
+
+Registrations are handled a chunk at a time: validate_registrations() applies
+the registration field rules to every row and checks username and email
+uniqueness with one query each, the caller hashes the passwords (the slow
+part, so it can spread them over processes), and create_customers() inserts
+the users and customers with two bulk inserts in one transaction.
+"""
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from ..models import Customer
+from ..serializers import ImportRegistrationSerializer
+
+DUPLICATE_USERNAME = 'A user with that username already exists.'
+DUPLICATE_EMAIL = 'customer with this email already exists.'
+CONFLICT = 'Conflicts with a user or customer created while importing.'
+
+
+def validate_registrations(records):
+    """
+    Validate (number, record) pairs. Returns a list of (number, data) for
+    the valid rows and a list of (number, errors) for the others, errors in
+    the same shape as the registration endpoint's 400 responses. Of rows
+    sharing a username or email, only the first one is valid.
+    """
+    serializer = ImportRegistrationSerializer()
+    valid, rejected = [], []
+    for number, record in records:
+        try:
+            data = serializer.run_validation(record)
+        except serializers.ValidationError as exc:
+            rejected.append((number, exc.detail))
+            continue
+        # The same normalization create_user() applies.
+        data['username'] = User.normalize_username(data['username'])
+        data['email'] = User.objects.normalize_email(data['email'])
+        valid.append((number, data))
+
+    usernames = set(
+        User.objects.filter(username__in=[data['username'] for _, data in valid])
+        .values_list('username', flat=True)
+    )
+    emails = set(
+        Customer.objects.filter(email__in=[data['email'] for _, data in valid])
+        .values_list('email', flat=True)
+    )
+    unique = []
+    for number, data in valid:
+        errors = {}
+        if data['username'] in usernames:
+            errors['username'] = [DUPLICATE_USERNAME]
+        if data['email'] in emails:
+            errors['email'] = [DUPLICATE_EMAIL]
+        if errors:
+            rejected.append((number, errors))
+            continue
+        usernames.add(data['username'])
+        emails.add(data['email'])
+        unique.append((number, data))
+    rejected.sort(key=lambda item: item[0])
+    return unique, rejected
+
+
+def _insert(registrations):
+    users = User.objects.bulk_create([
+        User(username=data['username'], email=data['email'], password=data['password'])
+        for _, data in registrations
+    ])
+    if any(user.pk is None for user in users):
+        # Backends that cannot return ids from a bulk insert.
+        ids = dict(
+            User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk')
+        )
+        for user in users:
+            user.pk = ids[user.username]
+    Customer.objects.bulk_create([
+        Customer(
+            user=user, full_name=data['full_name'], email=user.email, phone_number=data['phone_number'],
+            date_of_birth=data['date_of_birth'], gender=data['gender'],
+        )
+        for user, (_, data) in zip(users, registrations)
+    ])
+
+
+def create_customers(registrations):
+    """
+    Create a user and customer for each validated (number, data) pair, whose
+    ``password`` must already be hashed. All rows are committed together.
+
+    If a registration arriving through the API took one of the usernames or
+    emails after validation, the rows are inserted one at a time instead and
+    the conflicting ones skipped. Returns the (number, errors) of those.
+    """
+    try:
+        with transaction.atomic():
+            _insert(registrations)
+        return []
+    except IntegrityError:
+        pass
+
+    rejected = []
+    with transaction.atomic():
+        for registration in registrations:
+            try:
+                with transaction.atomic():
+                    _insert([registration])
+            except IntegrityError:
+                rejected.append((registration[0], {'non_field_errors': [CONFLICT]}))
+    return rejected
@@ -0,0 +1,208 @@
+# core/services/partitions.py
+import csv
+import gzip
+import hashlib
+import os
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Transaction, TransactionArchive
+
+TABLE = Transaction._meta.db_table
+
+# Column order of archive files. Matches the order values_list() is called
+# with by the statement export, so archived and live rows can be chained.
+ARCHIVE_COLUMNS = [
+    'id', 'account_id', 'timestamp', 'transaction_type', 'amount',
+    'signed_amount', 'balance_after', 'description',
+    'direction', 'counterparty_id', 'transfer_id'
+]
+
+# How COPY writes NULL, so that a missing description and an empty one differ.
+ARCHIVE_NULL = r'\N'
+
+PARTITION_NAME = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+
+def month_start(value):
+    """
+    Return the first day of the (UTC) month containing a date or datetime.
+    """
+    if isinstance(value, datetime):
+        value = value.astimezone(dt_timezone.utc) if timezone.is_aware(value) else value
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bound(month):
+    return datetime.combine(month, time.min, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y_%m}'
+
+
+def is_partitioned():
+    """
+    Return True when the transaction table is a partitioned PostgreSQL table.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass', [TABLE])
+        return cursor.fetchone() is not None
+
+
+def partition_months():
+    """
+    Return the months that currently have a partition, oldest first.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def create_partition(month):
+    """
+    Create the partition holding ``month`` if it does not exist yet. Returns
+    True when a partition was created.
+    """
+    if month in partition_months():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {partition_name(month)} PARTITION OF {TABLE} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            [month_bound(month), month_bound(add_months(month, 1))]
+        )
+    return True
+
+
+def archive_partition(month, directory=None):
+    """
+    Copy a month's partition into a read-only gzip CSV file, record it, then
+    detach and drop the partition. Dropping a partition is how old rows are
+    removed; there is no DELETE over the live table.
+
+    The file is written and synced before anything is dropped, and the
+    record and the drop commit together, so a crash leaves either the
+    partition or a registered archive of it.
+    """
+    if month >= month_start(timezone.now()):
+        raise ValueError('Only months before the current one can be archived.')
+    name = partition_name(month)
+    directory = Path(directory or settings.TRANSACTION_ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{name}.csv.gz'
+    partial = directory / f'{name}.csv.gz.partial'
+
+    columns = ', '.join(f'"{column}"' for column in ARCHIVE_COLUMNS)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Nothing should write to a past month, but make sure of it for the copy.
+            cursor.execute(f'LOCK TABLE {name} IN SHARE MODE')
+            cursor.execute(f'SELECT COUNT(*) FROM {name}')
+            row_count = cursor.fetchone()[0]
+            with open(partial, 'wb') as raw:
+                with gzip.GzipFile(filename=path.name[:-3], mode='wb', fileobj=raw) as out:
+                    cursor.copy_expert(
+                        f'COPY (SELECT {columns} FROM {name} ORDER BY "timestamp", id) '
+                        f"TO STDOUT WITH (FORMAT csv, HEADER, NULL '{ARCHIVE_NULL}')",
+                        out
+                    )
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.chmod(partial, 0o444)
+            os.replace(partial, path)
+
+            digest = hashlib.sha256()
+            with open(path, 'rb') as archived:
+                for block in iter(lambda: archived.read(1 << 20), b''):
+                    digest.update(block)
+
+            archive = TransactionArchive.objects.create(
+                month=month, path=str(path), row_count=row_count, sha256=digest.hexdigest()
+            )
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+            cursor.execute(f'DROP TABLE {name}')
+    return archive
+
+
+def read_archive(archive, account_ids, start=None, end=None):
+    """
+    Yield rows of one archive file for the given accounts as tuples of the
+    statement columns, the first eight of ARCHIVE_COLUMNS, followed by
+    counterparty_id and transfer_id, with the same types as the live table,
+    oldest first. ``start`` is inclusive and ``end`` exclusive. Files
+    archived before the transfer columns were added hold only the first
+    eight; their rows have no counterparty or transfer.
+    """
+    wanted = {str(account_id) for account_id in account_ids}
+    with gzip.open(archive.path, 'rt', newline='') as source:
+        reader = csv.reader(source)
+        next(reader, None)
+        for row in reader:
+            pk, account, stamp, kind, amount, signed, balance, description = row[:8]
+            stamp = parse_datetime(stamp)
+            if end is not None and stamp >= end:
+                break
+            if account not in wanted or (start is not None and stamp < start):
+                continue
+            counterparty, transfer = (row[9:11] + [ARCHIVE_NULL, ARCHIVE_NULL])[:2]
+            yield (
+                int(pk), int(account), stamp, kind, Decimal(amount), Decimal(signed),
+                Decimal(balance), None if description == ARCHIVE_NULL else description,
+                None if counterparty in (ARCHIVE_NULL, '') else int(counterparty),
+                None if transfer in (ARCHIVE_NULL, '') else int(transfer),
+            )
+
+
+def archived_rows(account_ids, start=None, end=None):
+    """
+    Yield archived ledger rows for the given accounts, oldest first, from
+    every archived month overlapping [start, end).
+    """
+    archives = TransactionArchive.objects.order_by('month')
+    if start is not None:
+        archives = archives.filter(month__gte=month_start(start))
+    if end is not None:
+        archives = archives.filter(month__lte=month_start(end))
+    for archive in archives:
+        yield from read_archive(archive, account_ids, start, end)
+
+
+def archived_balance(account_id, as_of):
+    """
+    Return ``balance_after`` of the account's last archived row at or before
+    ``as_of``, or None if the archives have no such row.
+    """
+    archives = TransactionArchive.objects.filter(month__lte=month_start(as_of)).order_by('-month')
+    for archive in archives:
+        last = None
+        for last in read_archive(archive, [account_id], end=as_of + timedelta(microseconds=1)):
+            pass
+        if last is not None:
+            return last[6]
+    return None
@@ -0,0 +1,165 @@
+# core/services/posting_queue.py
+"""
+Asynchronous postings: the API appends them to the QueuedPosting outbox and
+answers 202, and the process_postings worker applies them in batches.
+
+A batch is applied in one database transaction: every involved account is
+locked once, the postings run in arrival order against the in-memory
+balances with the same funds checks as the synchronous paths, and then the
+balances, transfers, ledger rows and posting outcomes are each written with
+a single bulk statement. A burst of postings therefore costs one commit per
+batch instead of one per posting.
+
+With several partitions, a transfer is taken by the partition of the account
+it debits but also credits its destination. A posting therefore waits while
+another partition still has an earlier pending posting on one of its
+accounts, so every account sees its postings in queue order.
+"""
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .. import metrics
+from ..models import QueuedPosting, Transfer
+from .batch import save_balances
+from .cache import invalidate_account_lists
+from .ledger import WRITE_BATCH_SIZE, ledger_entry, write_entries
+from .retry import run_with_retry
+from .transfer import lock_accounts, transfer_legs
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def enqueue_posting(account, operation, amount, to_account=None):
+    """
+    Queue a posting on ``account`` for the worker. Validation that needs no
+    balance, such as the destination existing, is the caller's job.
+    """
+    return QueuedPosting.objects.create(
+        account=account, to_account=to_account, operation=operation, amount=amount
+    )
+
+
+def _apply(posting, locked, ledger, journals):
+    """
+    Apply one posting to the locked accounts in memory, adding its ledger
+    rows and transfer. Returns an error message, or None if it was applied.
+    """
+    account, amount = locked[posting.account_id], posting.amount
+    if posting.operation == 'DEPOSIT':
+        account.balance += amount
+        ledger.append(ledger_entry(
+            account, amount, account.total_balance, 'DEPOSIT',
+            f'Deposit of {amount} to account {account.account_number}.'
+        ))
+        return None
+
+    if account.total_balance < amount:
+        return 'Insufficient funds.'
+    account.balance -= amount
+    if posting.operation == 'WITHDRAWAL':
+        ledger.append(ledger_entry(
+            account, -amount, account.total_balance, 'WITHDRAWAL',
+            f'Withdrawal of {amount} from account {account.account_number}.'
+        ))
+        return None
+
+    destination = locked[posting.to_account_id]
+    destination.balance += amount
+    journal = Transfer(from_account=account, to_account=destination, amount=amount)
+    journals.append(journal)
+    ledger.extend(transfer_legs(journal, account, destination))
+    return None
+
+
+def _held_back(batch, partition, partitions):
+    """
+    Return the ids of the postings in ``batch`` that must wait for an earlier
+    pending posting of another partition on one of their accounts, or for a
+    posting of the batch that waits itself.
+    """
+    accounts = {pk for posting in batch for pk in (posting.account_id, posting.to_account_id) if pk}
+    earlier = (
+        QueuedPosting.objects.filter(status=QueuedPosting.PENDING, id__lt=batch[-1].id)
+        .filter(Q(account_id__in=accounts) | Q(to_account_id__in=accounts))
+        .alias(shard=F('account_id') % partitions).exclude(shard=partition)
+        .order_by('id').values_list('id', 'account_id', 'to_account_id')
+    )
+    first = {}
+    for pk, *involved in earlier:
+        for account_id in involved:
+            if account_id in accounts:
+                first.setdefault(account_id, pk)
+
+    waiting, held = set(), set()
+    for posting in batch:
+        involved = {posting.account_id, posting.to_account_id} - {None}
+        if involved & waiting or any(first.get(pk, posting.id) < posting.id for pk in involved):
+            waiting |= involved
+            held.add(posting.id)
+    return held
+
+
+def _process_once(batch_size, partition, partitions):
+    with transaction.atomic():
+        # No SKIP LOCKED: a second worker on the same partition waits instead
+        # of taking later postings of an account ahead of earlier ones.
+        pending = QueuedPosting.objects.select_for_update().filter(status=QueuedPosting.PENDING)
+        if partitions > 1:
+            pending = pending.alias(shard=F('account_id') % partitions).filter(shard=partition)
+        batch = list(pending.order_by('id')[:batch_size])
+        if batch and partitions > 1:
+            held = _held_back(batch, partition, partitions)
+            batch = [posting for posting in batch if posting.id not in held]
+        if not batch:
+            return 0
+
+        locked = lock_accounts(
+            {posting.account_id for posting in batch}
+            | {posting.to_account_id for posting in batch if posting.to_account_id}
+        )
+        ledger, journals, touched = [], [], {}
+        now = timezone.now()
+        for posting in batch:
+            error = _apply(posting, locked, ledger, journals)
+            posting.status = QueuedPosting.REJECTED if error else QueuedPosting.APPLIED
+            posting.error = error or ''
+            posting.processed_at = now
+            if error is None:
+                posting.balance_after = locked[posting.account_id].total_balance
+                for pk in (posting.account_id, posting.to_account_id):
+                    if pk:
+                        touched[pk] = locked[pk]
+
+        if touched:
+            save_balances(list(touched.values()), now)
+            for journal in journals:
+                journal.created_at = now
+            Transfer.objects.bulk_create(journals, batch_size=WRITE_BATCH_SIZE)
+            write_entries(ledger)
+            invalidate_account_lists(account.owner_id for account in touched.values())
+        QueuedPosting.objects.bulk_update(
+            batch, ['status', 'error', 'balance_after', 'processed_at'], batch_size=WRITE_BATCH_SIZE
+        )
+
+    rejected = sum(1 for posting in batch if posting.status == QueuedPosting.REJECTED)
+    metrics.increment('queued_postings_total', len(batch) - rejected, status='applied')
+    metrics.increment('queued_postings_total', rejected, status='rejected')
+    metrics.increment('queued_posting_batches_total')
+    return len(batch)
+
+
+def process_postings(batch_size=DEFAULT_BATCH_SIZE, partition=0, partitions=1):
+    """
+    Apply up to ``batch_size`` pending postings, oldest first, in a single
+    database transaction, retrying it on deadlocks. Postings of the same
+    account are applied in the order they were queued, provided only one
+    worker processes each partition. With ``partitions`` > 1 only postings
+    on accounts whose id modulo ``partitions`` equals ``partition`` are
+    taken, so that many workers can run side by side, and those waiting for
+    another partition (see _held_back()) are left for a later call.
+
+    Returns the number of postings processed; 0 means the partition has
+    nothing it can apply yet.
+    """
+    return run_with_retry(lambda: _process_once(batch_size, partition, partitions), 'process_postings')
@@ -0,0 +1,97 @@
+# core/services/postings.py
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Account
+from .balances import credit_slot, current_total
+from .cache import invalidate_account_lists
+from .exceptions import InsufficientFunds
+from .ledger import ledger_entry, write_entries
+from .retry import run_with_retry
+from .transfer import lock_accounts
+
+
+def apply_delta(account_id, delta):
+    """
+    Add ``delta`` to an account's balance and return the new balance.
+
+    The change is a single conditional UPDATE that only writes ``balance`` and
+    ``updated_at``. For debits the funds check lives in the WHERE clause, so
+    concurrent postings can never push the balance below zero or overwrite
+    each other. Must be called inside a transaction: the row stays locked
+    until commit, which is what makes the follow-up read of the balance exact.
+    """
+    accounts = Account.objects.filter(pk=account_id)
+    if delta < 0:
+        accounts = accounts.filter(balance__gte=-delta)
+
+    updated = accounts.update(balance=F('balance') + delta, updated_at=timezone.now())
+    if not updated:
+        raise InsufficientFunds()
+
+    return Account.objects.filter(pk=account_id).values_list('balance', flat=True).get()
+
+
+def debit_with_slots(account_id, amount):
+    """
+    apply_delta() for a debit to an account with balance slots: the funds
+    check is against the account row plus its slots, under the account
+    lock, and the amount comes off the account row. Returns the new total.
+    """
+    account = lock_accounts([account_id])[account_id]
+    if account.total_balance < amount:
+        raise InsufficientFunds()
+    Account.objects.filter(pk=account_id).update(balance=F('balance') - amount, updated_at=timezone.now())
+    return account.total_balance - amount
+
+
+def _deposit_once(account, amount):
+    with transaction.atomic():
+        slot = credit_slot(account, amount) if account.balance_slots else None
+        if slot is None:
+            new_balance = apply_delta(account.pk, amount)
+        else:
+            new_balance = current_total(account.pk)
+        write_entries([ledger_entry(
+            account, amount, new_balance, 'DEPOSIT',
+            f'Deposit of {amount} to account {account.account_number}.'
+        )], slot=slot or 0)
+        invalidate_account_lists([account.owner_id])
+    if not account.balance_slots:
+        account.balance = new_balance
+    return new_balance
+
+
+def _withdraw_once(account, amount):
+    with transaction.atomic():
+        if account.balance_slots:
+            new_balance = debit_with_slots(account.pk, amount)
+        else:
+            new_balance = apply_delta(account.pk, -amount)
+        write_entries([ledger_entry(
+            account, -amount, new_balance, 'WITHDRAWAL',
+            f'Withdrawal of {amount} from account {account.account_number}.'
+        )])
+        invalidate_account_lists([account.owner_id])
+    if not account.balance_slots:
+        account.balance = new_balance
+    return new_balance
+
+
+def deposit(account, amount):
+    """
+    Credit ``amount`` to ``account`` and record the ledger entry. For an
+    account with balance slots the credit goes to one of its slots.
+    Returns the account's new balance.
+    """
+    return run_with_retry(lambda: _deposit_once(account, amount), 'deposit')
+
+
+def withdraw(account, amount):
+    """
+    Debit ``amount`` from ``account`` and record the ledger entry.
+    Raises InsufficientFunds if the balance does not cover the amount.
+    Returns the account's new balance.
+    """
+    return run_with_retry(lambda: _withdraw_once(account, amount), 'withdraw')
@@ -0,0 +1,50 @@
+# core/services/retry.py
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection
+
+from .. import metrics
+
+# SQLSTATEs Postgres uses for serialization failures and detected deadlocks.
+RETRYABLE_SQLSTATES = {'40001', '40P01'}
+
+
+def is_retryable(exc):
+    """
+    Return True if ``exc`` is a transient conflict worth retrying.
+    """
+    if getattr(exc.__cause__, 'pgcode', None) in RETRYABLE_SQLSTATES:
+        return True
+    # SQLite reports write contention as a locked database.
+    return 'database is locked' in str(exc)
+
+
+def run_with_retry(func, operation):
+    """
+    Call ``func`` and retry it on deadlocks and serialization failures.
+
+    ``func`` must open its own transaction so that each attempt starts from
+    a clean slate. Backoff is exponential with full jitter and capped by
+    POSTING_RETRY_MAX_DELAY; after POSTING_RETRY_ATTEMPTS the error is raised.
+    When called inside an outer atomic block a retry would run inside an
+    aborted transaction, so the error is raised straight away and it is up
+    to the caller owning the transaction to retry.
+    """
+    if connection.in_atomic_block:
+        return func()
+
+    attempts = settings.POSTING_RETRY_ATTEMPTS
+    base_delay = settings.POSTING_RETRY_BASE_DELAY
+    max_delay = settings.POSTING_RETRY_MAX_DELAY
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except OperationalError as exc:
+            if attempt == attempts or not is_retryable(exc):
+                metrics.increment('posting_conflicts_total', operation=operation)
+                raise
+            metrics.increment('posting_retries_total', operation=operation)
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
@@ -0,0 +1,98 @@
+# core/services/rollups.py
+from collections import defaultdict
+from datetime import date, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from ..models import Account, MonthlyRollup, Transaction, TransactionArchive
+
+ZERO = Decimal('0.00')
+
+
+def entry_month(timestamp):
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    return date(timestamp.year, timestamp.month, 1)
+
+
+def apply_rollups(entries, slot=0):
+    """
+    Add saved ledger rows to the monthly rollups of ``slot`` with one upsert.
+    Must run in the same database transaction as the rows themselves.
+
+    Rows are upserted in (account, month, type) order so that concurrent
+    postings touching the same rollups lock them in the same order.
+    """
+    totals = defaultdict(lambda: [0, ZERO, 0, ZERO])
+    for entry in entries:
+        row = totals[(entry.account_id, entry_month(entry.timestamp), entry.transaction_type, slot)]
+        if entry.signed_amount > 0:
+            row[0] += 1
+            row[1] += entry.signed_amount
+        else:
+            row[2] += 1
+            row[3] -= entry.signed_amount
+    if not totals:
+        return
+
+    table = connection.ops.quote_name(MonthlyRollup._meta.db_table)
+    placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s)'] * len(totals))
+    params = []
+    for key in sorted(totals):
+        params.extend(key)
+        params.extend(totals[key])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (account_id, month, transaction_type, slot, credit_count, credit_total, '
+            f'debit_count, debit_total) VALUES {placeholders} '
+            f'ON CONFLICT (account_id, month, transaction_type, slot) DO UPDATE SET '
+            f'credit_count = {table}.credit_count + excluded.credit_count, '
+            f'credit_total = {table}.credit_total + excluded.credit_total, '
+            f'debit_count = {table}.debit_count + excluded.debit_count, '
+            f'debit_total = {table}.debit_total + excluded.debit_total',
+            params
+        )
+
+
+def aggregate_ledger(queryset):
+    """
+    Compute rollup rows (unsaved, all in slot 0) from a Transaction queryset
+    in one query.
+    """
+    credit, debit = Q(signed_amount__gt=0), Q(signed_amount__lte=0)
+    rows = (
+        queryset.annotate(month=TruncMonth('timestamp', output_field=DateField(), tzinfo=dt_timezone.utc))
+        .values('account_id', 'month', 'transaction_type')
+        .annotate(
+            credit_count=Count('id', filter=credit), credit_total=Sum('signed_amount', filter=credit),
+            debit_count=Count('id', filter=debit), debit_total=Sum('signed_amount', filter=debit),
+        )
+        .order_by()
+    )
+    return [
+        MonthlyRollup(
+            account_id=row['account_id'], month=row['month'], transaction_type=row['transaction_type'],
+            credit_count=row['credit_count'], credit_total=row['credit_total'] or ZERO,
+            debit_count=row['debit_count'], debit_total=-(row['debit_total'] or ZERO),
+        )
+        for row in rows
+    ]
+
+
+def rebuild_rollups(account_ids):
+    """
+    Recompute the rollups of the given accounts from the ledger. The accounts
+    are locked first so postings cannot slip in between the delete and the
+    recount. Months archived out of the database keep their rollups.
+    """
+    archived = list(TransactionArchive.objects.values_list('month', flat=True))
+    with transaction.atomic():
+        locked = list(
+            Account.objects.select_for_update().filter(pk__in=account_ids).order_by('pk').values_list('pk', flat=True)
+        )
+        MonthlyRollup.objects.filter(account_id__in=locked).exclude(month__in=archived).delete()
+        rollups = aggregate_ledger(Transaction.objects.filter(account_id__in=locked))
+        MonthlyRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
@@ -0,0 +1,93 @@
+# core/services/transfer.py
+import time
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .. import metrics
+from ..models import Account, Transfer
+from .balances import load_slot_balances
+from .cache import invalidate_account_lists
+from .exceptions import InsufficientFunds
+from .ledger import ledger_entry, write_entries
+from .retry import run_with_retry
+
+
+def lock_accounts(account_ids):
+    """
+    Lock the given accounts with SELECT ... FOR UPDATE and return them by pk.
+
+    Rows are always locked in primary-key order, so two transactions touching
+    the same accounts queue up behind each other instead of deadlocking.
+    Accounts with balance slots have them summed, so ``total_balance`` is
+    what funds checks and ledger rows use; ``balance`` is what gets written.
+    """
+    started = time.monotonic()
+    accounts = Account.objects.select_for_update().filter(pk__in=account_ids).order_by('pk')
+    locked = {account.pk: account for account in accounts}
+    metrics.observe('account_lock_wait_seconds', time.monotonic() - started)
+    load_slot_balances(locked.values())
+    return locked
+
+
+def transfer_legs(journal, source, destination):
+    """
+    Build the debit and credit ledger rows of a saved Transfer, using the
+    in-memory balances of the locked accounts after the transfer.
+    """
+    return [
+        ledger_entry(
+            source, -journal.amount, source.total_balance, 'TRANSFER',
+            f'Transfer to {destination.account_number}', counterparty=destination, transfer=journal
+        ),
+        ledger_entry(
+            destination, journal.amount, destination.total_balance, 'TRANSFER',
+            f'Transfer from {source.account_number}', counterparty=source, transfer=journal
+        ),
+    ]
+
+
+def _transfer_once(from_account, to_account, amount):
+    with transaction.atomic():
+        locked = lock_accounts([from_account.pk, to_account.pk])
+        source, destination = locked[from_account.pk], locked[to_account.pk]
+        if source.total_balance < amount:
+            raise InsufficientFunds()
+
+        now = timezone.now()
+        # Slots only grow while the account is locked, so the part of the
+        # amount they covered stays covered.
+        in_slots = source.total_balance - source.balance
+        debited = Account.objects.filter(pk=source.pk, balance__gte=amount - in_slots).update(
+            balance=F('balance') - amount, updated_at=now
+        )
+        if not debited:
+            raise InsufficientFunds()
+        Account.objects.filter(pk=destination.pk).update(
+            balance=F('balance') + amount, updated_at=now
+        )
+
+        source.balance -= amount
+        destination.balance += amount
+        journal = Transfer.objects.create(
+            from_account=source, to_account=destination, amount=amount, created_at=now
+        )
+        write_entries(transfer_legs(journal, source, destination))
+        invalidate_account_lists([source.owner_id, destination.owner_id])
+
+    from_account.balance = source.balance
+    to_account.balance = destination.balance
+    return source.total_balance
+
+
+def transfer(from_account, to_account, amount):
+    """
+    Move ``amount`` from ``from_account`` to ``to_account``.
+
+    Both legs and both ledger entries are written in one short transaction.
+    Deadlocks and serialization failures are retried with backoff.
+    Raises InsufficientFunds if the source balance does not cover the amount.
+    Returns the source account's new balance.
+    """
+    return run_with_retry(lambda: _transfer_once(from_account, to_account, amount), 'transfer')
@@ -0,0 +1,39 @@
+# core/signals.py
+from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token
+from .instrumentation import install_query_recorder
+from .models import Customer
+
+
+def _invalidate_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    # Covers deactivation as well as any other change to the cached user.
+    if not created:
+        _invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def customer_changed(sender, instance, **kwargs):
+    # The cached entry remembers the customer id, or that there was none.
+    if instance.user_id is not None:
+        _invalidate_user_tokens(instance.user_id)
+
+
+# Per-request SQL accounting for the metrics middleware.
+connection_created.connect(install_query_recorder, dispatch_uid='core.install_query_recorder')
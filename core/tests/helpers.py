@@ -0,0 +1,23 @@
+# core/tests/helpers.py
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from ..models import Account, Customer
+
+
+def create_account(username, balance='0.00', account_type='CHECKING'):
+    """
+    Create a user with a customer profile and one account.
+    Returns the (user, account) pair.
+    """
+    user = User.objects.create_user(username=username, password='testpassword123')
+    customer = Customer.objects.create(
+        user=user,
+        full_name=f'{username} Full Name',
+        email=f'{username}@example.com',
+        phone_number='555-0101',
+        date_of_birth='1990-01-01',
+    )
+    account = Account.objects.create(owner=customer, account_type=account_type, balance=Decimal(balance))
+    return user, account
@@ -0,0 +1,97 @@
+# core/tests/test_account_caching.py
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import services
+from ..models import Account
+from .helpers import create_account
+
+
+class AccountConditionalGetTests(APITestCase):
+    """
+    Test suite for ETag validation and cached account lists.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.account = create_account('polluser', '10.00')
+        _, self.payer = create_account('payer', '100.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.list_url = '/api/accounts/'
+        self.detail_url = f'/api/accounts/{self.account.pk}/'
+
+    def test_detail_not_modified_until_posting(self):
+        """
+        Ensure an unchanged account answers 304 and a posting breaks the ETag.
+        """
+        response = self.client.get(self.detail_url)
+        etag = response['ETag']
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        services.deposit(self.account, Decimal('5.00'))
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['balance'], '15.00')
+
+    def test_list_not_modified_until_incoming_transfer(self):
+        """
+        Ensure a transfer from another customer invalidates the polling user's list.
+        """
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        services.transfer(self.payer, self.account, Decimal('7.50'))
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['balance'], '17.50')
+
+    def test_list_changes_when_a_posting_commits_late(self):
+        """
+        Ensure a change stamped before the newest updated_at, as when its
+        transaction commits after another account's write, breaks the ETag.
+        """
+        savings = Account.objects.create(owner=self.account.owner, account_type='SAVINGS')
+        first = self.client.get(self.list_url)
+        etag = first['ETag']
+        self.assertNotIn('Last-Modified', first)
+
+        Account.objects.filter(pk=self.account.pk).update(
+            balance=Decimal('999.00'), updated_at=savings.updated_at - timedelta(seconds=1)
+        )
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {row['account_number']: row['balance'] for row in response.data}[self.account.account_number], '999.00'
+        )
+
+    def test_cached_list_skips_serialization_query(self):
+        """
+        Ensure a repeat list request is answered from the cache after one aggregate query.
+        """
+        first = self.client.get(self.list_url)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.list_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_new_account_shows_up(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.client.post(self.list_url, {'account_type': 'SAVINGS'}, format='json')
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
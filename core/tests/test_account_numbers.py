@@ -0,0 +1,58 @@
+# core/tests/test_account_numbers.py
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Account
+from ..services import account_numbers
+from ..services.account_numbers import (
+    AccountNumberAllocator, format_account_number, is_valid_account_number
+)
+from .helpers import create_account
+
+
+class AccountNumberTests(TestCase):
+    """
+    Test suite for account number allocation.
+    """
+
+    def test_format_has_check_digit(self):
+        number = format_account_number(7992739871)
+
+        self.assertEqual(number, 'ACC-000079927398713')
+        self.assertTrue(is_valid_account_number(number))
+        self.assertFalse(is_valid_account_number('ACC-000079927398710'))
+
+    def test_legacy_numbers_stay_valid(self):
+        self.assertTrue(is_valid_account_number('ACC-1760659200123'))
+        self.assertFalse(is_valid_account_number('ACC-17606592X0123'))
+
+    def test_allocator_claims_whole_blocks(self):
+        """
+        Ensure allocations are unique and claim one block per BLOCK_SIZE numbers.
+        """
+        allocator = AccountNumberAllocator()
+        count = account_numbers.BLOCK_SIZE * 2 + 1
+
+        with CaptureQueriesContext(connection) as queries:
+            numbers = allocator.allocate(count)
+
+        claims = [query for query in queries if 'nextval' in query['sql'] or query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(claims), 3)
+        self.assertEqual(len(set(numbers)), count)
+        self.assertTrue(all(is_valid_account_number(number) for number in numbers))
+
+    def test_many_accounts_in_the_same_second(self):
+        """
+        Ensure creating many accounts at once never collides.
+        """
+        _, account = create_account('bulkowner')
+        numbers = account_numbers.allocate_account_numbers(2000)
+        Account.objects.bulk_create([
+            Account(owner=account.owner, account_type='SAVINGS', account_number=number)
+            for number in numbers
+        ])
+        for _ in range(50):
+            Account.objects.create(owner=account.owner, account_type='CHECKING')
+
+        self.assertEqual(Account.objects.values('account_number').distinct().count(), 2051)
@@ -0,0 +1,101 @@
+# core/tests/test_admin.py
+import unittest
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .. import services
+from ..models import Transaction
+from ..pagination import EstimatedCountPaginator
+from .helpers import create_account
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AdminTests(TestCase):
+    """
+    Test suite for the admin changelists of customers, accounts and transactions.
+    """
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'adminpass123'))
+        self.count = 0
+
+    def add_customers(self, count):
+        for _ in range(count):
+            self.count += 1
+            _, account = create_account(f'adminuser{self.count}', '100.00')
+            _, other = create_account(f'adminother{self.count}')
+            services.deposit(account, Decimal('5.00'))
+            services.transfer(account, other, Decimal('1.00'))
+
+    def queries_for(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_run_a_fixed_number_of_queries(self):
+        for model in ('customer', 'account', 'transaction'):
+            with self.subTest(model=model):
+                url = f'/admin/core/{model}/'
+                self.add_customers(2)
+                few = self.queries_for(url)
+                self.add_customers(5)
+                self.assertEqual(self.queries_for(url), few)
+
+    def test_search_is_exact(self):
+        self.add_customers(2)
+        number = Transaction.objects.filter(transaction_type='DEPOSIT').first().account.account_number
+
+        response = self.client.get('/admin/core/transaction/', {'q': number})
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+        response = self.client.get('/admin/core/account/', {'q': number[:-1]})
+        self.assertEqual(len(response.context['cl'].result_list), 0)
+
+    def test_date_hierarchy_drilldown(self):
+        self.add_customers(1)
+        today = Transaction.objects.first().timestamp
+
+        response = self.client.get('/admin/core/transaction/', {
+            'timestamp__year': today.year, 'timestamp__month': today.month, 'timestamp__day': today.day,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 3)
+
+    def test_ledger_is_read_only(self):
+        self.add_customers(1)
+        pk = Transaction.objects.first().pk
+
+        self.assertEqual(self.client.get('/admin/core/transaction/add/').status_code, 403)
+        self.assertEqual(self.client.post(f'/admin/core/transaction/{pk}/delete/', {'post': 'yes'}).status_code, 403)
+        self.assertTrue(Transaction.objects.filter(pk=pk).exists())
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """
+    Test suite for the admin paginator of large tables.
+    """
+
+    def test_small_results_are_counted_exactly(self):
+        for index in range(3):
+            create_account(f'paginated{index}')
+
+        paginator = EstimatedCountPaginator(Transaction.objects.order_by('id'), 2)
+        self.assertEqual(paginator.count, 0)
+        paginator = EstimatedCountPaginator(User.objects.order_by('id'), 2)
+        self.assertEqual((paginator.count, paginator.num_pages), (3, 2))
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Row estimates require PostgreSQL.')
+    def test_large_results_use_the_planner_estimate(self):
+        create_account('estimated')
+        paginator = EstimatedCountPaginator(User.objects.order_by('id'), 10)
+        paginator.exact_count_limit = -1
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertGreaterEqual(paginator.count, 1)
+        self.assertTrue(queries[0]['sql'].startswith('EXPLAIN'))
+        self.assertEqual(len(queries), 1)
@@ -0,0 +1,69 @@
+# core/tests/test_async_api.py
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from .. import services
+from .helpers import create_account
+
+
+class AsyncReadEndpointTests(TestCase):
+    """
+    Test suite for the async-native read endpoints.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('asyncuser', '10.00')
+        _, self.other = create_account('stranger')
+        for amount in ('1.00', '2.00', '3.00'):
+            services.deposit(self.account, Decimal(amount))
+        token = Token.objects.create(user=self.user)
+        self.headers = {'Authorization': 'Token ' + token.key}
+
+    async def test_requires_token(self):
+        response = await self.async_client.get('/api/async/accounts/')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+    async def test_account_list_matches_sync_endpoint(self):
+        response = await self.async_client.get('/api/async/accounts/', headers=self.headers)
+        sync_response = await self.async_client.get('/api/accounts/', headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_account_detail_is_scoped_to_owner(self):
+        response = await self.async_client.get(f'/api/async/accounts/{self.account.pk}/', headers=self.headers)
+        self.assertEqual(response.json()['balance'], '16.00')
+
+        response = await self.async_client.get(f'/api/async/accounts/{self.other.pk}/', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_customer_profile(self):
+        response = await self.async_client.get('/api/async/customer/', headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['full_name'], 'asyncuser Full Name')
+
+    async def test_transaction_pages_follow_cursor(self):
+        """
+        Ensure the keyset cursor walks the history newest first without repeats.
+        """
+        url = '/api/async/transactions/?page_size=2'
+        amounts = []
+        while url:
+            response = await self.async_client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            amounts.extend(row['amount'] for row in response.json()['results'])
+            url = response.json()['next']
+
+        self.assertEqual(amounts, ['3.00', '2.00', '1.00'])
+
+    async def test_transaction_rows_match_sync_endpoint(self):
+        response = await self.async_client.get('/api/async/transactions/', headers=self.headers)
+        sync_response = await self.async_client.get('/api/transactions/', headers=self.headers)
+
+        self.assertEqual(set(response.json()), {'next', 'results'})
+        self.assertEqual(response.json()['results'], sync_response.json()['results'])
@@ -2,6 +2,8 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import caches
 
 class AuthenticationTests(APITestCase):
     """
@@ -17,6 +19,7 @@ class AuthenticationTests(APITestCase):
             password='testpassword123'
         )
         self.customer_url = '/api/customers/'
+        caches[settings.TOKEN_AUTH_CACHE_ALIAS].clear()
 
     def test_get_auth_token_successfully(self):
         """
@@ -58,4 +61,45 @@ class AuthenticationTests(APITestCase):
         response = self.client.get(self.customer_url)
 
         # Assert
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cached_token_skips_authentication_query(self):
+        """
+        Ensure repeat requests with the same token do not hit the token table.
+        """
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.get(self.customer_url)
+
+        # Only the customer lookup itself remains.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.customer_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_rejected(self):
+        """
+        Ensure deleting a token evicts it from the authentication cache.
+        """
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.get(self.customer_url)
+
+        token.delete()
+        response = self.client.get(self.customer_url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """
+        Ensure deactivating a user evicts their cached tokens.
+        """
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.get(self.customer_url)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.customer_url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
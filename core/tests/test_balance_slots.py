@@ -0,0 +1,124 @@
+# core/tests/test_balance_slots.py
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db.models import Sum
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import services
+from ..models import Account, BalanceSlot, MonthlyRollup
+from ..services.balances import fold_slots, set_balance_slots
+from .helpers import create_account
+
+
+class BalanceSlotTests(APITestCase):
+    """
+    Test suite for accounts whose deposits are spread over balance slots.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('slotuser', '10.00')
+        _, self.other = create_account('slotother', '0.00')
+        set_balance_slots(self.account.pk, 4)
+        self.account.refresh_from_db()
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = f'/api/accounts/{self.account.pk}/'
+
+    def slot_total(self):
+        return BalanceSlot.objects.filter(account=self.account).aggregate(total=Sum('balance'))['total']
+
+    def test_deposits_go_to_slots(self):
+        for _ in range(8):
+            balance = services.deposit(self.account, Decimal('5.00'))
+
+        self.assertEqual(balance, Decimal('50.00'))
+        self.assertEqual(Account.objects.get(pk=self.account.pk).balance, Decimal('10.00'))
+        self.assertEqual(self.slot_total(), Decimal('40.00'))
+        self.assertEqual(self.account.transactions.latest('id').balance_after, Decimal('50.00'))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['balance'], '50.00')
+        response = self.client.get('/api/accounts/')
+        self.assertEqual(response.data[0]['balance'], '50.00')
+
+    def test_deposit_to_slot_changes_etags(self):
+        detail = self.client.get(self.url)
+        listing = self.client.get('/api/accounts/')
+        BalanceSlot.objects.filter(account=self.account).update(updated_at=self.account.updated_at)
+
+        services.deposit(self.account, Decimal('1.00'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=detail['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['balance'], '11.00')
+        response = self.client.get('/api/accounts/', HTTP_IF_NONE_MATCH=listing['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_withdrawal_checks_the_total(self):
+        services.deposit(self.account, Decimal('50.00'))
+
+        self.assertEqual(services.withdraw(self.account, Decimal('40.00')), Decimal('20.00'))
+        self.assertEqual(Account.objects.get(pk=self.account.pk).balance, Decimal('-30.00'))
+        with self.assertRaises(services.InsufficientFunds):
+            services.withdraw(self.account, Decimal('20.01'))
+
+        self.assertEqual(services.transfer(self.account, self.other, Decimal('20.00')), Decimal('0.00'))
+        with self.assertRaises(services.InsufficientFunds):
+            services.transfer(self.account, self.other, Decimal('0.01'))
+        self.assertEqual(self.client.get(self.url).data['balance'], '0.00')
+
+    def test_fold_moves_slots_into_the_account(self):
+        services.deposit(self.account, Decimal('7.00'))
+        services.deposit(self.account, Decimal('8.00'))
+
+        call_command('fold_balance_slots', stdout=io.StringIO())
+
+        self.assertEqual(Account.objects.get(pk=self.account.pk).balance, Decimal('25.00'))
+        self.assertEqual(self.slot_total(), Decimal('0.00'))
+        self.assertEqual(fold_slots(self.account.pk), 0)
+        self.assertEqual(self.client.get(self.url).data['balance'], '25.00')
+
+    def test_turning_slots_off_folds_them(self):
+        services.deposit(self.account, Decimal('5.00'))
+
+        call_command('set_balance_slots', self.account.account_number, '0', stdout=io.StringIO())
+
+        account = Account.objects.get(pk=self.account.pk)
+        self.assertEqual((account.balance_slots, account.balance), (0, Decimal('15.00')))
+        self.assertFalse(BalanceSlot.objects.filter(account=account).exists())
+
+    def test_summary_adds_up_slot_rollups(self):
+        for _ in range(6):
+            services.deposit(self.account, Decimal('1.00'))
+        services.withdraw(self.account, Decimal('2.00'))
+
+        response = self.client.get(f'{self.url}summary/')
+
+        self.assertEqual(
+            [(row['transaction_type'], row['credit_count'], row['debit_count']) for row in response.data['months']],
+            [('DEPOSIT', 6, 0), ('WITHDRAWAL', 0, 1)]
+        )
+        self.assertEqual(response.data['net'], '4.00')
+        self.assertGreaterEqual(MonthlyRollup.objects.filter(account=self.account).count(), 2)
+
+    def test_current_balance_matches_account_detail(self):
+        """
+        Ensure /balance/ reports the slot total, not a balance_after that
+        missed a concurrent deposit to another slot.
+        """
+        services.deposit(self.account, Decimal('5.00'))
+        services.deposit(self.account, Decimal('5.00'))
+        # What the second deposit records if the first had not committed yet.
+        self.account.transactions.filter(pk=self.account.transactions.latest('id').pk).update(
+            balance_after=Decimal('15.00')
+        )
+
+        detail = self.client.get(self.url)
+        balance = self.client.get(f'{self.url}balance/')
+
+        self.assertEqual(detail.data['balance'], '20.00')
+        self.assertEqual(balance.data['balance'], Decimal(detail.data['balance']))
@@ -0,0 +1,87 @@
+# core/tests/test_batch_transfer.py
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Account, Transaction
+from .helpers import create_account
+
+
+class BatchTransferTests(APITestCase):
+    """
+    Test suite for the batch transfer action.
+    """
+
+    def setUp(self):
+        self.user, self.source = create_account('payroll', '100.00')
+        self.payees = [create_account(f'payee{i}')[1] for i in range(3)]
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = f'/api/accounts/{self.source.pk}/batch-transfer/'
+        # Warm the authentication cache so only the batch itself is counted.
+        self.client.get('/api/accounts/')
+
+    def transfers(self, *amounts):
+        return [
+            {'to_account_number': payee.account_number, 'amount': amount}
+            for payee, amount in zip(self.payees, amounts)
+        ]
+
+    def test_batch_applies_every_posting(self):
+        """
+        Ensure a valid batch moves all funds in a bounded number of queries.
+        """
+        data = {'transfers': self.transfers('10.00', '20.00', '30.00')}
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['succeeded'], 3)
+        self.assertEqual(Decimal(response.data['from_account_balance']), Decimal('40.00'))
+        balances = [Account.objects.get(pk=payee.pk).balance for payee in self.payees]
+        self.assertEqual(balances, [Decimal('10.00'), Decimal('20.00'), Decimal('30.00')])
+        self.assertEqual(Transaction.objects.count(), 6)
+
+    def test_all_or_nothing_rejects_whole_batch(self):
+        """
+        Ensure one failing item rolls back every other item.
+        """
+        transfers = self.transfers('10.00', '20.00')
+        transfers.append({'to_account_number': 'ACC-000079927398713', 'amount': '1.00'})
+        response = self.client.post(self.url, {'transfers': transfers}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['not_applied', 'not_applied', 'failed']
+        )
+        self.source.refresh_from_db()
+        self.assertEqual(self.source.balance, Decimal('100.00'))
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_mistyped_account_number_is_rejected_before_posting(self):
+        transfers = self.transfers('10.00')
+        transfers.append({'to_account_number': 'ACC-000079927398710', 'amount': '1.00'})
+        response = self.client.post(self.url, {'transfers': transfers}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['transfers'][0], {})
+        self.assertIn('to_account_number', response.data['transfers'][1])
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_best_effort_skips_failing_items(self):
+        """
+        Ensure best-effort mode applies what it can and reports the rest.
+        """
+        data = {'mode': 'best_effort', 'transfers': self.transfers('60.00', '60.00', '40.00')}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['ok', 'failed', 'ok']
+        )
+        self.assertEqual(response.data['results'][1]['error'], 'Insufficient funds.')
+        self.assertEqual(Decimal(response.data['from_account_balance']), Decimal('0.00'))
@@ -0,0 +1,77 @@
+# core/tests/test_bench.py
+import io
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from ..management.commands.bench import Command, summarize
+from ..models import Account, Transaction
+
+
+class BenchCommandTests(TransactionTestCase):
+    """
+    Test suite for the bench management command.
+    """
+
+    def test_reports_json_and_cleans_up(self):
+        out = io.StringIO()
+        call_command(
+            'bench', customers=3, requests=30, workers=1, seed=7, json=True,
+            mix='deposit=2,transfer=1,list=1,history=1', stdout=out
+        )
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report['total']['requests'], 30)
+        self.assertEqual(report['total']['statuses'], {'200': 30})
+        self.assertEqual(set(report['operations']), {'deposit', 'transfer', 'list', 'history'})
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request', 'throughput_rps'):
+            self.assertIsNotNone(report['total'][key])
+        self.assertEqual(report['lock_conflicts'], 0)
+
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Account.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
+
+    @override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'postings': '2/min'}},
+        MAX_CONCURRENT_POSTINGS=1,
+    )
+    def test_rate_limits_do_not_apply_to_the_run(self):
+        out = io.StringIO()
+        call_command('bench', scenario='hot-deposit', requests=20, workers=1, seed=7, json=True, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report['total']['statuses'], {'200': 20})
+        self.assertEqual((report['total']['throttled'], report['total']['unavailable']), (0, 0))
+
+
+class SummarizeTests(SimpleTestCase):
+    """
+    Test suite for the reduction of bench samples to statistics and their report.
+    """
+
+    def test_refused_requests_are_counted_apart_from_latencies(self):
+        samples = [(0.010, 3, 200), (0.020, 3, 200), (0.001, 0, 429), (0.001, 0, 503)]
+
+        stats = summarize(samples, 1.0)
+
+        self.assertEqual((stats['requests'], stats['throttled'], stats['unavailable']), (4, 1, 1))
+        self.assertEqual((stats['throughput_rps'], stats['p50_ms'], stats['max_ms']), (2.0, 10.0, 20.0))
+        self.assertEqual(stats['queries_per_request'], 3.0)
+
+    def test_report_prints_dashes_for_refused_operations(self):
+        refused = summarize([(0.001, 0, 429), (0.001, 0, 503)], 1.0)
+        served = summarize([(0.010, 3, 200)], 1.0)
+        report = {
+            'operations': {'deposit': refused, 'list': served}, 'total': served,
+            'lock_conflicts': 0, 'lock_retries': 0, 'elapsed_seconds': 1.0, 'seed_seconds': 0.1,
+        }
+        out = io.StringIO()
+
+        Command(stdout=out).print_report(report)
+
+        deposit = next(line for line in out.getvalue().splitlines() if line.startswith('deposit'))
+        self.assertEqual(deposit.split()[:9], ['deposit', '2', '1', '1', '0.0', '-', '-', '-', '-'])
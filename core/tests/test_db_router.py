@@ -0,0 +1,68 @@
+# core/tests/test_db_router.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .. import db_router
+from ..db_router import PrimaryReplicaRouter
+from ..middleware import ReplicaRoutingMiddleware
+from ..models import Account
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_PIN_SECONDS=5)
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """
+    Test suite for read-replica routing and read-your-writes pinning.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route_during(self, request, user=None):
+        """
+        Run a request through the middleware and return where a read went.
+        """
+        seen = []
+
+        def view(request):
+            if user is not None:
+                request.user = user
+                db_router.pin_if_recent_write(user.pk)
+            seen.append(self.router.db_for_read(Account))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(request)
+        return seen[0]
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Account), 'replica1')
+        self.assertEqual(self.router.db_for_write(Account), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        self.assertEqual(self.router.db_for_read(Account), 'default')
+
+    def test_use_primary_block(self):
+        with db_router.use_primary():
+            self.assertEqual(self.router.db_for_read(Account), 'default')
+        self.assertEqual(self.router.db_for_read(Account), 'replica1')
+
+    def test_postings_read_from_primary(self):
+        self.assertEqual(self.route_during(self.factory.post('/api/accounts/1/deposit/')), 'default')
+        self.assertEqual(self.route_during(self.factory.get('/api/accounts/')), 'replica1')
+
+    def test_user_is_pinned_after_a_write(self):
+        """
+        Ensure a user's reads stick to the primary right after they post.
+        """
+        writer, bystander = User(pk=1, username='writer'), User(pk=2, username='bystander')
+
+        self.route_during(self.factory.post('/api/accounts/1/deposit/'), user=writer)
+
+        self.assertEqual(self.route_during(self.factory.get('/api/accounts/'), user=writer), 'default')
+        self.assertEqual(self.route_during(self.factory.get('/api/accounts/'), user=bystander), 'replica1')
+        # The pin only lasts for the request that saw it.
+        self.assertEqual(self.router.db_for_read(Account), 'replica1')
@@ -0,0 +1,73 @@
+# core/tests/test_fast_serialization.py
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from .. import services
+from ..models import Customer, Transaction
+from ..serializers import CustomerSerializer, TransactionSerializer
+from ..serializers.fast import ValuesSerializer
+from .helpers import create_account
+
+
+class FastSerializationTests(APITestCase):
+    """
+    Test suite for the values()-based list serialization.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('fastuser', '10.00')
+        services.deposit(self.account, Decimal('1234567.89'))
+        services.withdraw(self.account, Decimal('0.01'))
+        for description in (None, '', 'Caf\u00e9 \u2028 line\u2029 "quoted" \\ \u2713'):
+            Transaction.objects.create(
+                account=self.account, amount=Decimal('5'), signed_amount=Decimal('5'),
+                balance_after=Decimal('1234582.88'), transaction_type='DEPOSIT', direction='CREDIT',
+                description=description
+            )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def test_transaction_list_is_byte_compatible(self):
+        response = self.client.get('/api/transactions/', {'page_size': 3})
+        instances = Transaction.objects.order_by('-timestamp', '-id')[:3]
+        expected = JSONRenderer().render({
+            'next': response.data['next'],
+            'previous': response.data['previous'],
+            'results': TransactionSerializer(instances, many=True).data,
+        })
+
+        self.assertEqual(response.content, expected)
+
+        response = self.client.get(response.data['next'])
+        expected = JSONRenderer().render({
+            'next': None,
+            'previous': response.data['previous'],
+            'results': TransactionSerializer(Transaction.objects.order_by('-timestamp', '-id')[3:], many=True).data,
+        })
+        self.assertEqual(response.content, expected)
+
+    def test_customer_list_is_byte_compatible(self):
+        response = self.client.get('/api/customers/')
+
+        expected = JSONRenderer().render(CustomerSerializer(Customer.objects.filter(user=self.user), many=True).data)
+        self.assertEqual(response.content, expected)
+
+    def test_matches_serializer_in_other_timezone(self):
+        rows = ValuesSerializer(TransactionSerializer)
+        queryset = Transaction.objects.order_by('id')
+
+        with timezone.override('Asia/Kolkata'):
+            self.assertEqual(
+                rows.to_representation(queryset.values(*rows.columns)),
+                [dict(item) for item in TransactionSerializer(queryset, many=True).data]
+            )
+
+    def test_browsable_api_still_renders(self):
+        response = self.client.get('/api/transactions/', HTTP_ACCEPT='text/html')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Transaction', response.content)
@@ -0,0 +1,63 @@
+# core/tests/test_idempotency.py
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import IdempotencyKey, Transaction
+from .helpers import create_account
+
+
+class IdempotencyKeyTests(APITestCase):
+    """
+    Test suite for Idempotency-Key handling on money-moving actions.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('retryuser', '100.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = f'/api/accounts/{self.account.pk}/withdraw/'
+
+    def test_replayed_key_posts_once(self):
+        """
+        Ensure a retried request returns the original response without posting again.
+        """
+        first = self.client.post(self.url, {'amount': '30.00'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        second = self.client.post(self.url, {'amount': '30.00'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.data, {'status': 'withdrawal successful', 'new_balance': 70.0})
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('70.00'))
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_key_reused_for_different_request(self):
+        self.client.post(self.url, {'amount': '30.00'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.post(self.url, {'amount': '31.00'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        self.client.post(self.url, {'amount': '30.00'}, format='json')
+        self.client.post(self.url, {'amount': '30.00'}, format='json')
+
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_purge_deletes_only_expired_keys(self):
+        self.client.post(self.url, {'amount': '1.00'}, format='json', HTTP_IDEMPOTENCY_KEY='old')
+        self.client.post(self.url, {'amount': '1.00'}, format='json', HTTP_IDEMPOTENCY_KEY='new')
+        IdempotencyKey.objects.filter(key='old').update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        call_command('purge_idempotency_keys', stdout=io.StringIO())
+
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['new'])
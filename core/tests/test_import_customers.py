@@ -0,0 +1,141 @@
+# core/tests/test_import_customers.py
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from ..models import Customer
+
+
+def registration(index, **overrides):
+    row = {
+        'username': f'import{index}',
+        'password': f'secret-{index}',
+        'email': f'import{index}@example.com',
+        'full_name': f'Imported Customer {index}',
+        'phone_number': f'555-{index:04d}',
+        'date_of_birth': '1990-01-01',
+        'gender': 'O',
+    }
+    row.update(overrides)
+    return row
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportCustomersTests(TestCase):
+    """
+    Test suite for the import_customers bulk onboarding command.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_csv(self, rows):
+        path = os.path.join(self.directory, 'customers.csv')
+        with open(path, 'w', newline='') as output:
+            writer = csv.DictWriter(output, fieldnames=list(registration(0)))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def import_customers(self, path, **options):
+        options.setdefault('workers', 0)
+        call_command('import_customers', path, stdout=io.StringIO(), **options)
+
+    def read_rejects(self, path):
+        with open(path + '.rejects.ndjson') as rejects:
+            return [json.loads(line) for line in rejects]
+
+    def test_import_creates_users_and_customers(self):
+        path = self.write_csv([registration(i) for i in range(5)])
+
+        self.import_customers(path, workers=2, chunk_size=2)
+
+        self.assertEqual(Customer.objects.count(), 5)
+        customer = Customer.objects.select_related('user').get(email='import3@example.com')
+        self.assertEqual(customer.user.username, 'import3')
+        self.assertEqual(customer.full_name, 'Imported Customer 3')
+        self.assertTrue(customer.user.check_password('secret-3'))
+
+    def test_invalid_and_duplicate_rows_are_rejected(self):
+        User.objects.create_user(username='import1', password='x')
+        path = self.write_csv([
+            registration(0),
+            registration(1),
+            registration(2, date_of_birth='01/01/1990'),
+            registration(3, email='import0@example.com'),
+            registration(4, gender='X', phone_number='555-0000-0000-0'),
+            registration(5),
+        ])
+
+        self.import_customers(path)
+
+        self.assertEqual(
+            sorted(Customer.objects.values_list('user__username', flat=True)), ['import0', 'import5']
+        )
+        rejects = self.read_rejects(path)
+        self.assertEqual([reject['row'] for reject in rejects], [2, 3, 4, 5])
+        self.assertIn('username', rejects[0]['errors'])
+        self.assertIn('date_of_birth', rejects[1]['errors'])
+        self.assertIn('email', rejects[2]['errors'])
+        self.assertEqual(set(rejects[3]['errors']), {'gender', 'phone_number'})
+        self.assertNotIn('password', rejects[0]['record'])
+
+    def test_ndjson_with_malformed_line(self):
+        path = os.path.join(self.directory, 'customers.ndjson')
+        with open(path, 'w') as output:
+            output.write(json.dumps(registration(0)) + '\n\n{not json\n' + json.dumps(registration(1)) + '\n')
+
+        self.import_customers(path)
+
+        self.assertEqual(Customer.objects.count(), 2)
+        rejects = self.read_rejects(path)
+        self.assertEqual(rejects[0]['row'], 3)
+        self.assertIsNone(rejects[0]['record'])
+
+    def test_resume_from_checkpoint(self):
+        path = self.write_csv([registration(i) for i in range(6)])
+        # An earlier run committed the first chunk, wrote one reject and
+        # then died after writing a reject for a row it never committed.
+        Customer.objects.create(
+            user=User.objects.create_user(username='import0', password='x'), full_name='Imported Customer 0',
+            email='import0@example.com', phone_number='555-0000', date_of_birth='1990-01-01', gender='O'
+        )
+        with open(path + '.rejects.ndjson', 'w') as rejects:
+            rejects.write('{"row": 2}\n{"row": 4}\n')
+        with open(path + '.checkpoint', 'w') as checkpoint:
+            json.dump({
+                'source': os.path.abspath(path), 'rows': 2, 'imported': 1, 'rejected': 1, 'rejects_offset': 11
+            }, checkpoint)
+
+        self.import_customers(path, chunk_size=2)
+
+        self.assertEqual(Customer.objects.count(), 5)
+        self.assertFalse(User.objects.filter(username='import1').exists())
+        self.assertEqual(self.read_rejects(path), [{'row': 2}])
+        with open(path + '.checkpoint') as checkpoint:
+            state = json.load(checkpoint)
+        self.assertEqual((state['rows'], state['imported'], state['rejected']), (6, 5, 1))
+
+        # Running again finds nothing left to do.
+        self.import_customers(path)
+        self.assertEqual(Customer.objects.count(), 5)
+
+    def test_checkpoint_of_another_file_is_refused(self):
+        path = self.write_csv([registration(0)])
+        with open(path + '.checkpoint', 'w') as checkpoint:
+            json.dump({'source': '/elsewhere.csv', 'rows': 1}, checkpoint)
+
+        with self.assertRaises(CommandError):
+            self.import_customers(path)
+
+        self.import_customers(path, restart=True)
+        self.assertEqual(Customer.objects.count(), 1)
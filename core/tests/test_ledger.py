@@ -0,0 +1,98 @@
+# core/tests/test_ledger.py
+import importlib
+from datetime import timedelta
+from decimal import Decimal
+
+from django.apps import apps
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Transaction
+from .. import services
+from .helpers import create_account
+
+
+class RunningBalanceTests(APITestCase):
+    """
+    Test suite for signed amounts, running balances and as-of balance lookups.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('ledgeruser', '50.00')
+        _, self.other = create_account('otheruser')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def post_history(self):
+        services.deposit(self.account, Decimal('25.00'))
+        services.withdraw(self.account, Decimal('10.00'))
+        services.transfer(self.account, self.other, Decimal('5.00'))
+
+    def test_postings_record_signed_running_balances(self):
+        """
+        Ensure every ledger row carries its signed amount and resulting balance.
+        """
+        self.post_history()
+
+        rows = Transaction.objects.filter(account=self.account).order_by('timestamp', 'id')
+        self.assertEqual(
+            list(rows.values_list('signed_amount', 'balance_after')),
+            [
+                (Decimal('25.00'), Decimal('75.00')),
+                (Decimal('-10.00'), Decimal('65.00')),
+                (Decimal('-5.00'), Decimal('60.00')),
+            ]
+        )
+        credit = Transaction.objects.get(account=self.other)
+        self.assertEqual((credit.signed_amount, credit.balance_after), (Decimal('5.00'), Decimal('5.00')))
+
+    def test_balance_as_of(self):
+        """
+        Ensure the balance endpoint answers for any point in the history.
+        """
+        self.post_history()
+        deposit = Transaction.objects.get(account=self.account, transaction_type='DEPOSIT')
+        url = f'/api/accounts/{self.account.pk}/balance/'
+
+        response = self.client.get(url, {'as_of': deposit.timestamp.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['balance'], Decimal('75.00'))
+
+        before = deposit.timestamp - timedelta(microseconds=1)
+        response = self.client.get(url, {'as_of': before.isoformat()})
+        self.assertEqual(response.data['balance'], Decimal('50.00'))
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['balance'], Decimal('60.00'))
+
+        before_opening = self.account.created_at - timedelta(days=1)
+        response = self.client.get(url, {'as_of': before_opening.isoformat()})
+        self.assertEqual(response.data['balance'], Decimal('0.00'))
+
+    def test_balance_rejects_invalid_timestamp(self):
+        for as_of in ('yesterday', '2025-02-30T00:00:00', '2025-01-01T25:00:00'):
+            with self.subTest(as_of=as_of):
+                response = self.client.get(f'/api/accounts/{self.account.pk}/balance/', {'as_of': as_of})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('as_of', response.data)
+
+    def test_backfill_recovers_legacy_rows(self):
+        """
+        Ensure the migration backfill derives directions and running balances.
+        """
+        self.post_history()
+        Transaction.objects.update(signed_amount=0, balance_after=0)
+
+        migration = importlib.import_module('core.migrations.0006_transaction_signed_amount_balance_after')
+        migration.backfill_running_balances(apps, None)
+
+        rows = Transaction.objects.filter(account=self.account).order_by('timestamp', 'id')
+        self.assertEqual(
+            list(rows.values_list('signed_amount', 'balance_after')),
+            [
+                (Decimal('25.00'), Decimal('75.00')),
+                (Decimal('-10.00'), Decimal('65.00')),
+                (Decimal('-5.00'), Decimal('60.00')),
+            ]
+        )
@@ -0,0 +1,77 @@
+# core/tests/test_metrics.py
+from decimal import Decimal
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import metrics
+from .helpers import create_account
+
+
+class MetricsTests(APITestCase):
+    """
+    Test suite for request instrumentation and the /metrics endpoint.
+    """
+
+    def setUp(self):
+        metrics.reset()
+        self.user, self.account = create_account('metricsuser', '50.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def series(self, text, prefix):
+        """
+        Return {line without value: value} for the sample lines starting with prefix.
+        """
+        return {
+            line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in text.splitlines() if line.startswith(prefix)
+        }
+
+    def test_records_latency_and_queries_per_route(self):
+        self.client.post(f'/api/accounts/{self.account.pk}/deposit/', {'amount': '5.00'}, format='json')
+        self.client.get('/api/transactions/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        requests = self.series(text, 'http_requests_total{')
+        self.assertEqual(requests['http_requests_total{method="POST",route="account-deposit",status="200"}'], 1)
+        self.assertEqual(requests['http_requests_total{method="GET",route="transaction-list",status="200"}'], 1)
+        buckets = self.series(text, 'http_request_duration_seconds_bucket{method="POST",route="account-deposit"')
+        self.assertEqual(buckets['http_request_duration_seconds_bucket{method="POST",route="account-deposit",le="+Inf"}'], 1)
+        queries = self.series(text, 'db_queries_total{')
+        self.assertGreater(queries['db_queries_total{route="account-deposit"}'], 1)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for value in (0.001, 0.02, 0.02, 7):
+            metrics.histogram('job_seconds', value, kind='x')
+
+        lines = self.series(metrics.render_prometheus(), 'job_seconds')
+
+        self.assertEqual(lines['job_seconds_bucket{kind="x",le="0.005"}'], 1)
+        self.assertEqual(lines['job_seconds_bucket{kind="x",le="0.025"}'], 3)
+        self.assertEqual(lines['job_seconds_bucket{kind="x",le="5"}'], 3)
+        self.assertEqual(lines['job_seconds_bucket{kind="x",le="+Inf"}'], 4)
+        self.assertEqual(lines['job_seconds_count{kind="x"}'], 4)
+
+    @override_settings(METRICS_QUERY_SAMPLE_RATE=1.0, METRICS_SLOW_REQUEST_SECONDS=0)
+    def test_sampled_slow_request_is_logged_with_queries(self):
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            self.client.post(f'/api/accounts/{self.account.pk}/withdraw/', {'amount': Decimal('1.00')}, format='json')
+
+        self.assertIn('account-withdraw', logs.output[0])
+        self.assertIn('UPDATE', logs.output[0])
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_token_protects_endpoint(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,106 @@
+# core/tests/test_partitions.py
+import csv
+import gzip
+import io
+import tempfile
+import unittest
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import services
+from ..models import Account, Transaction, TransactionArchive
+from ..services import partitions
+from .helpers import create_account
+
+
+class TransactionArchiveTests(APITestCase):
+    """
+    Test suite for reading transaction months archived out of the database.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('archiveuser')
+        _, self.other = create_account('otheruser')
+        Account.objects.update(created_at=datetime(2023, 12, 1, tzinfo=dt_timezone.utc))
+        services.deposit(self.account, Decimal('5.00'))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive_month(directory.name, date(2024, 1, 1), [
+            (1, self.account.pk, '2024-01-05 09:00:00+00', 'DEPOSIT', '100.00', '100.00', '100.00', r'\N'),
+            (2, self.other.pk, '2024-01-06 09:00:00+00', 'DEPOSIT', '7.00', '7.00', '7.00', r'\N'),
+            (3, self.account.pk, '2024-01-20 09:00:00+00', 'WITHDRAWAL', '30.00', '-30.00', '70.00', 'rent'),
+        ])
+
+    def archive_month(self, directory, month, rows):
+        """
+        Write an archive file in the layout COPY produces and register it.
+        """
+        path = f'{directory}/{month:%Y_%m}.csv.gz'
+        with gzip.open(path, 'wt', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow(partitions.ARCHIVE_COLUMNS)
+            writer.writerows(rows)
+        TransactionArchive.objects.create(month=month, path=path, row_count=len(rows), sha256='')
+
+    def test_export_includes_archived_months(self):
+        response = self.client.get('/api/transactions/export/', {'format': 'ndjson'})
+        rows = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(len(rows), 3)
+        self.assertIn('"timestamp": "2024-01-05T09:00:00+00:00"', rows[0])
+        self.assertIn('"description": null', rows[0])
+        self.assertIn('"signed_amount": "-30.00"', rows[1])
+        self.assertIn('"description": "rent"', rows[1])
+
+    def test_export_range_skips_archives(self):
+        response = self.client.get('/api/transactions/export/', {'from': '2024-01-10', 'to': '2024-01-31'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('3,'))
+
+    def test_balance_as_of_archived_month(self):
+        url = f'/api/accounts/{self.account.pk}/balance/'
+
+        response = self.client.get(url, {'as_of': '2024-01-10T00:00:00Z'})
+        self.assertEqual(response.data['balance'], Decimal('100.00'))
+
+        response = self.client.get(url, {'as_of': '2024-01-20T09:00:00Z'})
+        self.assertEqual(response.data['balance'], Decimal('70.00'))
+
+    def test_command_requires_partitioned_table(self):
+        if partitions.is_partitioned():
+            self.skipTest('The transaction table is partitioned on this database.')
+        with self.assertRaises(CommandError):
+            call_command('transaction_partitions', stdout=io.StringIO())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Partitioning requires PostgreSQL.')
+class TransactionPartitionTests(APITestCase):
+    """
+    Test suite for monthly partition maintenance on PostgreSQL.
+    """
+
+    def test_archive_drops_partition_and_keeps_rows_readable(self):
+        _, account = create_account('partitionuser')
+        services.deposit(account, Decimal('12.00'))
+        month = partitions.add_months(partitions.month_start(datetime.now(dt_timezone.utc)), -2)
+        partitions.create_partition(month)
+        Transaction.objects.filter(account=account).update(timestamp=partitions.month_bound(month))
+
+        with tempfile.TemporaryDirectory() as directory:
+            archive = partitions.archive_partition(month, directory)
+
+            self.assertEqual(archive.row_count, 1)
+            self.assertNotIn(month, partitions.partition_months())
+            self.assertFalse(Transaction.objects.filter(account=account).exists())
+            rows = list(partitions.archived_rows([account.pk]))
+            self.assertEqual([row[6] for row in rows], [Decimal('12.00')])
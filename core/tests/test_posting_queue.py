@@ -0,0 +1,136 @@
+# core/tests/test_posting_queue.py
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Account, QueuedPosting, Transaction, Transfer
+from ..services.posting_queue import enqueue_posting, process_postings
+from .helpers import create_account
+
+
+class PostingQueueTests(APITestCase):
+    """
+    Test suite for postings queued with Prefer: respond-async.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('queueuser', '10.00')
+        _, self.other = create_account('queueother', '0.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def post(self, action, data, **headers):
+        return self.client.post(
+            f'/api/accounts/{self.account.pk}/{action}/', data, format='json',
+            HTTP_PREFER='respond-async', **headers
+        )
+
+    def test_deposit_is_queued_and_applied_by_the_worker(self):
+        response = self.post('deposit', {'amount': '5.00'})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response['Location'], response.data['status_url'])
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('10.00'))
+        self.assertEqual(self.client.get(response['Location']).data['status'], 'PENDING')
+
+        call_command('process_postings', once=True, stdout=io.StringIO())
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('15.00'))
+        result = self.client.get(response['Location']).data
+        self.assertEqual((result['status'], result['balance_after']), ('APPLIED', '15.00'))
+        self.assertEqual(self.account.transactions.get().balance_after, Decimal('15.00'))
+
+    def test_postings_apply_in_order_with_funds_checks(self):
+        postings = [
+            enqueue_posting(self.account, 'WITHDRAWAL', Decimal('8.00')),
+            enqueue_posting(self.account, 'WITHDRAWAL', Decimal('5.00')),
+            enqueue_posting(self.account, 'DEPOSIT', Decimal('5.00')),
+            enqueue_posting(self.account, 'TRANSFER', Decimal('7.00'), self.other),
+            enqueue_posting(self.account, 'WITHDRAWAL', Decimal('0.01')),
+        ]
+
+        self.assertEqual(process_postings(), 5)
+
+        results = [
+            (posting.status, posting.error, posting.balance_after)
+            for posting in QueuedPosting.objects.filter(pk__in=[p.pk for p in postings]).order_by('id')
+        ]
+        self.assertEqual(results, [
+            ('APPLIED', '', Decimal('2.00')),
+            ('REJECTED', 'Insufficient funds.', None),
+            ('APPLIED', '', Decimal('7.00')),
+            ('APPLIED', '', Decimal('0.00')),
+            ('REJECTED', 'Insufficient funds.', None),
+        ])
+        self.assertEqual(
+            list(self.account.transactions.order_by('id').values_list('signed_amount', 'balance_after')),
+            [(Decimal('-8.00'), Decimal('2.00')), (Decimal('5.00'), Decimal('7.00')), (Decimal('-7.00'), Decimal('0.00'))]
+        )
+        self.assertEqual(Account.objects.get(pk=self.other.pk).balance, Decimal('7.00'))
+        self.assertEqual(Transfer.objects.get().legs.count(), 2)
+        self.assertEqual(process_postings(), 0)
+
+    def test_partitions_keep_the_order_of_transfers_they_share(self):
+        """
+        A withdrawal queued after a transfer that funds it waits for the
+        transfer's partition, even when its own partition runs first.
+        """
+        source, destination = self.account.pk % 2, self.other.pk % 2
+        self.assertNotEqual(source, destination)
+        transfer = enqueue_posting(self.account, 'TRANSFER', Decimal('7.00'), self.other)
+        withdrawal = enqueue_posting(self.other, 'WITHDRAWAL', Decimal('5.00'))
+
+        self.assertEqual(process_postings(partition=destination, partitions=2), 0)
+        self.assertEqual(QueuedPosting.objects.get(pk=withdrawal.pk).status, 'PENDING')
+        self.assertEqual(process_postings(partition=source, partitions=2), 1)
+        self.assertEqual(process_postings(partition=destination, partitions=2), 1)
+
+        statuses = QueuedPosting.objects.filter(pk__in=[transfer.pk, withdrawal.pk]).values_list('status', 'balance_after')
+        self.assertEqual(list(statuses.order_by('id')), [('APPLIED', Decimal('3.00')), ('APPLIED', Decimal('2.00'))])
+
+    def test_batch_cost_does_not_grow_with_its_size(self):
+        def queries_for(count):
+            for _ in range(count):
+                enqueue_posting(self.account, 'DEPOSIT', Decimal('1.00'))
+                enqueue_posting(self.account, 'TRANSFER', Decimal('1.00'), self.other)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(process_postings(), count * 2)
+            return len(queries)
+
+        self.assertEqual(queries_for(1), queries_for(20))
+        self.assertEqual(Transaction.objects.count(), 63)
+
+    def test_transfer_validation_happens_before_queueing(self):
+        response = self.post('transfer', {'to_account_number': 'ACC-000079927398713', 'amount': '1.00'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(QueuedPosting.objects.exists())
+
+    def test_idempotent_enqueue(self):
+        first = self.post('withdraw', {'amount': '1.00'}, HTTP_IDEMPOTENCY_KEY='queued')
+        second = self.post('withdraw', {'amount': '1.00'}, HTTP_IDEMPOTENCY_KEY='queued')
+
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(first.data['posting'], second.data['posting'])
+        self.assertEqual(QueuedPosting.objects.count(), 1)
+
+    def test_status_is_scoped_to_owner(self):
+        posting = enqueue_posting(self.other, 'DEPOSIT', Decimal('1.00'))
+
+        response = self.client.get(f'/api/postings/{posting.pk}/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_without_preference_postings_stay_synchronous(self):
+        response = self.client.post(f'/api/accounts/{self.account.pk}/deposit/', {'amount': '1.00'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(QueuedPosting.objects.exists())
@@ -0,0 +1,92 @@
+# core/tests/test_postings.py
+import threading
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TransactionTestCase, skipUnlessDBFeature
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Account, Transaction
+from .. import services
+from .helpers import create_account
+
+
+class PostingTests(APITestCase):
+    """
+    Test suite for the deposit and withdraw actions.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('postinguser', '100.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def test_deposit_returns_new_balance(self):
+        """
+        Ensure a deposit updates the balance and records a ledger entry.
+        """
+        url = f'/api/accounts/{self.account.pk}/deposit/'
+        response = self.client.post(url, {'amount': '50.25'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['new_balance']), Decimal('150.25'))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('150.25'))
+        self.assertEqual(Transaction.objects.filter(account=self.account).count(), 1)
+
+    def test_withdraw_insufficient_funds(self):
+        """
+        Ensure a withdrawal larger than the balance is rejected without side effects.
+        """
+        url = f'/api/accounts/{self.account.pk}/withdraw/'
+        response = self.client.post(url, {'amount': '100.01'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('100.00'))
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_stale_instances_do_not_lose_updates(self):
+        """
+        Ensure postings made through stale copies of an account all land.
+        """
+        first = Account.objects.get(pk=self.account.pk)
+        second = Account.objects.get(pk=self.account.pk)
+
+        services.deposit(first, Decimal('10.00'))
+        services.deposit(second, Decimal('20.00'))
+        services.withdraw(first, Decimal('5.00'))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('125.00'))
+
+
+class ConcurrentPostingTests(TransactionTestCase):
+    """
+    Hammer a single account from several threads and check nothing is lost.
+    """
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_concurrent_deposits_and_withdrawals(self):
+        _, account = create_account('concurrentuser', '0.00')
+        workers, rounds = 8, 25
+
+        def run():
+            try:
+                for _ in range(rounds):
+                    services.deposit(Account.objects.get(pk=account.pk), Decimal('2.00'))
+                    services.withdraw(Account.objects.get(pk=account.pk), Decimal('1.00'))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        account.refresh_from_db()
+        self.assertEqual(account.balance, Decimal(workers * rounds))
+        self.assertEqual(Transaction.objects.filter(account=account).count(), workers * rounds * 2)
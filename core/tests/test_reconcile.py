@@ -0,0 +1,94 @@
+# core/tests/test_reconcile.py
+import io
+import json
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from .. import services
+from ..models import Account, Transaction
+from ..services.balances import set_balance_slots
+from ..services.reconciliation import reconcile_range
+from .helpers import create_account
+
+
+class ReconcileTests(TestCase):
+    """
+    Test suite for the reconcile command checking balances against the ledger.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.report = os.path.join(self.directory, 'reconcile.ndjson')
+        _, self.account = create_account('reconcileuser', '100.00')
+        _, self.other = create_account('reconcileother', '0.00')
+        services.deposit(self.account, Decimal('20.00'))
+        services.withdraw(self.account, Decimal('5.00'))
+        services.transfer(self.account, self.other, Decimal('15.00'))
+
+    def reconcile(self, **options):
+        options.setdefault('workers', 0)
+        call_command('reconcile', self.report, stdout=io.StringIO(), **options)
+
+    def read_report(self):
+        with open(self.report) as report:
+            return [json.loads(line) for line in report]
+
+    def test_consistent_ledger_reports_nothing(self):
+        self.reconcile(range_size=1)
+
+        self.assertEqual(self.read_report(), [])
+        with open(self.report + '.checkpoint') as checkpoint:
+            state = json.load(checkpoint)
+        self.assertEqual((state['accounts'], state['rows'], state['discrepancies']), (2, 4, 0))
+
+    def test_balance_drift_is_reported(self):
+        Account.objects.filter(pk=self.other.pk).update(balance=Decimal('16.00'))
+
+        with self.assertRaises(CommandError):
+            self.reconcile()
+
+        self.assertEqual(self.read_report(), [{
+            'account': self.other.pk, 'account_number': self.other.account_number,
+            'check': 'balance', 'expected': '15.00', 'actual': '16.00',
+        }])
+
+    def test_edited_ledger_row_is_reported(self):
+        Transaction.objects.filter(account=self.account, transaction_type='WITHDRAWAL').update(
+            signed_amount=Decimal('-6.00')
+        )
+
+        accounts, rows, discrepancies = reconcile_range(self.account.pk, self.account.pk + 1)
+
+        self.assertEqual((accounts, rows), (1, 3))
+        self.assertEqual(
+            [(d['check'], d['expected'], d['actual']) for d in discrepancies],
+            [('ledger', '99.00', '100.00'), ('balance', '99.00', '100.00')]
+        )
+
+    def test_slot_balances_count(self):
+        set_balance_slots(self.other.pk, 4)
+        for _ in range(3):
+            services.deposit(Account.objects.get(pk=self.other.pk), Decimal('2.00'))
+
+        self.assertEqual(reconcile_range(self.other.pk, self.other.pk + 1)[2], [])
+
+    def test_resume_skips_checked_ranges(self):
+        self.reconcile(range_size=1)
+        Account.objects.filter(pk=self.account.pk).update(balance=Decimal('0.00'))
+
+        self.reconcile(range_size=1)
+        self.assertEqual(self.read_report(), [])
+
+        with self.assertRaisesMessage(CommandError, '--range-size'):
+            self.reconcile(range_size=2)
+
+        with self.assertRaises(CommandError):
+            self.reconcile(range_size=2, restart=True)
+        self.assertEqual([d['account'] for d in self.read_report()], [self.account.pk])
@@ -0,0 +1,102 @@
+# core/tests/test_rollups.py
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import services
+from ..models import MonthlyRollup, Transaction
+from ..services.rollups import aggregate_ledger
+from .helpers import create_account
+
+
+def rollup_rows(account):
+    return sorted(
+        MonthlyRollup.objects.filter(account=account).values_list(
+            'month', 'transaction_type', 'credit_count', 'credit_total', 'debit_count', 'debit_total'
+        )
+    )
+
+
+class MonthlyRollupTests(APITestCase):
+    """
+    Test suite for the incremental monthly rollups and the summary endpoint.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('rollupuser', '100.00')
+        _, self.other = create_account('rollupother', '50.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = f'/api/accounts/{self.account.pk}/summary/'
+
+    def test_postings_update_rollups(self):
+        """
+        Ensure every kind of posting leaves the rollups equal to a recount of the ledger.
+        """
+        services.deposit(self.account, Decimal('10.00'))
+        services.deposit(self.account, Decimal('2.50'))
+        services.withdraw(self.account, Decimal('4.00'))
+        services.transfer(self.account, self.other, Decimal('6.00'))
+        services.transfer(self.other, self.account, Decimal('1.00'))
+        services.batch_transfer(
+            self.account, [{'to_account_number': self.other.account_number, 'amount': Decimal('3.00')}],
+            services.BEST_EFFORT
+        )
+
+        for account in (self.account, self.other):
+            expected = sorted(
+                (r.month, r.transaction_type, r.credit_count, r.credit_total, r.debit_count, r.debit_total)
+                for r in aggregate_ledger(Transaction.objects.filter(account=account))
+            )
+            self.assertEqual(rollup_rows(account), expected)
+
+        deposits = MonthlyRollup.objects.get(account=self.account, transaction_type='DEPOSIT')
+        self.assertEqual((deposits.credit_count, deposits.credit_total), (2, Decimal('12.50')))
+
+    def test_summary_endpoint(self):
+        services.deposit(self.account, Decimal('10.00'))
+        services.withdraw(self.account, Decimal('4.00'))
+        MonthlyRollup.objects.create(
+            account=self.account, month=date(2024, 3, 1), transaction_type='DEPOSIT',
+            credit_count=3, credit_total=Decimal('30.00')
+        )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['months'][0]['month'], '2024-03')
+        self.assertEqual(len(response.data['months']), 3)
+        self.assertEqual(response.data['credit_total'], '40.00')
+        self.assertEqual(response.data['debit_total'], '4.00')
+        self.assertEqual(response.data['net'], '36.00')
+
+        response = self.client.get(self.url, {'from': '2024-01', 'to': '2024-03'})
+        self.assertEqual(len(response.data['months']), 1)
+        self.assertEqual(response.data['credit_count'], 3)
+
+    def test_summary_rejects_invalid_month(self):
+        for params in ({'from': 'March'}, {'from': '2025-13'}, {'to': '2025-02-30'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), response.data)
+
+    def test_summary_is_scoped_to_owner(self):
+        response = self.client.get(f'/api/accounts/{self.other.pk}/summary/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rebuild_command(self):
+        services.deposit(self.account, Decimal('10.00'))
+        services.withdraw(self.account, Decimal('4.00'))
+        expected = rollup_rows(self.account)
+        MonthlyRollup.objects.filter(account=self.account).update(credit_count=99)
+
+        call_command('rebuild_rollups', account=[self.account.pk], stdout=io.StringIO())
+
+        self.assertEqual(rollup_rows(self.account), expected)
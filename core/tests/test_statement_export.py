@@ -0,0 +1,105 @@
+# core/tests/test_statement_export.py
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Transaction, TransactionArchive
+from .. import services
+from ..services.partitions import ARCHIVE_COLUMNS, ARCHIVE_NULL
+from .helpers import create_account
+
+
+class StatementExportTests(APITestCase):
+    """
+    Test suite for the streaming statement export.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('statementuser')
+        services.deposit(self.account, Decimal('100.00'))
+        services.withdraw(self.account, Decimal('40.50'))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = '/api/transactions/export/'
+
+    def content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        """
+        Ensure the default export is a CSV statement, oldest first.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual([row['signed_amount'] for row in rows], ['100.00', '-40.50'])
+        self.assertEqual(rows[-1]['balance_after'], '59.50')
+
+    def test_ndjson_export_with_date_range(self):
+        """
+        Ensure ?format=ndjson streams one JSON object per line within the range.
+        """
+        withdrawal = Transaction.objects.get(transaction_type='WITHDRAWAL')
+        response = self.client.get(self.url, {
+            'format': 'ndjson',
+            'account': self.account.pk,
+            'from': withdrawal.timestamp.isoformat(),
+            'to': (withdrawal.timestamp + timedelta(seconds=1)).isoformat(),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = self.content(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['id'], withdrawal.pk)
+
+    def test_invalid_date_is_rejected(self):
+        for params in ({'from': 'last week'}, {'to': '2025-02-30'}, {'from': '2025-02-30T10:00:00'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archived_rows_are_filtered_by_counterparty_and_transfer(self):
+        """
+        Ensure ?counterparty= and ?transfer= apply to archived months too.
+        """
+        _, other = create_account('statementother')
+        _, third = create_account('statementthird')
+        archived = [
+            (1, ARCHIVE_NULL, ARCHIVE_NULL, 'DEPOSIT', '50.00', '50.00', '50.00', 'CREDIT'),
+            (2, other.pk, 901, 'TRANSFER', '10.00', '-10.00', '40.00', 'DEBIT'),
+            (3, third.pk, 902, 'TRANSFER', '5.00', '-5.00', '35.00', 'DEBIT'),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, '2020_01.csv.gz')
+            with gzip.open(path, 'wt', newline='') as out:
+                writer = csv.writer(out)
+                writer.writerow(ARCHIVE_COLUMNS)
+                for pk, counterparty, transfer, kind, amount, signed, balance, direction in archived:
+                    writer.writerow([
+                        pk, self.account.pk, f'2020-01-0{pk}T12:00:00+00:00', kind, amount, signed,
+                        balance, ARCHIVE_NULL, direction, counterparty, transfer,
+                    ])
+            TransactionArchive.objects.create(month=date(2020, 1, 1), path=path, row_count=3, sha256='')
+
+            for params, expected in (
+                ({'counterparty': other.pk}, [2]),
+                ({'transfer': 902}, [3]),
+                ({'counterparty': other.pk, 'transfer': 902}, []),
+            ):
+                with self.subTest(params=params):
+                    response = self.client.get(self.url, {'format': 'ndjson', 'to': '2020-02-01', **params})
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    lines = self.content(response).splitlines()
+                    self.assertEqual([json.loads(line)['id'] for line in lines], expected)
@@ -0,0 +1,110 @@
+# core/tests/test_throttling.py
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..middleware import ConcurrencyLimitMiddleware
+from .helpers import create_account
+
+RATES = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'reads': '2/min', 'postings': '1/min'}}
+
+
+@override_settings(REST_FRAMEWORK=RATES)
+class ThrottlingTests(APITestCase):
+    """
+    Test suite for the per-user token-bucket rate limits.
+    """
+
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.user, self.account = create_account('throttleuser', '10.00')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = f'/api/accounts/{self.account.pk}/'
+
+    def test_reads_beyond_the_bucket_are_refused(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '30')
+
+    def test_postings_have_their_own_bucket(self):
+        deposit = f'{self.url}deposit/'
+        self.assertEqual(self.client.post(deposit, {'amount': '1.00'}).status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.post(deposit, {'amount': '1.00'}).status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(self.client.get(self.url).data['balance'], '11.00')
+
+    def test_buckets_are_per_user(self):
+        other, _ = create_account('throttleother')
+        for _ in range(3):
+            self.client.get(self.url)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=other).key)
+        self.assertEqual(self.client.get('/api/accounts/').status_code, status.HTTP_200_OK)
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            for _ in range(2):
+                self.client.get(self.url)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        with mock.patch('core.throttling.time.time', return_value=1030.0):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    async def test_async_reads_share_the_bucket(self):
+        headers = {'Authorization': 'Token ' + self.token.key}
+        for _ in range(2):
+            response = await self.async_client.get('/api/async/accounts/', headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = await self.async_client.get(self.url, headers=headers)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class ConcurrencyLimitTests(APITestCase):
+    """
+    Test suite for the in-flight request caps.
+    """
+
+    def nested(self, outer, inner):
+        """
+        Run the ``inner`` request while the ``outer`` one is in progress and
+        return the inner response.
+        """
+        factory = RequestFactory()
+        responses = []
+
+        def view(request):
+            if request.path == '/outer/':
+                responses.append(middleware(getattr(factory, inner)('/inner/')))
+            return HttpResponse()
+
+        middleware = ConcurrencyLimitMiddleware(view)
+        self.assertEqual(middleware(getattr(factory, outer)('/outer/')).status_code, status.HTTP_200_OK)
+        self.assertEqual((middleware.requests, middleware.postings), (0, 0))
+        return responses[0]
+
+    @override_settings(MAX_CONCURRENT_REQUESTS=1, MAX_CONCURRENT_POSTINGS=0, CONCURRENCY_RETRY_AFTER=2)
+    def test_requests_over_the_cap_are_shed(self):
+        response = self.nested('get', 'get')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '2')
+
+    @override_settings(MAX_CONCURRENT_REQUESTS=0, MAX_CONCURRENT_POSTINGS=1)
+    def test_posting_cap_leaves_reads_alone(self):
+        self.assertEqual(self.nested('post', 'get').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.nested('get', 'post').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.nested('post', 'post').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,60 @@
+# core/tests/test_transaction_history.py
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Account, Transaction
+from .. import services
+from .helpers import create_account
+
+
+class TransactionHistoryTests(APITestCase):
+    """
+    Test suite for the paginated transaction history.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('historyuser')
+        self.savings = Account.objects.create(owner=self.account.owner, account_type='SAVINGS')
+        for amount in range(1, 6):
+            services.deposit(self.account, Decimal(amount))
+        services.deposit(self.savings, Decimal('100.00'))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def test_pages_follow_cursor_newest_first(self):
+        """
+        Ensure walking the cursor returns every row once, newest first.
+        """
+        url = '/api/transactions/?page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+
+        expected = list(Transaction.objects.order_by('-timestamp', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_filter_by_account(self):
+        """
+        Ensure ?account= restricts the history to a single account.
+        """
+        response = self.client.get(f'/api/transactions/?account={self.savings.pk}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['account'], self.savings.pk)
+
+    def test_filter_rejects_invalid_account(self):
+        response = self.client.get('/api/transactions/?account=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_rejects_dates_that_do_not_exist(self):
+        response = self.client.get('/api/transactions/', {'from': '2025-02-30'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('from', response.data)
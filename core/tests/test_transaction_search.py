@@ -0,0 +1,111 @@
+# core/tests/test_transaction_search.py
+import re
+from decimal import Decimal
+from itertools import product
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import services
+from .helpers import create_account
+
+FILTERS = {
+    'type': 'DEPOSIT',
+    'min_amount': '2.00',
+    'max_amount': '50.00',
+    'search': 'rent',
+    'from': '2000-01-01',
+    'to': '2999-12-31',
+}
+
+
+class TransactionSearchTests(APITestCase):
+    """
+    Test suite for the transaction history search parameters.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('searchuser', '100.00')
+        _, self.other = create_account('searchother')
+        services.deposit(self.account, Decimal('1.00'))
+        services.deposit(self.account, Decimal('25.00'))
+        services.withdraw(self.account, Decimal('40.00'))
+        services.transfer(self.account, self.other, Decimal('60.00'))
+        ledger = self.account.transactions
+        ledger.filter(amount=Decimal('25.00')).update(description='Rent for March')
+        ledger.filter(amount=Decimal('40.00')).update(description='RENTAL car')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def amounts(self, **params):
+        response = self.client.get('/api/transactions/', {'account': self.account.pk, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(row['amount'] for row in response.data['results'])
+
+    def test_filters(self):
+        self.assertEqual(self.amounts(type='DEPOSIT'), ['1.00', '25.00'])
+        self.assertEqual(self.amounts(min_amount='25', max_amount='40'), ['25.00', '40.00'])
+        self.assertEqual(self.amounts(search='rent'), ['25.00', '40.00'])
+        self.assertEqual(self.amounts(search='rent', type='WITHDRAWAL'), ['40.00'])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in (
+            {'type': 'REFUND'}, {'min_amount': 'ten'}, {'max_amount': 'NaN'}, {'min_amount': '1e999999999'},
+            {'max_amount': '12345678901.00'}, {'min_amount': '0.001'}, {'search': 'ab'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get('/api/transactions/', params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), response.data)
+
+    def test_export_applies_the_filters(self):
+        response = self.client.get('/api/transactions/export/', {'format': 'ndjson', 'search': 'rent', 'max_amount': '30'})
+
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(rows), 1)
+        self.assertIn('Rent for March', rows[0])
+
+    # Sends one request per combination; rate limits are not under test here.
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}})
+    def test_every_filter_combination_uses_an_index(self):
+        """
+        EXPLAIN the history query for each combination of filters, with and
+        without ?account=, and check the ledger is never scanned in full. Each
+        account's rows must also be read in page order, (timestamp, id), so
+        one account's history is never sorted before its first page.
+        """
+        names = list(FILTERS)
+        for account, *chosen in product((False, True), *[(False, True)] * len(names)):
+            params = {name: FILTERS[name] for name, on in zip(names, chosen) if on}
+            if account:
+                params['account'] = self.account.pk
+            keyset = account and set(params) <= {'account', 'from', 'to'}
+            with self.subTest(params=params):
+                plan = self.explain_history(params)
+                if connection.vendor == 'postgresql':
+                    self.assertNotRegex(plan, r'Seq Scan on core_transaction')
+                    if keyset:
+                        self.assertNotIn('Sort', plan)
+                else:
+                    for line in re.findall(r'^.*\bcore_transaction\b.*$', plan, re.MULTILINE):
+                        self.assertRegex(line, r'^SEARCH core_transaction USING INDEX core_txn_account_(ts|type)_idx')
+                    if account:
+                        self.assertNotIn('TEMP B-TREE', plan)
+
+    def explain_history(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/transactions/', params).status_code, status.HTTP_200_OK)
+        sql = next(query['sql'] for query in queries if query['sql'].startswith('SELECT') and 'core_transaction' in query['sql'])
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables are cheapest to scan; ask whether an index can serve the query.
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('EXPLAIN ' + sql)
+            else:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
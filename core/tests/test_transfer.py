@@ -0,0 +1,137 @@
+# core/tests/test_transfer.py
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Account, Transaction
+from .. import services
+from ..services.retry import run_with_retry
+from .helpers import create_account
+
+
+class TransferTests(APITestCase):
+    """
+    Test suite for the transfer action.
+    """
+
+    def setUp(self):
+        self.user, self.source = create_account('transferuser', '100.00')
+        _, self.destination = create_account('payee', '5.00')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = f'/api/accounts/{self.source.pk}/transfer/'
+
+    def test_transfer_moves_funds(self):
+        """
+        Ensure both legs and both ledger entries are written.
+        """
+        data = {'to_account_number': self.destination.account_number, 'amount': '40.00'}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['from_account_balance']), Decimal('60.00'))
+        self.destination.refresh_from_db()
+        self.assertEqual(self.destination.balance, Decimal('45.00'))
+        self.assertEqual(Transaction.objects.filter(transaction_type='TRANSFER').count(), 2)
+
+    def test_mistyped_account_number_is_rejected(self):
+        """
+        Ensure a number with a wrong check digit is a 400, not a missing account.
+        """
+        number = self.destination.account_number
+        mistyped = number[:-1] + str((int(number[-1]) + 1) % 10)
+        response = self.client.post(self.url, {'to_account_number': mistyped, 'amount': '1.00'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('to_account_number', response.data)
+
+    def test_legacy_account_number_is_accepted(self):
+        Account.objects.filter(pk=self.destination.pk).update(account_number='ACC-1760659200123')
+
+        data = {'to_account_number': 'ACC-1760659200123', 'amount': '1.00'}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_transfer_insufficient_funds(self):
+        """
+        Ensure an overdrawing transfer leaves both accounts untouched.
+        """
+        data = {'to_account_number': self.destination.account_number, 'amount': '100.01'}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.source.refresh_from_db()
+        self.destination.refresh_from_db()
+        self.assertEqual(self.source.balance, Decimal('100.00'))
+        self.assertEqual(self.destination.balance, Decimal('5.00'))
+        self.assertFalse(Transaction.objects.exists())
+
+
+@override_settings(POSTING_RETRY_ATTEMPTS=3, POSTING_RETRY_BASE_DELAY=0)
+class RetryTests(SimpleTestCase):
+    """
+    Test suite for the deadlock retry helper.
+    """
+
+    def deadlock(self):
+        cause = Exception('deadlock detected')
+        cause.pgcode = '40P01'
+        exc = OperationalError('deadlock detected')
+        exc.__cause__ = cause
+        return exc
+
+    def test_retries_deadlocks_until_success(self):
+        func = mock.Mock(side_effect=[self.deadlock(), self.deadlock(), 'ok'])
+        self.assertEqual(run_with_retry(func, 'test'), 'ok')
+        self.assertEqual(func.call_count, 3)
+
+    def test_gives_up_after_max_attempts(self):
+        func = mock.Mock(side_effect=[self.deadlock()] * 3)
+        with self.assertRaises(OperationalError):
+            run_with_retry(func, 'test')
+        self.assertEqual(func.call_count, 3)
+
+    def test_other_errors_are_not_retried(self):
+        func = mock.Mock(side_effect=OperationalError('no such table'))
+        with self.assertRaises(OperationalError):
+            run_with_retry(func, 'test')
+        self.assertEqual(func.call_count, 1)
+
+
+class ConcurrentTransferTests(TransactionTestCase):
+    """
+    Run opposite transfers between two accounts at the same time.
+    """
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_opposite_transfers_do_not_deadlock(self):
+        _, first = create_account('first', '1000.00')
+        _, second = create_account('second', '1000.00')
+        rounds = 50
+
+        def run(source, destination):
+            try:
+                for _ in range(rounds):
+                    services.transfer(source, destination, Decimal('1.00'))
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=run, args=(first, second)),
+            threading.Thread(target=run, args=(second, first)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        balances = Account.objects.filter(pk__in=[first.pk, second.pk]).values_list('balance', flat=True)
+        self.assertEqual(sorted(balances), [Decimal('1000.00'), Decimal('1000.00')])
+        self.assertEqual(Transaction.objects.count(), rounds * 4)
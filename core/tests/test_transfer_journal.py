@@ -0,0 +1,109 @@
+# core/tests/test_transfer_journal.py
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.db import connection
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .. import services
+from ..models import Account, Transaction, Transfer
+from .helpers import create_account
+
+journal_migration = import_module('core.migrations.0011_transfer_journal')
+
+
+class TransferJournalTests(APITestCase):
+    """
+    Test suite for the transfer journal linking both legs of a transfer.
+    """
+
+    def setUp(self):
+        self.user, self.account = create_account('journaluser', '100.00')
+        _, self.other = create_account('journalother', '50.00')
+        self.second = Account.objects.create(owner=self.account.owner, balance=Decimal('0.00'))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def test_transfer_links_both_legs(self):
+        services.transfer(self.account, self.other, Decimal('30.00'))
+
+        journal = Transfer.objects.get()
+        self.assertEqual(
+            (journal.from_account_id, journal.to_account_id, journal.amount),
+            (self.account.pk, self.other.pk, Decimal('30.00'))
+        )
+        debit, credit = journal.legs.order_by('id')
+        self.assertEqual((debit.account_id, debit.counterparty_id, debit.direction), (self.account.pk, self.other.pk, 'DEBIT'))
+        self.assertEqual((credit.account_id, credit.counterparty_id, credit.direction), (self.other.pk, self.account.pk, 'CREDIT'))
+
+    def test_batch_transfer_creates_one_journal_entry_per_item(self):
+        services.batch_transfer(self.account, [
+            {'to_account_number': self.other.account_number, 'amount': Decimal('10.00')},
+            {'to_account_number': 'ACC-MISSING', 'amount': Decimal('1.00')},
+            {'to_account_number': self.second.account_number, 'amount': Decimal('20.00')},
+        ], services.BEST_EFFORT)
+
+        journals = Transfer.objects.order_by('id')
+        self.assertEqual([j.to_account_id for j in journals], [self.other.pk, self.second.pk])
+        for journal in journals:
+            self.assertEqual(
+                sorted(journal.legs.values_list('account_id', 'counterparty_id', 'signed_amount')),
+                sorted([
+                    (self.account.pk, journal.to_account_id, -journal.amount),
+                    (journal.to_account_id, self.account.pk, journal.amount),
+                ])
+            )
+
+    def test_postings_have_a_direction_and_no_transfer(self):
+        services.deposit(self.account, Decimal('5.00'))
+        services.withdraw(self.account, Decimal('2.00'))
+
+        self.assertEqual(
+            list(Transaction.objects.order_by('id').values_list('direction', 'transfer', 'counterparty')),
+            [('CREDIT', None, None), ('DEBIT', None, None)]
+        )
+
+    def test_list_filters_by_counterparty_and_transfer(self):
+        services.transfer(self.account, self.other, Decimal('1.00'))
+        services.transfer(self.account, self.second, Decimal('2.00'))
+        services.deposit(self.account, Decimal('3.00'))
+        journal = Transfer.objects.get(to_account=self.second)
+
+        response = self.client.get('/api/transactions/', {'account': self.account.pk, 'counterparty': self.other.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['signed_amount'] for row in response.data['results']], ['-1.00'])
+
+        response = self.client.get('/api/transactions/', {'transfer': journal.pk})
+        self.assertEqual(
+            sorted(row['account'] for row in response.data['results']), [self.account.pk, self.second.pk]
+        )
+        self.assertEqual({row['transfer'] for row in response.data['results']}, {journal.pk})
+
+        response = self.client.get('/api/transactions/', {'counterparty': 'other'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_migration_pairs_existing_legs(self):
+        services.transfer(self.account, self.other, Decimal('5.00'))
+        services.transfer(self.other, self.account, Decimal('5.00'))
+        services.batch_transfer(self.account, [
+            {'to_account_number': self.other.account_number, 'amount': Decimal('5.00')},
+            {'to_account_number': self.second.account_number, 'amount': Decimal('7.00')},
+        ])
+        services.deposit(self.account, Decimal('1.00'))
+        expected = sorted(
+            Transaction.objects.values_list('id', 'counterparty_id', 'transfer__from_account', 'transfer__to_account')
+        )
+        Transaction.objects.update(transfer=None, counterparty=None)
+        Transfer.objects.all().delete()
+
+        journal_migration.backfill_transfers(apps, connection.schema_editor())
+
+        self.assertEqual(Transfer.objects.count(), 4)
+        self.assertEqual(sorted(
+            Transaction.objects.values_list('id', 'counterparty_id', 'transfer__from_account', 'transfer__to_account')
+        ), expected)
+        for journal in Transfer.objects.all():
+            self.assertEqual(journal.legs.count(), 2)
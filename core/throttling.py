@@ -0,0 +1,126 @@
+# core/throttling.py
+"""
+Token-bucket rate limits per user, with separate buckets for reads (safe
+methods) and postings (everything else).
+
+A rate such as ``120/min`` in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] means
+a bucket of 120 tokens refilled at 2 per second: bursts up to the full
+bucket are allowed, sustained traffic is held to the rate. A scope without a
+rate is not limited.
+
+Buckets live in the THROTTLE_CACHE_ALIAS cache, so a check costs no database
+round trip. The default is a per-process LocMemCache, which limits each
+worker on its own; point the alias at a shared backend (Redis, Memcached) for
+limits across workers. The read-then-write of a bucket is not atomic, so
+concurrent requests of one user can occasionally both take the last token.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def _cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def scope_for(method):
+    return 'reads' if method in SAFE_METHODS else 'postings'
+
+
+def parse_rate(rate):
+    """
+    Turn ``'<requests>/<period>'`` into (bucket size, tokens per second).
+    The period is s, m, h or d, or any word starting with one of them.
+    """
+    requests, period = rate.split('/')
+    capacity = int(requests)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def _bucket(scope, ident):
+    """
+    Return (cache key, bucket size, refill rate) for a scope, or None if the
+    scope is not limited.
+    """
+    rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+    if not rate:
+        return None
+    capacity, refill = parse_rate(rate)
+    return f'throttle:{scope}:{ident}', capacity, refill
+
+
+def _take(state, capacity, refill, now):
+    """
+    Refill the bucket for the time elapsed and take a token from it.
+    Returns the new state, or the seconds to wait for the next token.
+    """
+    tokens, stamp = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - stamp) * refill)
+    if tokens < 1:
+        return None, (1 - tokens) / refill
+    return (tokens - 1, now), None
+
+
+def consume(scope, ident):
+    """
+    Take a token from ``ident``'s bucket for ``scope``. Returns None if the
+    request may go ahead, or the number of seconds until it could.
+    """
+    bucket = _bucket(scope, ident)
+    if bucket is None:
+        return None
+    key, capacity, refill = bucket
+    state, wait = _take(_cache().get(key), capacity, refill, time.time())
+    if wait is not None:
+        metrics.increment('throttled_requests_total', scope=scope)
+        return wait
+    # Untouched for this long, a bucket is full again and can be forgotten.
+    _cache().set(key, state, timeout=math.ceil(capacity / refill) + 1)
+    return None
+
+
+async def aconsume(scope, ident):
+    """
+    consume() for async views.
+    """
+    bucket = _bucket(scope, ident)
+    if bucket is None:
+        return None
+    key, capacity, refill = bucket
+    state, wait = _take(await _cache().aget(key), capacity, refill, time.time())
+    if wait is not None:
+        metrics.increment('throttled_requests_total', scope=scope)
+        return wait
+    await _cache().aset(key, state, timeout=math.ceil(capacity / refill) + 1)
+    return None
+
+
+def throttled_detail(wait):
+    # The message DRF uses for throttled requests.
+    return f'Request was throttled. Expected available in {math.ceil(wait)} seconds.'
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle applying the ``reads`` or ``postings`` bucket of the
+    authenticated user, or of the client address for anonymous requests.
+    """
+
+    def allow_request(self, request, view):
+        user = request.user
+        ident = f'user-{user.pk}' if user and user.is_authenticated else f'ip-{self.get_ident(request)}'
+        self.delay = consume(scope_for(request.method), ident)
+        return self.delay is None
+
+    def wait(self):
+        return self.delay
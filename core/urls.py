@@ -1,12 +1,22 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CustomerViewSet, AccountViewSet, TransactionViewSet
+from .views import CustomerViewSet, AccountViewSet, TransactionViewSet, PostingViewSet, async_api
 
 router = DefaultRouter()
 router.register(r'customers', CustomerViewSet, basename='customer')
 router.register(r'accounts', AccountViewSet, basename='account')
 router.register(r'transactions', TransactionViewSet, basename='transaction')
+router.register(r'postings', PostingViewSet, basename='posting')
+
+# Async-native read endpoints, for use under an ASGI server.
+async_urlpatterns = [
+    path('accounts/', async_api.account_list, name='async-account-list'),
+    path('accounts/<int:pk>/', async_api.account_detail, name='async-account-detail'),
+    path('customer/', async_api.customer_profile, name='async-customer'),
+    path('transactions/', async_api.transaction_list, name='async-transaction-list'),
+]
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+    path('async/', include(async_urlpatterns)),
+]
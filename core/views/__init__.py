@@ -1,4 +1,7 @@
 from .customer import CustomerViewSet
 from .account import AccountViewSet
 from .transaction import TransactionViewSet
-from .registration import RegistrationView
\ No newline at end of file
+from .posting import PostingViewSet
+from .registration import RegistrationView
+from .metrics import prometheus_metrics
+from . import async_api
@@ -1,17 +1,99 @@
+import hashlib
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date, quote_etag
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db import transaction
+from rest_framework.reverse import reverse
 
-from ..models import Account, Transaction
+from ..authentication import get_customer_id
+from ..idempotency import idempotent
+from ..models import Account
 from ..serializers import (
-    AccountSerializer, TransactionSerializer, DepositSerializer,
-    WithdrawalSerializer, TransferSerializer
+    AccountSerializer, DepositSerializer, MonthlyRollupSerializer,
+    WithdrawalSerializer, TransferSerializer, BatchTransferSerializer
 )
+from .. import services
+from ..services.cache import account_list_key, invalidate_account_lists
+from ..services.partitions import archived_balance, month_start
+from ..services.posting_queue import enqueue_posting
+
+
+def conditional_headers(request, fingerprint, last_modified):
+    """
+    Build the ETag/Last-Modified headers for a resource and return them with a
+    304 response if the client's copy is still current, else with None.
+
+    ``fingerprint`` must change whenever the representation does. HTTP dates
+    only have one-second resolution, so If-Modified-Since is checked against
+    the *next* whole second: a second write within the same second can never
+    be answered with a 304.
+    """
+    etag = quote_etag(hashlib.sha1(fingerprint.encode()).hexdigest())
+    headers = {'ETag': etag}
+    newest = None
+    if last_modified is not None:
+        timestamp = last_modified.timestamp()
+        headers['Last-Modified'] = http_date(math.floor(timestamp))
+        newest = math.ceil(timestamp)
+
+    response = get_conditional_response(request, etag=etag, last_modified=newest)
+    if response is not None:
+        for name, value in headers.items():
+            response[name] = value
+    return headers, response
+
+def prefers_async(request):
+    """
+    Whether the client sent ``Prefer: respond-async`` (RFC 7240).
+    """
+    preferences = request.headers.get('Prefer', '')
+    return any(part.split(';')[0].strip().lower() == 'respond-async' for part in preferences.split(','))
+
+
+def queued_response(request, posting):
+    """
+    The 202 answer to a posting queued for the worker, pointing at its status.
+    """
+    url = reverse('posting-detail', args=[posting.pk], request=request)
+    return Response(
+        {'status': 'posting queued', 'posting': posting.pk, 'status_url': url},
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': url, 'Preference-Applied': 'respond-async'}
+    )
+
+
+def parse_month(value, name):
+    """
+    Parse a ``YYYY-MM`` or ISO 8601 date query parameter into the first day
+    of its month.
+    """
+    try:
+        day = parse_date(f'{value}-01' if len(value) == 7 else value)
+    except ValueError:
+        # Well formed, but not a real month or day, e.g. 2025-13.
+        day = None
+    if day is None:
+        raise ValidationError({name: 'A month as YYYY-MM or an ISO 8601 date is required.'})
+    return month_start(day)
+
 
 class AccountViewSet(viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Account instances.
+
+    Deposits, withdrawals and transfers sent with ``Prefer: respond-async``
+    are queued for the process_postings worker and answered with 202 and
+    the URL of their status instead of being applied on the request.
     """
     serializer_class = AccountSerializer
 
@@ -20,8 +102,53 @@ class AccountViewSet(viewsets.ModelViewSet):
         This view should return a list of all the accounts
         for the currently authenticated user's customer profile.
         """
-        user = self.request.user
-        return Account.objects.filter(owner__user=user)
+        return Account.objects.filter(owner_id=get_customer_id(self.request.user)).with_slot_totals()
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the user's accounts with an ETag validator.
+
+        One query reads the state of every account and balance slot: unchanged
+        lists get a 304, and otherwise the serialized list is served from a
+        per-customer cache as long as it matches the current state.
+
+        The ETag covers each row's balance and updated_at rather than the
+        newest updated_at, which is stamped before commit: a posting stamped
+        earlier but committed later than another account's write would leave
+        the maximum unchanged. For the same reason the list has no
+        Last-Modified.
+        """
+        customer_id = get_customer_id(request.user)
+        # Deposits into balance slots only touch the slot rows.
+        rows = Account.objects.filter(owner_id=customer_id).order_by('pk', 'slots__slot').values_list(
+            'pk', 'balance', 'updated_at', 'slots__balance', 'slots__updated_at'
+        )
+        fingerprint = f"accounts:{customer_id}:" + ';'.join(map(str, rows))
+        headers, not_modified = conditional_headers(request, fingerprint, None)
+        if not_modified is not None:
+            return not_modified
+
+        key = account_list_key(customer_id)
+        cached = cache.get(key)
+        if cached is not None and cached[0] == headers['ETag']:
+            data = cached[1]
+        else:
+            data = self.get_serializer(self.get_queryset(), many=True).data
+            cache.set(key, (headers['ETag'], data), settings.ACCOUNT_LIST_CACHE_TTL)
+        return Response(data, headers=headers)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve an account with ETag/Last-Modified validators derived from
+        its last change, answering 304 when the client's copy is current.
+        """
+        account = self.get_object()
+        # Slot rows are stamped before commit too; their total settles the order.
+        fingerprint = f'account:{account.pk}:{account.last_modified}:{account.total_balance}'
+        headers, not_modified = conditional_headers(request, fingerprint, account.last_modified)
+        if not_modified is not None:
+            return not_modified
+        return Response(self.get_serializer(account).data, headers=headers)
 
     def perform_create(self, serializer):
         """
@@ -29,9 +156,104 @@ class AccountViewSet(viewsets.ModelViewSet):
         customer profile of the currently logged-in user.
         """
         # self.request.user.customer is available because of the OneToOneField
-        serializer.save(owner=self.request.user.customer)
+        account = serializer.save(owner=self.request.user.customer)
+        invalidate_account_lists([account.owner_id])
+
+    def perform_update(self, serializer):
+        account = serializer.save()
+        invalidate_account_lists([account.owner_id])
+
+    def perform_destroy(self, instance):
+        invalidate_account_lists([instance.owner_id])
+        instance.delete()
+
+    @action(detail=True, methods=['get'])
+    def balance(self, request, pk=None):
+        """
+        Custom action returning the account balance at a point in time,
+        given as ``?as_of=<ISO 8601 timestamp>`` (defaults to now).
+        """
+        account = self.get_object()
+        as_of = timezone.now()
+        if 'as_of' in request.query_params:
+            try:
+                as_of = parse_datetime(request.query_params['as_of'])
+            except ValueError:
+                # Well formed, but not a real date or time, e.g. February 30.
+                as_of = None
+            if as_of is None:
+                raise ValidationError({'as_of': 'A valid ISO 8601 timestamp is required.'})
+            if timezone.is_naive(as_of):
+                as_of = timezone.make_aware(as_of)
+
+        # The newest ledger row at or before as_of is a single seek on the
+        # (account, timestamp, id) index.
+        ledger = account.transactions.order_by('-timestamp', '-id')
+        if as_of >= account.created_at and not ledger.filter(timestamp__gt=as_of).exists():
+            # Nothing posted since as_of, so the balance is the current one,
+            # as GET /api/accounts/{id}/ reports it. On accounts with balance
+            # slots the newest balance_after can miss deposits to other slots
+            # that were still in flight when it was written.
+            balance = account.total_balance
+        else:
+            balance = ledger.filter(timestamp__lte=as_of).values_list('balance_after', flat=True).first()
+        if balance is None:
+            if as_of < account.created_at:
+                balance = Decimal('0.00')
+            else:
+                # Months archived out of the database are read from their files.
+                balance = archived_balance(account.pk, as_of)
+            if balance is None:
+                # Before the first posting the account held its opening balance.
+                first = ledger.reverse().values_list('balance_after', 'signed_amount').first()
+                balance = first[0] - first[1] if first else account.total_balance
+
+        return Response(
+            {'account_number': account.account_number, 'as_of': as_of, 'balance': balance},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['get'])
+    def summary(self, request, pk=None):
+        """
+        Custom action returning the account's money in and out per month and
+        transaction type, for the months ``?from=`` through ``?to=`` (both
+        optional and inclusive, as YYYY-MM). Reads the monthly rollups, so the
+        cost depends on the number of months, not of transactions.
+        """
+        account = self.get_object()
+        rollups = account.rollups.all()
+        if 'from' in request.query_params:
+            rollups = rollups.filter(month__gte=parse_month(request.query_params['from'], 'from'))
+        if 'to' in request.query_params:
+            rollups = rollups.filter(month__lte=parse_month(request.query_params['to'], 'to'))
+        # Accounts with balance slots have a row per slot; add them up.
+        months = rollups.values('month', 'transaction_type').annotate(
+            credit_count=Sum('credit_count'), credit_total=Sum('credit_total'),
+            debit_count=Sum('debit_count'), debit_total=Sum('debit_total'),
+        ).order_by('month', 'transaction_type')
+
+        totals = rollups.aggregate(
+            credit_count=Sum('credit_count'), credit_total=Sum('credit_total'),
+            debit_count=Sum('debit_count'), debit_total=Sum('debit_total'),
+        )
+        credit_total = totals['credit_total'] or Decimal('0.00')
+        debit_total = totals['debit_total'] or Decimal('0.00')
+        return Response(
+            {
+                'account_number': account.account_number,
+                'months': MonthlyRollupSerializer(months, many=True).data,
+                'credit_count': totals['credit_count'] or 0,
+                'credit_total': f'{credit_total:.2f}',
+                'debit_count': totals['debit_count'] or 0,
+                'debit_total': f'{debit_total:.2f}',
+                'net': f'{credit_total - debit_total:.2f}',
+            },
+            status=status.HTTP_200_OK
+        )
 
     @action(detail=True, methods=['post'], serializer_class=DepositSerializer)
+    @idempotent
     def deposit(self, request, pk=None):
         """
         Custom action to deposit money into an account.
@@ -41,23 +263,17 @@ class AccountViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         amount = serializer.validated_data['amount']
 
-        with transaction.atomic():
-            account.balance += amount
-            account.save()
-
-            Transaction.objects.create(
-                account=account,
-                amount=amount,
-                transaction_type='DEPOSIT',
-                description=f'Deposit of {amount} to account {account.account_number}.'
-            )
+        if prefers_async(request):
+            return queued_response(request, enqueue_posting(account, 'DEPOSIT', amount))
+        new_balance = services.deposit(account, amount)
 
         return Response(
-            {'status': 'deposit successful', 'new_balance': account.balance},
+            {'status': 'deposit successful', 'new_balance': new_balance},
             status=status.HTTP_200_OK
         )
 
     @action(detail=True, methods=['post'], serializer_class=WithdrawalSerializer)
+    @idempotent
     def withdraw(self, request, pk=None):
         """
         Custom action to withdraw money from an account.
@@ -67,29 +283,23 @@ class AccountViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         amount = serializer.validated_data['amount']
 
-        if account.balance < amount:
+        if prefers_async(request):
+            return queued_response(request, enqueue_posting(account, 'WITHDRAWAL', amount))
+        try:
+            new_balance = services.withdraw(account, amount)
+        except services.InsufficientFunds:
             return Response(
                 {'error': 'Insufficient funds.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        with transaction.atomic():
-            account.balance -= amount
-            account.save()
-
-            Transaction.objects.create(
-                account=account,
-                amount=amount,
-                transaction_type='WITHDRAWAL',
-                description=f'Withdrawal of {amount} from account {account.account_number}.'
-            )
-
         return Response(
-            {'status': 'withdrawal successful', 'new_balance': account.balance},
+            {'status': 'withdrawal successful', 'new_balance': new_balance},
             status=status.HTTP_200_OK
         )
 
     @action(detail=True, methods=['post'], serializer_class=TransferSerializer)
+    @idempotent
     def transfer(self, request, pk=None):
         """
         Custom action to transfer money from one account to another.
@@ -108,31 +318,49 @@ class AccountViewSet(viewsets.ModelViewSet):
         if from_account == to_account:
             return Response({'error': 'Cannot transfer to the same account.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if from_account.balance < amount:
+        if prefers_async(request):
+            return queued_response(request, enqueue_posting(from_account, 'TRANSFER', amount, to_account))
+        try:
+            from_balance = services.transfer(from_account, to_account, amount)
+        except services.InsufficientFunds:
             return Response({'error': 'Insufficient funds.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            from_account.balance -= amount
-            from_account.save()
-
-            Transaction.objects.create(
-                account=from_account,
-                amount=amount,
-                transaction_type='TRANSFER',
-                description=f'Transfer to {to_account.account_number}'
-            )
+        return Response(
+            {'status': 'transfer successful', 'from_account_balance': from_balance},
+            status=status.HTTP_200_OK
+        )
 
-            to_account.balance += amount
-            to_account.save()
+    @action(detail=True, methods=['post'], url_path='batch-transfer', serializer_class=BatchTransferSerializer)
+    @idempotent
+    def batch_transfer(self, request, pk=None):
+        """
+        Custom action to transfer money from one account to many accounts
+        in a single request, e.g. for payroll or settlement runs.
+        """
+        from_account = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-            Transaction.objects.create(
-                account=to_account,
-                amount=amount,
-                transaction_type='TRANSFER',
-                description=f'Transfer from {from_account.account_number}'
+        try:
+            from_balance, results = services.batch_transfer(
+                from_account,
+                serializer.validated_data['transfers'],
+                mode=serializer.validated_data['mode']
+            )
+        except services.BatchRejected as exc:
+            return Response(
+                {'error': 'Batch rejected.', 'results': exc.results},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
+        succeeded = sum(1 for result in results if result['status'] == 'ok')
         return Response(
-            {'status': 'transfer successful', 'from_account_balance': from_account.balance},
+            {
+                'status': 'batch transfer processed',
+                'from_account_balance': from_balance,
+                'succeeded': succeeded,
+                'failed': len(results) - succeeded,
+                'results': results,
+            },
             status=status.HTTP_200_OK
         )
@@ -0,0 +1,131 @@
+# core/views/async_api.py
+"""
+Async-native read endpoints for accounts, the customer profile and the
+transaction history, for serving many mostly idle polling connections under
+an ASGI server. Accounts and the profile return the same JSON as the DRF
+viewsets. The history returns the same transaction rows, but pages them
+forward only, as ``{"next": ..., "results": [...]}``, with cursors of its own.
+"""
+import base64
+import functools
+import math
+
+from django.http import HttpResponse
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+
+from .. import throttling
+from ..authentication import aauthenticate, get_customer_id
+from ..models import Account, Customer, Transaction
+from ..pagination import TransactionCursorPagination
+from ..renderers import FastJSONRenderer
+from ..serializers import AccountSerializer, CustomerSerializer, TransactionSerializer
+from ..serializers.fast import ValuesSerializer
+
+transaction_rows = ValuesSerializer(TransactionSerializer)
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def async_token_required(view):
+    """
+    Authenticate the request with its token and apply the user's read rate
+    limit, answering 401 and 429 like DRF does.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aauthenticate(request)
+        if user is None:
+            response = json_response({'detail': 'Authentication credentials were not provided.'}, status=401)
+            response['WWW-Authenticate'] = 'Token'
+            return response
+        request.user = user
+        wait = await throttling.aconsume('reads', f'user-{user.pk}')
+        if wait is not None:
+            response = json_response({'detail': throttling.throttled_detail(wait)}, status=429)
+            response['Retry-After'] = str(math.ceil(wait))
+            return response
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def encode_cursor(row):
+    position = f"{row['timestamp'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return parse_datetime(timestamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None, None
+
+
+@require_GET
+@async_token_required
+async def account_list(request):
+    accounts = Account.objects.filter(owner_id=get_customer_id(request.user)).with_slot_totals()
+    rows = [account async for account in accounts]
+    return json_response(AccountSerializer(rows, many=True).data)
+
+
+@require_GET
+@async_token_required
+async def account_detail(request, pk):
+    try:
+        account = await Account.objects.with_slot_totals().aget(pk=pk, owner_id=get_customer_id(request.user))
+    except Account.DoesNotExist:
+        return json_response({'detail': 'No Account matches the given query.'}, status=404)
+    return json_response(AccountSerializer(account).data)
+
+
+@require_GET
+@async_token_required
+async def customer_profile(request):
+    customer = await Customer.objects.filter(pk=get_customer_id(request.user)).afirst()
+    if customer is None:
+        return json_response({'detail': 'No Customer matches the given query.'}, status=404)
+    return json_response(CustomerSerializer(customer).data)
+
+
+@require_GET
+@async_token_required
+async def transaction_list(request):
+    """
+    Newest-first transaction history with keyset pagination on (timestamp, id).
+    Supports ``?account=``, ``?page_size=`` and the ``?cursor=`` from ``next``,
+    which is not interchangeable with the cursors of the DRF endpoint.
+    """
+    queryset = Transaction.objects.filter(account__owner_id=get_customer_id(request.user))
+
+    account = request.GET.get('account')
+    if account is not None:
+        if not account.isdigit():
+            return json_response({'account': 'A valid account id is required.'}, status=400)
+        queryset = queryset.filter(account_id=account)
+
+    if 'cursor' in request.GET:
+        timestamp, pk = decode_cursor(request.GET['cursor'])
+        if timestamp is None:
+            return json_response({'detail': 'Invalid cursor'}, status=404)
+        queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, pk__lt=pk))
+
+    page_size = TransactionCursorPagination.page_size
+    if request.GET.get('page_size', '').isdigit():
+        page_size = min(max(int(request.GET['page_size']), 1), TransactionCursorPagination.max_page_size)
+
+    ordered = queryset.order_by(*TransactionCursorPagination.ordering).values(*transaction_rows.columns)
+    rows = [row async for row in ordered[:page_size + 1]]
+
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        params = request.GET.copy()
+        params['cursor'] = encode_cursor(rows[-1])
+        next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+    return json_response({'next': next_url, 'results': transaction_rows.to_representation(rows)})
@@ -1,11 +1,21 @@
 # core/views/customer.py
 from rest_framework import viewsets
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from ..authentication import get_customer_id
 from ..models import Customer
+from ..renderers import FastJSONRenderer
 from ..serializers import CustomerSerializer
+from ..serializers.fast import ValuesSerializer
 
 class CustomerViewSet(viewsets.ModelViewSet):
     serializer_class = CustomerSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    values_serializer = ValuesSerializer(CustomerSerializer)
 
     def get_queryset(self):
-        user = self.request.user
-        return Customer.objects.filter(user=user)
\ No newline at end of file
+        return Customer.objects.filter(pk=get_customer_id(self.request.user))
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_queryset().values(*self.values_serializer.columns)
+        return Response(self.values_serializer.to_representation(rows))
@@ -0,0 +1,20 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from .. import metrics
+
+
+@require_GET
+def prometheus_metrics(request):
+    """
+    Serve the in-process metrics in the Prometheus text format. Each worker
+    process reports its own values; Prometheus sums them across targets.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponse(status=401)
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,20 @@
+from rest_framework import mixins, viewsets
+
+from ..authentication import get_customer_id
+from ..models import QueuedPosting
+from ..serializers import QueuedPostingSerializer
+
+
+class PostingViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Status of a posting queued with ``Prefer: respond-async``, at the URL
+    returned in its 202 response: PENDING until the worker has processed
+    it, then APPLIED with the account's new balance, or REJECTED with the
+    reason.
+    """
+    serializer_class = QueuedPostingSerializer
+
+    def get_queryset(self):
+        return QueuedPosting.objects.filter(
+            account__owner_id=get_customer_id(self.request.user)
+        ).select_related('to_account')
@@ -1,10 +1,216 @@
-from rest_framework import viewsets
-from ..models import Transaction
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers, viewsets
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from ..authentication import get_customer_id
+from ..models import Account, Transaction
+from ..pagination import TransactionCursorPagination
+from ..renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
 from ..serializers import TransactionSerializer
+from ..serializers.fast import ValuesSerializer
+from ..services.partitions import archived_rows
+
+# Rows fetched per round trip when streaming statements through a server-side cursor.
+STATEMENT_CHUNK_SIZE = 2000
+
+# Shortest ?search= term; shorter ones match too much for the trigram index to help.
+MIN_SEARCH_LENGTH = 3
+
+STATEMENT_COLUMNS = [
+    'id', 'account', 'timestamp', 'transaction_type', 'amount',
+    'signed_amount', 'balance_after', 'description'
+]
+
+
+def parse_timestamp(value, name, end_of_day=False):
+    """
+    Parse an ISO 8601 datetime or date query parameter into an aware datetime.
+    A bare date means the start of that day, or the start of the next day when
+    ``end_of_day`` is set so it can be used as an exclusive upper bound.
+    """
+    try:
+        parsed = parse_datetime(value)
+        day = parse_date(value) if parsed is None else None
+    except ValueError:
+        # Well formed, but not a real date or time, e.g. February 30.
+        parsed = day = None
+    if parsed is None:
+        if day is None:
+            raise ValidationError({name: 'A valid ISO 8601 date or timestamp is required.'})
+        if end_of_day:
+            day += timedelta(days=1)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_amount(value, name):
+    """
+    Parse an amount query parameter that fits Transaction.amount, so an
+    out-of-range bound is rejected instead of overflowing the column.
+    """
+    field = Transaction._meta.get_field('amount')
+    try:
+        return serializers.DecimalField(
+            max_digits=field.max_digits, decimal_places=field.decimal_places
+        ).to_internal_value(value)
+    except ValidationError as error:
+        raise ValidationError({name: error.detail})
+
+
+def row_matches(row, lookups):
+    """
+    Whether an archived row (see read_archive()) passes the lookups of
+    TransactionViewSet.id_filters() and search_filters().
+    """
+    account, kind, amount, description, counterparty, transfer = (
+        row[1], row[3], row[4], row[7], row[8], row[9]
+    )
+    return (
+        lookups.get('account_id', account) == account
+        and lookups.get('counterparty_id', counterparty) == counterparty
+        and lookups.get('transfer_id', transfer) == transfer
+        and lookups.get('transaction_type', kind) == kind
+        and lookups.get('amount__gte', amount) <= amount <= lookups.get('amount__lte', amount)
+        and lookups.get('description__icontains', '').upper() in (description or '').upper()
+    )
+
 
 class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only, cursor-paginated transaction history. Pass ``?account=<id>``
+    to restrict the history to one of the user's accounts, ``?counterparty=<id>``
+    to transfers with another account, ``?transfer=<id>`` to the legs of one
+    transfer, and ``?from=`` / ``?to=`` to restrict it to a time range.
+    ``?type=``, ``?min_amount=`` / ``?max_amount=`` and ``?search=`` (text in
+    the description) narrow it further; see search_filters().
+    """
     serializer_class = TransactionSerializer
+    pagination_class = TransactionCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    values_serializer = ValuesSerializer(TransactionSerializer)
 
     def get_queryset(self):
-        user = self.request.user
-        return Transaction.objects.filter(account__owner__user=user)
\ No newline at end of file
+        queryset = Transaction.objects.filter(account__owner_id=get_customer_id(self.request.user))
+        return self.filter_date_range(queryset.filter(**self.id_filters(), **self.search_filters()))
+
+    def id_filters(self):
+        """
+        Return the lookups for ``?account=``, ``?counterparty=`` and ``?transfer=``.
+        """
+        lookups = {}
+        for param, field in (('account', 'account_id'), ('counterparty', 'counterparty_id'), ('transfer', 'transfer_id')):
+            value = self.request.query_params.get(param)
+            if value is not None:
+                if not value.isdigit():
+                    raise ValidationError({param: f'A valid {param} id is required.'})
+                lookups[field] = int(value)
+        return lookups
+
+    def search_filters(self):
+        """
+        Return the lookups for ``?type=``, ``?min_amount=`` / ``?max_amount=``
+        (inclusive) and ``?search=`` (case-insensitive, in the description).
+
+        Types are served by the (account, transaction_type, timestamp, id)
+        index, and on PostgreSQL searches by a trigram index on the
+        description. Amount ranges are applied as a filter while walking
+        core_txn_account_ts_idx, so pages stay in (timestamp, id) order.
+        """
+        params = self.request.query_params
+        lookups = {}
+        if 'type' in params:
+            types = dict(Transaction.TRANSACTION_TYPES)
+            if params['type'] not in types:
+                raise ValidationError({'type': f'Must be one of {", ".join(types)}.'})
+            lookups['transaction_type'] = params['type']
+        if 'min_amount' in params:
+            lookups['amount__gte'] = parse_amount(params['min_amount'], 'min_amount')
+        if 'max_amount' in params:
+            lookups['amount__lte'] = parse_amount(params['max_amount'], 'max_amount')
+        if 'search' in params:
+            term = params['search'].strip()
+            if len(term) < MIN_SEARCH_LENGTH:
+                raise ValidationError({'search': f'Search for at least {MIN_SEARCH_LENGTH} characters.'})
+            lookups['description__icontains'] = term
+        return lookups
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the history from ``.values()`` rows instead of model instances;
+        the JSON is byte-for-byte what TransactionSerializer would produce.
+        """
+        queryset = self.get_queryset().values(*self.values_serializer.columns)
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.values_serializer.to_representation(page))
+
+    def date_range(self):
+        """
+        Return the optional ``?from=`` (inclusive) and ``?to=`` (exclusive)
+        bounds, each None when not given.
+        """
+        params = self.request.query_params
+        start = parse_timestamp(params['from'], 'from') if 'from' in params else None
+        end = parse_timestamp(params['to'], 'to', end_of_day=True) if 'to' in params else None
+        return start, end
+
+    def filter_date_range(self, queryset):
+        """
+        Apply the ``?from=``/``?to=`` bounds on the transaction timestamp. On a
+        partitioned table this limits the query to the months in range.
+        """
+        start, end = self.date_range()
+        if start is not None:
+            queryset = queryset.filter(timestamp__gte=start)
+        if end is not None:
+            queryset = queryset.filter(timestamp__lt=end)
+        return queryset
+
+    @action(detail=False, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """
+        Stream a statement as CSV (default) or NDJSON (``?format=ndjson``),
+        oldest first. Supports ``?account=``, ``?from=``, ``?to=`` and the
+        search_filters() parameters, and includes months that have been archived out of the database.
+
+        Rows are read through a server-side cursor and written out as they
+        arrive, so memory use stays flat however long the history is.
+        """
+        start, end = self.date_range()
+        queryset = self.get_queryset().order_by('timestamp', 'id')
+        rows = queryset.values_list(
+            'id', 'account_id', 'timestamp', 'transaction_type', 'amount',
+            'signed_amount', 'balance_after', 'description'
+        ).iterator(chunk_size=STATEMENT_CHUNK_SIZE)
+
+        # Archived months are all older than anything still in the table, and
+        # are filtered in Python with the same lookups as the queryset.
+        lookups = {**self.id_filters(), **self.search_filters()}
+        accounts = Account.objects.filter(owner_id=get_customer_id(request.user))
+        if 'account_id' in lookups:
+            accounts = accounts.filter(pk=lookups['account_id'])
+        archived = archived_rows(accounts.values_list('pk', flat=True), start, end)
+        archived = (row[:8] for row in archived if row_matches(row, lookups))
+        rows = chain(archived, rows)
+
+        def formatted():
+            for pk, account, timestamp, kind, amount, signed, balance, description in rows:
+                yield (
+                    pk, account, timestamp.isoformat(), kind, str(amount),
+                    str(signed), str(balance), description
+                )
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(STATEMENT_COLUMNS, formatted()),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = f'attachment; filename="statement.{renderer.format}"'
+        return response